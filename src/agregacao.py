@@ -0,0 +1,208 @@
+"""
+Agregação do relatório em uma única passagem pelos holerites
+Cada holerite é consumido uma vez, à medida que é lido: estatísticas do processamento, totais
+financeiros (em centavos), a análise cruzada situação x faixa etária e os valores que as seções
+de saúde financeira e de alertas precisam. O relatório HTML apenas lê o resultado, sem percorrer
+os holerites de novo
+"""
+
+from array import array
+
+import numpy as np
+
+from margens import calcular_margens
+from moeda import reais
+
+# Faixas etárias da análise cruzada (idade em anos completos na data da competência)
+FAIXAS_ETARIAS = {
+    '50-59 anos': {'min': 50, 'max': 59},
+    '60-69 anos': {'min': 60, 'max': 69},
+    '70-79 anos': {'min': 70, 'max': 79},
+    '80-89 anos': {'min': 80, 'max': 89},
+    '90+ anos': {'min': 90, 'max': 150}
+}
+
+# Diferença máxima entre RLM e líquido (sem descontos facultativos) antes de o holerite ser atípico
+TOLERANCIA_ATIPICO_CENTAVOS = 10
+
+# Contadores da seção de saúde financeira por status de margem (holerites SEM MARGEM não entram)
+SAUDE_STATUS = {'saudavel': 'SAUDÁVEL', 'atencao': 'ATENÇÃO', 'risco': 'RISCO', 'critico': 'CRÍTICO',
+                'sem_descontos': 'SEM DESCONTOS'}
+
+# Valores de cada holerite guardados para as seções de saúde financeira e alertas: coluna → campo em centavos
+COLUNAS_VALORES = {
+    'total_proventos': 'total_proventos_centavos',
+    'total_descontos_obrigatorios': 'total_descontos_obrigatorios_centavos',
+    'total_descontos_extras': 'total_descontos_extras_centavos',
+    'total_descontos': 'total_descontos_centavos',
+    'liquido': 'liquido_centavos',
+}
+
+def faixa_etaria(idade):
+    """Nome da faixa etária da idade, ou 'Não identificado'"""
+    for faixa_nome, faixa_range in FAIXAS_ETARIAS.items():
+        if faixa_range['min'] <= idade <= faixa_range['max']:
+            return faixa_nome
+    return 'Não identificado'
+
+def casos_especiais(eventos):
+    """
+    Vetores booleanos por holerite (rescisão, servidor cedido), detectados pelas descrições dos eventos
+    da TabelaEventos (avaliadas uma vez por descrição distinta)
+    """
+    # Rescisão: evento de 13º de rescisão (busca flexível)
+    rescisao = eventos.holerites_com(lambda descricao: '13' in descricao and 'RESCIS' in descricao,
+                                     ('proventos', 'eventos_informativos'))
+    # Servidor cedido: TEM "REPRESENTACAO CONF LC 04/90 - ART. 59" E NÃO TEM "SUBSIDIO" código 1
+    representacao = eventos.holerites_com(
+        lambda descricao: 'REPRESENTACAO CONF LC 04/90' in descricao or 'ART. 59' in descricao,
+        ('proventos', 'eventos_informativos'))
+    subsidio_1 = eventos.holerites_com(lambda descricao: 'SUBSID' in descricao, ('proventos',), codigo='1')
+    return rescisao, representacao & ~subsidio_1
+
+class AgregacaoRelatorio:
+    """
+    Acumula holerite a holerite (adicionar) tudo o que o log e o relatório exibem.
+    finalizar(eventos) calcula as margens de todos os holerites de uma vez (calcular_margens),
+    classifica a saúde financeira e monta as listas de alertas (críticos, rescisões, cedidos e
+    atípicos), na ordem de leitura dos holerites.
+    """
+
+    def __init__(self):
+        self.estatisticas = {
+            'total': 0,
+            'com_sucesso': 0,
+            'com_erro': 0,
+            'sem_dados': 0,
+            'total_proventos': 0,
+            'total_descontos_obrigatorios': 0,
+            'total_descontos_extras': 0,
+            'total_liquido': 0
+        }
+        self.competencia = ''
+        self.situacoes_faixas = {}
+        self._valores = {coluna: array('q') for coluna in COLUNAS_VALORES}
+        self._identificacao = []  # (nome, cpf, situação) de cada holerite
+        self.margens = None  # DataFrame de calcular_margens, preenchido por finalizar
+        self.saude = None
+        self.beneficiarios_criticos = []
+        self.beneficiarios_rescisao = []
+        self.servidores_cedidos = []
+        self.casos_atipicos = []
+
+    def __len__(self):
+        return self.estatisticas['total']
+
+    @classmethod
+    def de_holerites(cls, holerites):
+        agregacao = cls()
+        for dados in holerites:
+            agregacao.adicionar(dados)
+        return agregacao
+
+    def adicionar(self, dados):
+        """Consome um holerite (Holerite ou registro gravado em disco, valores em centavos)"""
+        stats = self.estatisticas
+        stats['total'] += 1
+        if dados['erro_processamento']:
+            stats['com_erro'] += 1
+        elif dados['nome']:
+            stats['com_sucesso'] += 1
+        else:
+            stats['sem_dados'] += 1
+
+        # Totais em centavos: a soma de milhares de holerites não acumula erro de arredondamento
+        valores = {coluna: dados.get(campo, 0) for coluna, campo in COLUNAS_VALORES.items()}
+        stats['total_proventos'] += valores['total_proventos']
+        stats['total_descontos_obrigatorios'] += valores['total_descontos_obrigatorios']
+        stats['total_descontos_extras'] += valores['total_descontos_extras']
+        stats['total_liquido'] += valores['liquido']
+        for coluna, valor in valores.items():
+            self._valores[coluna].append(valor)
+
+        # Competência do primeiro holerite que tiver essa informação
+        if not self.competencia and dados.get('competencia'):
+            self.competencia = dados['competencia']
+
+        # Análise cruzada: situação x faixa etária (proventos em centavos)
+        sit = dados.get('situacao', 'Não informado')
+        if sit not in self.situacoes_faixas:
+            self.situacoes_faixas[sit] = {
+                'total_qtd': 0,
+                'total_proventos': 0,
+                'faixas': {faixa: {'qtd': 0, 'total_proventos': 0} for faixa in FAIXAS_ETARIAS}
+            }
+        situacao = self.situacoes_faixas[sit]
+        situacao['total_qtd'] += 1
+        situacao['total_proventos'] += valores['total_proventos']
+        faixa = situacao['faixas'].get(faixa_etaria(dados.get('idade_anos') or 0))
+        if faixa is not None:
+            faixa['qtd'] += 1
+            faixa['total_proventos'] += valores['total_proventos']
+
+        self._identificacao.append((dados.get('nome', 'N/A'), dados.get('cpf', 'N/A'), dados.get('situacao', 'N/A')))
+
+    def finalizar(self, eventos):
+        """
+        Saúde financeira e alertas, com os casos especiais da TabelaEventos dos mesmos holerites
+        (na mesma ordem). Pode ser chamado de novo: o resultado é recalculado.
+        """
+        holerites_rescisao, holerites_cedidos = casos_especiais(eventos)
+        valores = {coluna: np.frombuffer(vetor, dtype=np.int64) if vetor else np.zeros(0, dtype=np.int64)
+                   for coluna, vetor in self._valores.items()}
+        margens = self.margens = calcular_margens(valores['total_proventos'], valores['total_descontos_obrigatorios'],
+                                                  valores['total_descontos_extras'])
+        margem_centavos = margens['margem_centavos'].to_numpy()
+        extras_centavos = valores['total_descontos_extras']
+
+        contagem = margens['status'].value_counts()
+        self.saude = {chave: int(contagem[status]) for chave, status in SAUDE_STATUS.items()}
+
+        identificacao = self._identificacao
+        self.servidores_cedidos = [{'nome': nome, 'cpf': cpf, 'situacao': situacao}
+                                   for nome, cpf, situacao in (identificacao[i] for i in np.flatnonzero(holerites_cedidos))]
+        self.beneficiarios_rescisao = [{'nome': identificacao[i][0], 'cpf': identificacao[i][1],
+                                        'tem_desconto_facultativo': 'Sim' if extras_centavos[i] > 0 else 'Não'}
+                                       for i in np.flatnonzero(holerites_rescisao)]
+
+        # DETECÇÃO DE CASOS ATÍPICOS (múltiplos critérios, em ordem de prioridade), exceto rescisões e cedidos
+        diferenca = np.abs(margem_centavos - valores['liquido'])
+        motivos = np.select([
+            # Critério 1: Margem negativa/zero
+            margem_centavos <= 0,
+            # Critério 2: Proventos zerados mas com descontos
+            (valores['total_proventos'] == 0) & (valores['total_descontos'] > 0),
+            # Critério 3: Diferença entre RLM e Líquido quando NÃO há descontos facultativos
+            (extras_centavos == 0) & (diferenca > TOLERANCIA_ATIPICO_CENTAVOS),
+        ], [1, 2, 3], default=0)
+        motivos[holerites_rescisao | holerites_cedidos] = 0
+        self.casos_atipicos = []
+        for i in np.flatnonzero(motivos):
+            nome, cpf, situacao = identificacao[i]
+            if motivos[i] == 1:
+                motivo_atipico = 'Margem negativa ou zero'
+            elif motivos[i] == 2:
+                motivo_atipico = 'Proventos zerados mas com descontos'
+            else:
+                motivo_atipico = f'Diferença entre RLM e Líquido: R$ {reais(int(diferenca[i])):.2f}'
+            self.casos_atipicos.append({'nome': nome, 'cpf': cpf, 'situacao': situacao,
+                                        'margem': reais(int(margem_centavos[i])), 'motivo': motivo_atipico})
+
+        # Acima do limite legal (> 100% do limite ideal)
+        self.beneficiarios_criticos = []
+        percentuais = margens['percentual_limite'].to_numpy()
+        for i in np.flatnonzero((margens['status'] == 'CRÍTICO').to_numpy()):
+            nome, cpf, situacao = identificacao[i]
+            self.beneficiarios_criticos.append({
+                'nome': nome,
+                'cpf': cpf,
+                'situacao': situacao,
+                'total_proventos': reais(int(valores['total_proventos'][i])),
+                'total_descontos_obrigatorios': reais(int(valores['total_descontos_obrigatorios'][i])),
+                'margem_consignavel': reais(int(margem_centavos[i])),
+                'liquido_final': reais(int(valores['liquido'][i])),
+                'descontos_extras': reais(int(extras_centavos[i])),
+                'percentual': float(percentuais[i]),
+                'rescisao': 'Sim' if holerites_rescisao[i] else 'Não'
+            })
+        return self
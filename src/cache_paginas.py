@@ -0,0 +1,94 @@
+"""
+Cache local do texto extraído das páginas dos holerites
+Evita repetir o PyPDF2 (extract_text) ao reprocessar PDFs que não mudaram
+"""
+
+import hashlib
+import os
+import sqlite3
+import zlib
+from pathlib import Path
+
+CAMINHO_CACHE = Path(__file__).parent.parent / 'data' / 'cache' / 'paginas.db'
+
+# Hashes já calculados nesta execução: (caminho, tamanho, mtime) → SHA-256
+_HASHES = {}
+
+def calcular_hash_arquivo(caminho, tamanho_bloco=1024 * 1024):
+    """
+    Calcula o SHA-256 do conteúdo do arquivo (lido em blocos).
+    O resultado é memorizado por (caminho, tamanho, mtime): o manifesto e o cache
+    consultam o mesmo PDF na mesma execução sem relê-lo.
+    """
+    info = os.stat(caminho)
+    chave = (str(caminho), info.st_size, info.st_mtime_ns)
+    if chave not in _HASHES:
+        sha = hashlib.sha256()
+        with open(caminho, 'rb') as arquivo:
+            for bloco in iter(lambda: arquivo.read(tamanho_bloco), b''):
+                sha.update(bloco)
+        _HASHES[chave] = sha.hexdigest()
+    return _HASHES[chave]
+
+def calcular_hash_conteudo(caminho, info, conteudo):
+    """
+    SHA-256 de um arquivo já lido em memória (conteudo, com info = os.stat feito antes da leitura).
+    Fica memorizado como em calcular_hash_arquivo, evitando uma nova leitura do disco.
+    """
+    hash_pdf = hashlib.sha256(conteudo).hexdigest()
+    _HASHES[(str(caminho), info.st_size, info.st_mtime_ns)] = hash_pdf
+    return hash_pdf
+
+class CachePaginas:
+    """
+    Texto extraído de cada página, comprimido com zlib em SQLite.
+    A chave é (hash do conteúdo do PDF, número da página): renomear ou mover o arquivo
+    não invalida o cache, e qualquer alteração no conteúdo gera uma chave nova.
+    """
+
+    def __init__(self, caminho_db=CAMINHO_CACHE):
+        self.caminho_db = Path(caminho_db)
+        self.caminho_db.parent.mkdir(parents=True, exist_ok=True)
+        self.acertos = 0
+        self.falhas = 0
+
+        # timeout + WAL: vários processos (--workers) podem gravar no mesmo banco
+        self.conn = sqlite3.connect(self.caminho_db, timeout=60)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('CREATE TABLE IF NOT EXISTS arquivos (hash TEXT PRIMARY KEY, num_paginas INTEGER NOT NULL)')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS paginas (
+                hash TEXT NOT NULL,
+                pagina INTEGER NOT NULL,
+                texto BLOB NOT NULL,
+                PRIMARY KEY (hash, pagina)
+            ) WITHOUT ROWID
+        ''')
+        self.conn.commit()
+
+    def num_paginas(self, hash_pdf):
+        """Número de páginas do PDF, ou None se o arquivo nunca foi lido"""
+        linha = self.conn.execute('SELECT num_paginas FROM arquivos WHERE hash = ?', (hash_pdf,)).fetchone()
+        return linha[0] if linha else None
+
+    def obter_textos(self, hash_pdf, inicio, fim):
+        """Retorna {numero_pagina: texto} das páginas [inicio, fim) presentes no cache"""
+        cursor = self.conn.execute(
+            'SELECT pagina, texto FROM paginas WHERE hash = ? AND pagina >= ? AND pagina < ?',
+            (hash_pdf, inicio, fim)
+        )
+        textos = {pagina: zlib.decompress(texto).decode('utf-8') for pagina, texto in cursor}
+        self.acertos += len(textos)
+        return textos
+
+    def salvar_textos(self, hash_pdf, num_paginas, textos):
+        """Grava {numero_pagina: texto} em uma única transação"""
+        with self.conn:
+            self.conn.execute('INSERT OR REPLACE INTO arquivos (hash, num_paginas) VALUES (?, ?)', (hash_pdf, num_paginas))
+            self.conn.executemany(
+                'INSERT OR REPLACE INTO paginas (hash, pagina, texto) VALUES (?, ?, ?)',
+                [(hash_pdf, pagina, zlib.compress(texto.encode('utf-8'))) for pagina, texto in textos.items()]
+            )
+
+    def fechar(self):
+        self.conn.close()
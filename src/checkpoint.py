@@ -0,0 +1,177 @@
+"""
+Checkpoint da leitura dos PDFs de uma competência (checkpoint.jsonl, na pasta da competência)
+Se a execução for interrompida, --resume continua a partir do último holerite gravado
+"""
+
+import json
+import os
+import re
+from pathlib import Path
+
+from manifesto import arquivo_do_registro
+
+VERSAO_CHECKPOINT = 4
+
+# Chave das linhas com as páginas sem holerite (com erro ou descartadas) lidas antes do holerite seguinte
+CHAVE_PAGINAS = '_paginas'
+
+# Quantidade de holerites entre duas gravações forçadas em disco (flush + fsync)
+INTERVALO_CHECKPOINT = 50
+
+def ultima_pagina(dados):
+    """Última página (numeração a partir de 1) indicada em arquivo_origem, ex.: 'a.pdf (pág. 3-4)' → 4"""
+    encontrado = re.search(r'\(pág\. (?:\d+-)?(\d+)\)$', dados.get('arquivo_origem', ''))
+    return int(encontrado.group(1)) if encontrado else 0
+
+def identificar_arquivo(caminho_pdf):
+    """Nome, tamanho e mtime do PDF (não exige ler o arquivo, que a leitura antecipada fará depois)"""
+    info = os.stat(caminho_pdf)
+    return [Path(caminho_pdf).name, info.st_size, info.st_mtime_ns]
+
+class Checkpoint:
+    """
+    Arquivo JSON Lines: a primeira linha identifica a execução (PDFs na ordem de leitura,
+    com tamanho e mtime, e hash da planilha de parâmetros); as demais são os holerites já lidos,
+    cada um precedido (se houver) de uma linha CHAVE_PAGINAS com as páginas com erro e a quantidade
+    de páginas descartadas pela pré-classificação desde o holerite anterior.
+
+    O cursor de retomada é derivado do último holerite gravado: a leitura continua no mesmo PDF,
+    na página seguinte à última página desse holerite. Como a consolidação só mantém uma página
+    pendente e nunca une mais de 2 páginas, recomeçar desse ponto produz exatamente os mesmos
+    holerites de uma execução sem interrupção. As páginas sem holerite só valem quando o holerite
+    seguinte foi gravado: as demais estão depois do cursor e são lidas de novo.
+    """
+
+    def __init__(self, caminho, caminhos_pdf, hash_parametros=None, intervalo=INTERVALO_CHECKPOINT):
+        self.caminho = Path(caminho)
+        self.intervalo = intervalo
+        self.nomes = [Path(caminho_pdf).name for caminho_pdf in caminhos_pdf]
+        self.cabecalho = {
+            'versao': VERSAO_CHECKPOINT,
+            'hash_parametros': hash_parametros,
+            'arquivos': [identificar_arquivo(caminho_pdf) for caminho_pdf in caminhos_pdf],
+        }
+        self.quantidade = 0
+        self._arquivo = None
+        self._pendentes = 0
+
+    def _linhas_validas(self):
+        """Linhas completas do checkpoint (uma linha truncada por interrupção é ignorada)"""
+        with open(self.caminho, encoding='utf-8') as arquivo:
+            for linha in arquivo:
+                if not linha.endswith('\n'):
+                    return
+                try:
+                    yield json.loads(linha)
+                except ValueError:
+                    return
+
+    def compativel(self):
+        """O checkpoint existe e foi gerado para os mesmos PDFs e a mesma planilha de parâmetros"""
+        if not self.caminho.exists():
+            return False
+        for cabecalho in self._linhas_validas():
+            return cabecalho == self.cabecalho
+        return False
+
+    def _linhas(self):
+        """Linhas gravadas depois do cabeçalho (holerites e páginas sem holerite), na ordem de leitura"""
+        linhas = self._linhas_validas()
+        next(linhas, None)  # cabeçalho
+        return linhas
+
+    def registros(self):
+        """Gera os holerites gravados no checkpoint, na ordem de leitura"""
+        for linha in self._linhas():
+            if CHAVE_PAGINAS not in linha:
+                yield linha
+
+    def paginas(self):
+        """
+        Retorna (com_erro, descartadas): registros das páginas com erro e quantidade de páginas descartadas
+        pela pré-classificação antes do último holerite gravado
+        """
+        com_erro, descartadas = [], 0
+        pendentes = None
+        for linha in self._linhas():
+            if CHAVE_PAGINAS in linha:
+                pendentes = linha[CHAVE_PAGINAS]
+            elif pendentes is not None:
+                com_erro.extend(pendentes['com_erro'])
+                descartadas += pendentes['descartadas']
+                pendentes = None
+        return com_erro, descartadas
+
+    def cursor(self):
+        """
+        Retorna (indice_arquivo, pagina_inicial): PDF e página (a partir de 0) onde a leitura deve
+        continuar, e a quantidade de holerites já gravados fica em self.quantidade
+        """
+        self.quantidade = 0
+        ultimo = None
+        for dados in self.registros():
+            self.quantidade += 1
+            ultimo = dados
+        if ultimo is None:
+            return 0, 0
+        return self.nomes.index(arquivo_do_registro(ultimo)), ultima_pagina(ultimo)
+
+    def abrir(self, retomar=False):
+        """
+        Prepara a gravação: ao retomar, descarta o que vier depois do último holerite completo (linha
+        truncada ou páginas sem holerite, que serão lidas de novo) e continua o arquivo;
+        caso contrário, recomeça o checkpoint do zero
+        """
+        if retomar:
+            tamanho = lido = 0
+            with open(self.caminho, 'rb') as arquivo:
+                for linha in arquivo:
+                    if not linha.endswith(b'\n'):
+                        break
+                    lido += len(linha)
+                    try:
+                        conteudo = json.loads(linha)
+                    except ValueError:
+                        break
+                    if CHAVE_PAGINAS not in conteudo:
+                        tamanho = lido
+            self._arquivo = open(self.caminho, 'r+', encoding='utf-8')
+            self._arquivo.truncate(tamanho)
+            self._arquivo.seek(tamanho)
+        else:
+            self.quantidade = 0
+            self._arquivo = open(self.caminho, 'w', encoding='utf-8')
+            self._arquivo.write(json.dumps(self.cabecalho, ensure_ascii=False) + '\n')
+            self._sincronizar()
+
+    def gravar(self, dados, paginas_com_erro=(), paginas_descartadas=0):
+        """
+        Acrescenta um holerite, precedido das páginas com erro (registros) e da quantidade de páginas
+        descartadas lidas desde o holerite anterior; a cada `intervalo` holerites o arquivo é forçado para o disco
+        """
+        if paginas_com_erro or paginas_descartadas:
+            paginas = {'com_erro': list(paginas_com_erro), 'descartadas': paginas_descartadas}
+            self._arquivo.write(json.dumps({CHAVE_PAGINAS: paginas}, ensure_ascii=False) + '\n')
+        self._arquivo.write(json.dumps(dados, ensure_ascii=False) + '\n')
+        self.quantidade += 1
+        self._pendentes += 1
+        if self._pendentes >= self.intervalo:
+            self._sincronizar()
+
+    def _sincronizar(self):
+        self._arquivo.flush()
+        os.fsync(self._arquivo.fileno())
+        self._pendentes = 0
+
+    def fechar(self):
+        """Grava o que estiver pendente e fecha o arquivo (o checkpoint continua disponível)"""
+        if self._arquivo is not None:
+            self._sincronizar()
+            self._arquivo.close()
+            self._arquivo = None
+
+    def remover(self):
+        """Remove o checkpoint depois que as saídas da competência foram gravadas"""
+        self.fechar()
+        if self.caminho.exists():
+            self.caminho.unlink()
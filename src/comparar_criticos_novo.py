@@ -1,10 +1,14 @@
 import json
+import numpy as np
 import pandas as pd
 import re
 from unidecode import unidecode
 from collections import Counter
 from pathlib import Path
 
+from margens import calcular_margens_holerites
+from holerite import Holerite
+
 def normalizar_nome(nome):
     """Normaliza nome removendo acentos, pontos, hífens e espaços extras"""
     if not nome or pd.isna(nome):
@@ -28,33 +32,26 @@ caminho_json = caminho_base / 'data' / 'backup' / 'dados_folhas_backup.json'
 with open(caminho_json, 'r', encoding='utf-8') as f:
     dados_folhas = json.load(f)
 
-# Filtrar os críticos usando o MESMO CRITÉRIO do relatório HTML (181 pessoas)
-# Critério: Descontos Extras > 35% do LÍQUIDO FINAL (não da margem consignável)
+# Filtrar os críticos usando o MESMO CÁLCULO do relatório HTML (calcular_margens)
+# Critério: Descontos Facultativos > limite ideal de 35% da margem consignável (RLM)
+margens = calcular_margens_holerites([Holerite.from_dict(dados) for dados in dados_folhas])
 servidores_criticos = []
-for servidor in dados_folhas:
-    descontos_extras = servidor.get('total_descontos_extras', 0)
-    liquido_final = servidor.get('liquido', 0)
-    
-    if liquido_final > 0:
-        percentual = (descontos_extras / liquido_final) * 100
-        
-        if percentual > 35:
-            # Calcular também a margem consignável para referência
-            margem_consignavel = servidor.get('total_proventos', 0) - servidor.get('total_descontos_obrigatorios', 0)
-            
-            servidores_criticos.append({
-                'Nome_Original': servidor.get('nome', ''),
-                'Nome_Normalizado': normalizar_nome(servidor.get('nome', '')),
-                'CPF': servidor.get('cpf', ''),
-                'Matrícula': servidor.get('matricula', ''),
-                'Situação': servidor.get('situacao', 'N/A'),
-                'Percentual': round(percentual, 1),
-                'Liquido_Final': round(liquido_final, 2),
-                'Margem_Consignavel': round(margem_consignavel, 2),
-                'Descontos_Extras': round(descontos_extras, 2)
-            })
+for indice in np.flatnonzero((margens['status'] == 'CRÍTICO').to_numpy()):
+    servidor = dados_folhas[indice]
+    margem = margens.iloc[indice]
+    servidores_criticos.append({
+        'Nome_Original': servidor.get('nome', ''),
+        'Nome_Normalizado': normalizar_nome(servidor.get('nome', '')),
+        'CPF': servidor.get('cpf', ''),
+        'Matrícula': servidor.get('matricula', ''),
+        'Situação': servidor.get('situacao', 'N/A'),
+        'Percentual': round(margem['percentual_limite'], 1),
+        'Liquido_Final': round(servidor.get('liquido', 0), 2),
+        'Margem_Consignavel': round(margem['margem_consignavel'], 2),
+        'Descontos_Extras': round(servidor.get('total_descontos_extras', 0), 2)
+    })
 
-print(f"\n📊 Total de servidores CRÍTICOS no ESTUDO (Descontos > 35% do Líquido): {len(servidores_criticos)}")
+print(f"\n📊 Total de servidores CRÍTICOS no ESTUDO (Descontos > 35% da RLM): {len(servidores_criticos)}")
 
 # Contar por situação
 situacoes = Counter([s['Situação'] for s in servidores_criticos])
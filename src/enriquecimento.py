@@ -0,0 +1,62 @@
+"""
+Enriquecimento dos holerites com idade e tempo de serviço
+As datas de nascimento e de admissão são convertidas em lote (pandas/datetime64) e as idades
+calculadas em relação à data da competência, e não ao relógio do momento do processamento:
+reprocessar uma competência antiga produz as mesmas idades
+"""
+
+import calendar
+import re
+from datetime import date
+from itertools import islice
+
+import pandas as pd
+
+# Quantidade de holerites enriquecidos por vez (mantém o fluxo do pipeline com memória limitada)
+TAMANHO_LOTE_DATAS = 1000
+
+def data_referencia_competencia(nome_competencia):
+    """Último dia do mês da competência 'AAAA-MM' (ex.: '2025-11' → 30/11/2025); None se o nome não segue o padrão"""
+    encontrado = re.fullmatch(r'(\d{4})-(\d{2})', nome_competencia or '')
+    if not encontrado:
+        return None
+    ano, mes = int(encontrado.group(1)), int(encontrado.group(2))
+    if not 1 <= mes <= 12:
+        return None
+    return date(ano, mes, calendar.monthrange(ano, mes)[1])
+
+def anos_completos(datas, referencia):
+    """Anos completos entre cada data (Series datetime64, NaT permitido) e a data de referência"""
+    ainda_nao_fez = (datas.dt.month > referencia.month) | ((datas.dt.month == referencia.month) & (datas.dt.day > referencia.day))
+    return (referencia.year - datas.dt.year - ainda_nao_fez).astype('Int64')
+
+def enriquecer_datas(holerites, data_referencia=None):
+    """
+    Preenche em cada holerite (na própria lista) idade_anos e tempo_servico_anos (inteiros, ou None se a
+    data não foi encontrada ou é inválida) e o texto 'NN anos' de idade exibido no relatório.
+    Sem data_referencia, usa a data atual.
+    """
+    if not holerites:
+        return
+    referencia = pd.Timestamp(data_referencia) if data_referencia is not None else pd.Timestamp.today().normalize()
+    nascimento = pd.to_datetime(pd.Series([h.get('data_nascimento') or None for h in holerites], dtype=object),
+                                format='%d/%m/%Y', errors='coerce')
+    admissao = pd.to_datetime(pd.Series([h.get('data_admissao') or None for h in holerites], dtype=object),
+                              format='%d/%m/%Y', errors='coerce')
+    idades = anos_completos(nascimento, referencia)
+    tempos = anos_completos(admissao, referencia)
+
+    for holerite, idade, tempo in zip(holerites, idades.tolist(), tempos.tolist()):
+        idade = None if idade is pd.NA else idade
+        holerite['idade_anos'] = idade
+        holerite['tempo_servico_anos'] = None if tempo is pd.NA else tempo
+        holerite['idade'] = f"{idade} anos" if idade is not None else ''
+
+def em_lotes(iteravel, tamanho=TAMANHO_LOTE_DATAS):
+    """Agrupa o fluxo de holerites em listas de até `tamanho` itens, na mesma ordem"""
+    iterador = iter(iteravel)
+    while True:
+        lote = list(islice(iterador, tamanho))
+        if not lote:
+            return
+        yield lote
@@ -0,0 +1,83 @@
+"""
+Coletor dos eventos que não constam da planilha de classificação
+Os eventos são registrados por holerite consolidado (depois da junção das páginas de continuação, feita no
+processo principal também no modo --workers), e não por página: o resultado é o mesmo com qualquer número
+de processos e nos holerites reaproveitados, reclassificados ou retomados do checkpoint. Nenhum estado
+global é alterado e coletores separados podem ser unidos em ordem (mesclar). Para cada evento são somadas
+as ocorrências, os holerites afetados e o valor total (em centavos), com alguns holerites de exemplo, para
+que EVENTOS_NAO_CLASSIFICADOS.txt liste primeiro os de maior impacto financeiro
+"""
+
+from collections import namedtuple
+
+from manifesto import arquivo_do_registro
+
+# Holerites de exemplo guardados por evento
+MAXIMO_EXEMPLOS = 3
+
+EventoNaoMapeado = namedtuple('EventoNaoMapeado', ['codigo', 'descricao_normalizada', 'descricao', 'ocorrencias',
+                                                   'holerites', 'valor_total', 'exemplos'])
+
+def ordem_codigo(codigo):
+    """Chave de ordenação do código do evento: numéricos em ordem numérica, depois os demais"""
+    return (0, int(codigo), '') if codigo.isdigit() else (1, 0, codigo)
+
+class EventosNaoMapeados:
+    """
+    Eventos não classificados por (código, descrição em maiúsculas), na ordem em que apareceram.
+    Os exemplos são tuplas (nome, CPF, PDF de origem) dos primeiros holerites afetados; sem o número da
+    página, o exemplo é o mesmo com o holerite lido página a página ou já consolidado (reaproveitado).
+    """
+
+    def __init__(self, maximo_exemplos=MAXIMO_EXEMPLOS):
+        self.maximo_exemplos = maximo_exemplos
+        self._eventos = {}
+
+    def _registro(self, chave, descricao):
+        """Totais do evento (criados na primeira ocorrência, com a descrição como apareceu no holerite)"""
+        registro = self._eventos.get(chave)
+        if registro is None:
+            registro = self._eventos[chave] = {'descricao': descricao, 'ocorrencias': 0, 'holerites': 0,
+                                               'valor': 0, 'exemplos': []}
+        return registro
+
+    def registrar(self, dados, eventos):
+        """Registra os eventos (com codigo, descricao e valor_centavos) não classificados de um holerite"""
+        exemplo = (dados.get('nome') or '', dados.get('cpf') or '', arquivo_do_registro(dados))
+        vistos = set()
+        for evento in eventos:
+            chave = (evento['codigo'], evento['descricao'].upper())
+            registro = self._registro(chave, evento['descricao'])
+            registro['ocorrencias'] += 1
+            registro['valor'] += evento['valor_centavos']
+            if chave not in vistos:
+                vistos.add(chave)
+                registro['holerites'] += 1
+                if len(registro['exemplos']) < self.maximo_exemplos:
+                    registro['exemplos'].append(exemplo)
+
+    def mesclar(self, outro):
+        """Soma os eventos de outro coletor (de uma tarefa posterior) a este"""
+        for chave, registro_outro in outro._eventos.items():
+            registro = self._registro(chave, registro_outro['descricao'])
+            registro['ocorrencias'] += registro_outro['ocorrencias']
+            registro['holerites'] += registro_outro['holerites']
+            registro['valor'] += registro_outro['valor']
+            faltam = self.maximo_exemplos - len(registro['exemplos'])
+            if faltam > 0:
+                registro['exemplos'].extend(registro_outro['exemplos'][:faltam])
+        return self
+
+    def __len__(self):
+        return len(self._eventos)
+
+    def __contains__(self, chave):
+        return chave in self._eventos
+
+    def por_impacto(self):
+        """EventoNaoMapeado de cada evento, do maior para o menor valor total (em empate, mais ocorrências)"""
+        eventos = [EventoNaoMapeado(codigo, descricao_upper, registro['descricao'], registro['ocorrencias'],
+                                    registro['holerites'], registro['valor'], tuple(registro['exemplos']))
+                   for (codigo, descricao_upper), registro in self._eventos.items()]
+        return sorted(eventos, key=lambda evento: (-evento.valor_total, -evento.ocorrencias, ordem_codigo(evento.codigo),
+                                                   evento.descricao_normalizada))
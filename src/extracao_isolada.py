@@ -0,0 +1,186 @@
+"""
+Extração do texto das páginas em processo isolado, com limites de tempo e de memória por página
+Uma página malformada que trave ou estoure a memória do PyPDF2 é interrompida e registrada como erro,
+sem parar o restante do processamento
+"""
+
+import io
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+
+import PyPDF2
+
+# segundos: tempo máximo de extract_text por página; memoria_mb: memória adicional máxima do processo
+LimitesPagina = namedtuple('LimitesPagina', ['segundos', 'memoria_mb'])
+
+# Intervalo entre verificações de memória enquanto uma página é extraída
+INTERVALO_VERIFICACAO = 0.05
+
+class LimitePaginaExcedido(Exception):
+    """A extração de uma página excedeu o limite de tempo ou de memória"""
+
+def pagina_tem_conteudo(pagina):
+    """Pré-classificação pelo content stream: página sem conteúdo nem passa pelo extract_text"""
+    conteudo = pagina.get_contents()
+    return conteudo is not None and bool(conteudo.get_data().strip())
+
+def extrair_texto_pagina(pagina):
+    return pagina.extract_text() if pagina_tem_conteudo(pagina) else ''
+
+def memoria_residente_mb(pid):
+    """Memória residente (RSS) do processo em MB, ou None se o sistema não expõe /proc"""
+    try:
+        with open(f'/proc/{pid}/statm') as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def limites_efetivos(limites):
+    """
+    Limites aplicáveis neste sistema: sem /proc (ex.: Windows) a memória do processo de extração não
+    pode ser medida, e o limite de memória é desativado com um aviso em vez de ficar sem efeito
+    """
+    if limites.memoria_mb and memoria_residente_mb(os.getpid()) is None:
+        print(f"⚠️  Limite de memória por página ({limites.memoria_mb:g} MB) ignorado: o sistema não expõe /proc "
+              f"para medir a memória do processo de extração")
+        return limites._replace(memoria_mb=0)
+    return limites
+
+class ExtratorPdf:
+    """Extração no próprio processo (sem limites); conteudo = PDF já lido em memória (leitura antecipada)"""
+
+    def __init__(self, caminho_pdf, conteudo=None):
+        self._arquivo = io.BytesIO(conteudo) if conteudo is not None else open(caminho_pdf, 'rb')
+        self._leitor = PyPDF2.PdfReader(self._arquivo)
+        self.num_paginas = len(self._leitor.pages)
+
+    def extrair(self, numero_pagina):
+        return extrair_texto_pagina(self._leitor.pages[numero_pagina])
+
+    def fechar(self):
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+def _servir_paginas(caminho_pdf, conteudo, conexao):
+    """Processo de extração: abre o PDF uma vez e responde aos pedidos de página até receber None"""
+    try:
+        extrator = ExtratorPdf(caminho_pdf, conteudo)
+    except Exception as e:
+        conexao.send(('erro', str(e)))
+        return
+
+    with extrator:
+        conexao.send(('ok', extrator.num_paginas))
+        while True:
+            numero_pagina = conexao.recv()
+            if numero_pagina is None:
+                return
+            try:
+                conexao.send(('ok', extrator.extrair(numero_pagina)))
+            except MemoryError:
+                conexao.send(('memoria', None))
+            except Exception as e:
+                conexao.send(('erro', str(e)))
+
+class ExtratorIsolado:
+    """
+    Mesma interface de ExtratorPdf, mas o PyPDF2 roda em um processo filho.
+    Se uma página passa de limites.segundos ou o processo cresce mais de limites.memoria_mb
+    (medido pelo RSS, onde /proc está disponível), o filho é encerrado, a página gera
+    LimitePaginaExcedido e um novo processo assume as páginas seguintes.
+    """
+
+    def __init__(self, caminho_pdf, limites, conteudo=None):
+        self.caminho_pdf = caminho_pdf
+        self.limites = limites
+        self.conteudo = conteudo
+        self._processo = None
+        self._iniciar()
+
+    def _iniciar(self):
+        self._memoria_inicial = None
+        self._conexao, conexao_filho = multiprocessing.Pipe()
+        self._processo = multiprocessing.Process(target=_servir_paginas, args=(self.caminho_pdf, self.conteudo, conexao_filho), daemon=True)
+        self._processo.start()
+        conexao_filho.close()
+
+        situacao, valor = self._aguardar()
+        if situacao != 'ok':
+            self._encerrar()
+            raise Exception(valor)
+        self.num_paginas = valor
+        self._memoria_inicial = memoria_residente_mb(self._processo.pid)
+
+    def _aguardar(self):
+        """Aguarda a resposta do filho respeitando os limites; retorna (situacao, valor)"""
+        limite_tempo = time.monotonic() + self.limites.segundos if self.limites.segundos else None
+        while not self._conexao.poll(INTERVALO_VERIFICACAO):
+            if limite_tempo is not None and time.monotonic() > limite_tempo:
+                return 'tempo', None
+            if self.limites.memoria_mb and self._memoria_inicial is not None:
+                memoria = memoria_residente_mb(self._processo.pid)
+                if memoria is not None and memoria - self._memoria_inicial > self.limites.memoria_mb:
+                    return 'memoria', None
+            if not self._processo.is_alive() and not self._conexao.poll():
+                return 'encerrado', None
+        try:
+            return self._conexao.recv()
+        except EOFError:
+            return 'encerrado', None
+
+    def extrair(self, numero_pagina):
+        if self._processo is None:
+            self._iniciar()
+        self._conexao.send(numero_pagina)
+        situacao, valor = self._aguardar()
+        if situacao == 'ok':
+            return valor
+        if situacao == 'erro':
+            raise Exception(valor)
+
+        # Limite excedido: o processo é descartado e recriado na próxima página
+        self._encerrar()
+        if situacao == 'tempo':
+            raise LimitePaginaExcedido(f"Tempo limite de {self.limites.segundos:g}s excedido na extração do texto")
+        if situacao == 'memoria':
+            raise LimitePaginaExcedido(f"Limite de memória de {self.limites.memoria_mb:g} MB excedido na extração do texto")
+        raise LimitePaginaExcedido("Processo de extração encerrado inesperadamente")
+
+    def _encerrar(self):
+        if self._processo is not None:
+            if self._processo.is_alive():
+                self._processo.kill()
+            self._processo.join()
+            self._conexao.close()
+            self._processo = None
+
+    def fechar(self):
+        if self._processo is not None and self._processo.is_alive():
+            try:
+                self._conexao.send(None)
+                self._processo.join(1)
+            except OSError:
+                pass
+        self._encerrar()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+def abrir_extrator(caminho_pdf, limites=None, conteudo=None):
+    """
+    Extrator de texto do PDF: isolado em outro processo se houver limites, senão no próprio processo.
+    Com conteudo (bytes já lidos), o PDF é aberto da memória em vez do disco.
+    """
+    if limites and (limites.segundos or limites.memoria_mb):
+        return ExtratorIsolado(caminho_pdf, limites, conteudo)
+    return ExtratorPdf(caminho_pdf, conteudo)
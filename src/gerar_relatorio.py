@@ -2,26 +2,52 @@ import PyPDF2
 import re
 import json
 import os
+import sys
 import logging
+import argparse
+import shutil
+import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
-import pandas as pd
-
-# Configurar logging
-log_dir = Path(__file__).parent.parent / "logs"
-log_dir.mkdir(exist_ok=True)
-log_file = log_dir / f"relatorio_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file, encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import groupby
+from contextlib import ExitStack, contextmanager, redirect_stdout
+
+from cache_paginas import CachePaginas, calcular_hash_arquivo
+from registros_processados import RegistrosProcessados, ler_json_array
+from manifesto import Manifesto, arquivo_do_registro, id_registro
+from checkpoint import Checkpoint
+from extracao_isolada import LimitesPagina, abrir_extrator, limites_efetivos
+from leitura_antecipada import LeituraAntecipada, PDFS_ANTECIPADOS
+from moeda import centavos_br, reais, formatar_centavos_br
+from holerite import Holerite, Evento, resultado_do_registro
+from tabela_eventos import TabelaEventos, TIPOS_EVENTO
+from parametros import RepositorioClassificacao, CAMINHO_PLANILHA, CAMINHO_EVENTOS_DB
+from indice_eventos import IndiceClassificacao
+from eventos_nao_mapeados import EventosNaoMapeados
+from agregacao import AgregacaoRelatorio, FAIXAS_ETARIAS
+from enriquecimento import TAMANHO_LOTE_DATAS, data_referencia_competencia, enriquecer_datas, em_lotes
+from margens import enriquecer_margens
+
 logger = logging.getLogger(__name__)
 
+def configurar_logging():
+    """Configura o log da execução (arquivo em logs/ e console)"""
+    log_dir = Path(__file__).parent.parent / "logs"
+    log_dir.mkdir(exist_ok=True)
+    log_file = log_dir / f"relatorio_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file, encoding='utf-8'),
+            logging.StreamHandler()
+        ]
+    )
+
 def detectar_competencias_disponiveis():
     """Detecta competências disponíveis com holerites"""
     caminho_base = Path(__file__).parent.parent
@@ -61,255 +87,317 @@ def selecionar_competencia():
     
     return competencia_selecionada
 
-# Carregar mapeamento de eventos da planilha Descricao_Comp_Rend.xlsx
-def carregar_mapeamento_eventos():
-    """
-    Carrega o mapeamento de código/descrição → tipo de evento
-    da planilha Descricao_Comp_Rend.xlsx
-    """
-    try:
-        caminho_planilha = Path(__file__).parent.parent / 'data' / 'parametros' / 'Descricao_Comp_Rend.xlsx'
-        df_eventos = pd.read_excel(caminho_planilha, sheet_name='Composição de Rendimentos')
-        
-        mapeamento = {}
-        for _, row in df_eventos.iterrows():
-            codigo = str(row['CÓDIGO']).strip()
-            descricao = str(row['DESCRIÇÃO EVENTOS']).strip().upper()
-            tipo = str(row['TIPO']).strip()
-            mapeamento[(codigo, descricao)] = tipo
-        
-        return mapeamento
-    except Exception as e:
-        print(f"⚠️  Aviso: Não foi possível carregar o mapeamento de eventos: {e}")
-        print("   O sistema usará a classificação padrão.")
-        return {}
+def listar_pdfs(caminho_pasta):
+    """PDFs de holerites da pasta (ignora arquivos de logotipo)"""
+    return [f for f in caminho_pasta.glob('*.pdf') if 'Logo' not in f.name]
 
-def carregar_ordem_eliminacao():
-    """
-    Carrega a ordem de eliminação da planilha Descricao_Comp_Rend.xlsx
-    Retorna dicionário: {descricao_normalizada: ordem_numero}
-    """
-    try:
-        caminho_planilha = Path(__file__).parent.parent / 'data' / 'parametros' / 'Descricao_Comp_Rend.xlsx'
-        df_ordem = pd.read_excel(caminho_planilha, sheet_name='Ordem de Eliminação')
-        
-        # Criar dicionário de prioridades
-        prioridades = {}
-        for _, row in df_ordem.iterrows():
-            descricao = str(row['DESCRIÇÃO EVENTOS']).strip().upper()
-            ordem_texto = str(row['ORDEM']).strip()
-            
-            # Extrair número da ordem (1, 2, 3 ou 4)
-            if '1 -' in ordem_texto:
-                ordem_num = 1
-            elif '2 -' in ordem_texto:
-                ordem_num = 2
-            elif '3 -' in ordem_texto:
-                ordem_num = 3
-            elif '4 -' in ordem_texto:
-                ordem_num = 4
-            else:
-                ordem_num = 5  # Fallback para desconhecidos
-            
-            prioridades[descricao] = {
-                'ordem': ordem_num,
-                'nome_ordem': ordem_texto
-            }
-        
-        return prioridades
-    except Exception as e:
-        print(f"⚠️  Aviso: Não foi possível carregar ordem de eliminação: {e}")
-        return {}
+def intervalo_competencias(texto):
+    """Converte 'AAAA-MM:AAAA-MM' (argumento --range) em (inicio, fim)"""
+    encontrado = re.match(r'^(\d{4}-\d{2}):(\d{4}-\d{2})$', texto)
+    if not encontrado or encontrado.group(1) > encontrado.group(2):
+        raise argparse.ArgumentTypeError(f"intervalo inválido: {texto} (use AAAA-MM:AAAA-MM, ex.: 2025-01:2025-12)")
+    return encontrado.group(1), encontrado.group(2)
 
-# Carregar mapeamentos globais
-MAPEAMENTO_EVENTOS = carregar_mapeamento_eventos()
-ORDEM_ELIMINACAO = carregar_ordem_eliminacao()
+def selecionar_competencias_lote(intervalo=None):
+    """Competências para o modo lote: todas (--all) ou as do intervalo (--range), da mais recente à mais antiga"""
+    competencias = detectar_competencias_disponiveis()
+    if intervalo:
+        inicio, fim = intervalo
+        competencias = [comp for comp in competencias if inicio <= comp['pasta'] <= fim]
+    
+    if not competencias:
+        logger.error("❌ Nenhuma competência com holerites encontrada" + (f" entre {intervalo[0]} e {intervalo[1]}!" if intervalo else "!"))
+        logger.info("💡 Coloque os PDFs em: data/competencias/AAAA-MM/holerites/")
+        return []
+    
+    logger.info(f"\n📅 Competências selecionadas ({len(competencias)}): {', '.join(comp['pasta'] for comp in competencias)}")
+    return competencias
+
+# Planilha de parâmetros (classificação dos eventos e ordem de eliminação) e sua forma compilada, eventos.db
+CAMINHO_PARAMETROS = CAMINHO_PLANILHA
+REPOSITORIO_CLASSIFICACAO = RepositorioClassificacao(CAMINHO_PARAMETROS, CAMINHO_EVENTOS_DB)
+
+# Mapeamentos globais, carregados na primeira utilização (eventos.db, sincronizado com a planilha só quando
+# ela muda). De fora do módulo são lidos como gerar_relatorio.MAPEAMENTO_EVENTOS / ORDEM_ELIMINACAO;
+# aqui dentro, por mapeamento_eventos()/ordem_eliminacao()
+def _carregar_parametros_globais():
+    global MAPEAMENTO_EVENTOS, ORDEM_ELIMINACAO, INDICE_CLASSIFICACAO
+    REPOSITORIO_CLASSIFICACAO.sincronizar()
+    MAPEAMENTO_EVENTOS = REPOSITORIO_CLASSIFICACAO.mapeamento_eventos()
+    ORDEM_ELIMINACAO = REPOSITORIO_CLASSIFICACAO.ordem_eliminacao()
+    INDICE_CLASSIFICACAO = IndiceClassificacao(MAPEAMENTO_EVENTOS)
+
+def mapeamento_eventos():
+    """Mapeamento (código, descrição) → tipo de evento da planilha de parâmetros"""
+    if 'MAPEAMENTO_EVENTOS' not in globals():
+        _carregar_parametros_globais()
+    return MAPEAMENTO_EVENTOS
+
+def ordem_eliminacao():
+    """Ordem de eliminação dos descontos facultativos da planilha de parâmetros"""
+    if 'ORDEM_ELIMINACAO' not in globals():
+        _carregar_parametros_globais()
+    return ORDEM_ELIMINACAO
+
+def indice_classificacao():
+    """Índice das descrições normalizadas e dos trigramas dos eventos classificados (indice_eventos)"""
+    if 'INDICE_CLASSIFICACAO' not in globals():
+        _carregar_parametros_globais()
+    return INDICE_CLASSIFICACAO
 
-# Lista global para rastrear eventos não mapeados
-EVENTOS_NAO_MAPEADOS = set()  # Usar set para evitar duplicatas
+def __getattr__(nome):
+    if nome in ('MAPEAMENTO_EVENTOS', 'ORDEM_ELIMINACAO'):
+        _carregar_parametros_globais()
+        return globals()[nome]
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+
+def hash_parametros():
+    """Hash do conteúdo das tabelas de parâmetros em uso (gravado no manifesto e no checkpoint dos resultados)"""
+    mapeamento_eventos()  # garante o banco sincronizado com a planilha
+    return REPOSITORIO_CLASSIFICACAO.hash_tabelas()
+
+def recarregar_parametros():
+    """Sincroniza eventos.db com a planilha e recarrega os mapeamentos globais (mantidos em memória no modo --watch)"""
+    REPOSITORIO_CLASSIFICACAO.sincronizar()
+    mapeamento_eventos().clear()
+    MAPEAMENTO_EVENTOS.update(REPOSITORIO_CLASSIFICACAO.mapeamento_eventos())
+    ordem_eliminacao().clear()
+    ORDEM_ELIMINACAO.update(REPOSITORIO_CLASSIFICACAO.ordem_eliminacao())
+    global INDICE_CLASSIFICACAO
+    INDICE_CLASSIFICACAO = IndiceClassificacao(MAPEAMENTO_EVENTOS)
+
+# Páginas descartadas pela pré-classificação (em branco, capa, encerramento) sem passar por extrair_dados_ativos
+PRE_CLASSIFICACAO = {'paginas_descartadas': 0}
+
+# Páginas cuja extração falhou (ex.: limite de tempo/memória excedido), registradas no log de erros
+PAGINAS_COM_ERRO = []
+
+# Marcador substituído pelos dados dos beneficiários ao gravar o HTML (escrever_html_relatorio)
+MARCADOR_DADOS_BENEFICIARIOS = '/*__DADOS_BENEFICIARIOS__*/'
+
+# Quantidade de páginas por tarefa no modo paralelo (--workers)
+PAGINAS_POR_TAREFA = 100
+
+# Limites padrão de extração por página (--limite-pagina / --limite-memoria): desativados, a extração
+# roda no próprio processo; com um limite, cada PDF é extraído em processo isolado (cerca de 10% mais lento)
+LIMITE_SEGUNDOS_PAGINA = 0
+LIMITE_MEMORIA_PAGINA_MB = 0
 
 def formatar_moeda_br(valor):
     """Formata valor monetário no padrão brasileiro: 1.450,15"""
     return f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
 
-def extrair_dados_ativos(linhas, caminho_pdf, numero_pagina=None):
+# Padrões do layout de ATIVOS, compilados uma única vez (extrair_dados_ativos)
+RE_COMPETENCIA = re.compile(r'Competência:\s*([A-Za-zç]+/\d{4})', re.IGNORECASE)
+RE_CPF = re.compile(r'(\d{3}\.\d{3}\.\d{3}-\d{2})')
+RE_NOME = re.compile(r'^([A-ZÁÉÍÓÚÀÂÊÔÃÕÇ\s\.]+?)\s+\d{3}\.\d{3}\.\d{3}-\d{2}')
+RE_CARGO = re.compile(r'Cargo:\s*(.+?)\s+(\d{2}/\d{2}/\d{4})')
+RE_MATRICULA = re.compile(r'-\s+(\d+)\s*$')
+RE_NASCIMENTO = re.compile(r'Nasc\s+(\d{2}/\d{2}/\d{4})')
+RE_EVENTO = re.compile(r'^\s*([\d\.,]+)\s+([\d\.,]+)\s+([\d\.,]+)\s+(.+?)\s+(\d+)\s*$')
+RE_LIQUIDO = re.compile(r'([\d\.,]+)\s*Totalizações')
+
+@lru_cache(maxsize=4096)
+def normalizar_descricao(descricao):
     """
-    Extrai dados de servidores ATIVOS (novo layout)
+    Descrição do evento sem espaços duplos e em maiúsculas (chave da planilha), como strings
+    compartilhadas: a competência repete poucas centenas de descrições em milhares de linhas
     """
-    dados = {
-        'nome': '',
-        'cpf': '',
-        'matricula': '',
-        'data_nascimento': '',
-        'idade': '',
-        'situacao': 'Ativo',  # Sempre ativo para este layout
-        'competencia': '',
-        'cargo': '',
-        'data_admissao': '',
-        'proventos': [],
-        'descontos_obrigatorios': [],
-        'descontos_extras': [],
-        'eventos_informativos': [],  # NOVO: eventos que não entram no cálculo da margem
-        'total_proventos': 0,
-        'total_descontos_obrigatorios': 0,
-        'total_descontos_extras': 0,
-        'total_descontos': 0,
-        'liquido': 0,
-        'arquivo_origem': os.path.basename(caminho_pdf) + (f" (pág. {numero_pagina+1})" if numero_pagina is not None else ""),
-        'erro_processamento': None
-    }
+    descricao = sys.intern(' '.join(descricao.split()))
+    return descricao, descricao.upper()
+
+# Destino de cada tipo de evento da planilha: (lista, total do tipo em centavos, entra em total_descontos)
+# Tipos ausentes da tabela (não mapeados) seguem o fallback de provento
+DESTINO_EVENTOS = {
+    'Provento': ('proventos', 'total_proventos_centavos', False),
+    'Desconto Compulsório (obrigatório)': ('descontos_obrigatorios', 'total_descontos_obrigatorios_centavos', True),
+    'Desconto Facultativo (extra)': ('descontos_extras', 'total_descontos_extras_centavos', True),
+    'Omitir do cálculo': ('eventos_informativos', None, False),  # não entra no cálculo da margem
+}
+DESTINO_FALLBACK = DESTINO_EVENTOS['Provento']
+
+def extrair_dados_holerite(linhas, caminho_pdf, numero_pagina=None, situacao='Ativo'):
+    """
+    Extrai os dados de um holerite da SGP (novo layout, comum a ativos, aposentados e pensionistas)
+    
+    As linhas são percorridas uma única vez. Cada campo do cabeçalho é procurado só nas primeiras
+    linhas (competência: 5; nome/CPF e cargo: 10; matrícula e nascimento: 15) e lido da primeira
+    linha que contém o seu rótulo; os eventos vêm depois de 'Composição de Rendimentos Mensal'
+    e o líquido da primeira linha de 'Totalizações' com valor.
+    """
+    mapeamento = mapeamento_eventos()
+    variacoes = indice_classificacao()
+    # Situação definida pelo layout identificado na página; eventos_informativos não entram no cálculo da margem
+    dados = Holerite.vazio(situacao, os.path.basename(caminho_pdf) + (f" (pág. {numero_pagina+1})" if numero_pagina is not None else ""))
     
     try:
-        # 1. Extrair competência (linha 1)
-        for linha in linhas[:5]:
-            if 'Competência:' in linha or 'Competencia:' in linha:
-                comp_match = re.search(r'Competência:\s*([A-Za-zç]+/\d{4})', linha, re.IGNORECASE)
-                if comp_match:
-                    dados['competencia'] = comp_match.group(1)
-                    break
-        
-        # 2. Extrair nome e CPF (linha 2 - formato: "NOME CPF Matrícula: CPF:")
-        for linha in linhas[:10]:
-            if 'Matrícula:' in linha and 'CPF:' in linha:
-                cpf_match = re.search(r'(\d{3}\.\d{3}\.\d{3}-\d{2})', linha)
-                if cpf_match:
-                    dados['cpf'] = cpf_match.group(1)
-                
-                # Nome está antes do CPF
-                nome_match = re.search(r'^([A-ZÁÉÍÓÚÀÂÊÔÃÕÇ\s\.]+?)\s+\d{3}\.\d{3}\.\d{3}-\d{2}', linha)
-                if nome_match:
-                    dados['nome'] = nome_match.group(1).strip()
-                break
-        
-        # 3. Extrair cargo e data de admissão (linha 3)
-        for linha in linhas[:10]:
-            if 'Cargo:' in linha and 'Admissão:' in linha:
-                cargo_match = re.search(r'Cargo:\s*(.+?)\s+(\d{2}/\d{2}/\d{4})', linha)
-                if cargo_match:
-                    dados['cargo'] = cargo_match.group(1).strip()
-                    dados['data_admissao'] = cargo_match.group(2)
-                break
-        
-        # 4. Extrair matrícula da linha Loc.Trabalho (último número da linha)
-        for linha in linhas[:15]:
-            if 'Loc.Trabalho' in linha:
-                # A matrícula é o último número da linha (ex: "Loc.Trabalho : 006791001 - GAB DEP GILBERTO CATTANI 0 - 47767")
-                matricula_match = re.search(r'-\s+(\d+)\s*$', linha)
-                if matricula_match:
-                    dados['matricula'] = matricula_match.group(1)
-                break
-        
-        # 5. Extrair data de nascimento
-        for linha in linhas[:15]:
-            if 'Nasc' in linha:
-                # Data de nascimento
-                nasc_match = re.search(r'Nasc\s+(\d{2}/\d{2}/\d{4})', linha)
-                if nasc_match:
-                    dados['data_nascimento'] = nasc_match.group(1)
-                    # Calcular idade
-                    try:
-                        data_nasc = datetime.strptime(dados['data_nascimento'], '%d/%m/%Y')
-                        hoje = datetime.now()
-                        idade = hoje.year - data_nasc.year - ((hoje.month, hoje.day) < (data_nasc.month, data_nasc.day))
-                        dados['idade'] = f"{idade} anos"
-                    except:
-                        dados['idade'] = ''
-                break
-        
-        # 6. Extrair eventos (proventos e descontos)
-        # Formato: " VALOR1  VALOR2  REF DESCRIÇÃO CÓDIGO"
-        # Exemplo: " 1.465,40  1.465,40  30,00 SUBSIDIO 1"
-        
+        # Campos do cabeçalho ainda não encontrados
+        busca_competencia = busca_nome = busca_cargo = busca_matricula = busca_nascimento = True
         inicio_tabela = False
-        for linha in linhas:
+        texto_liquido = None
+        totais = {}  # somas em centavos dos tipos encontrados
+        
+        for indice, linha in enumerate(linhas):
+            # === Cabeçalho (primeiras linhas) ===
+            if indice < 15:
+                # 1. Competência (linha 1)
+                if busca_competencia and indice < 5 and ('Competência:' in linha or 'Competencia:' in linha):
+                    comp_match = RE_COMPETENCIA.search(linha)
+                    if comp_match:
+                        dados.competencia = sys.intern(comp_match.group(1))
+                        busca_competencia = False
+                
+                # 2. Nome e CPF (linha 2 - formato: "NOME CPF Matrícula: CPF:")
+                if busca_nome and indice < 10 and 'Matrícula:' in linha and 'CPF:' in linha:
+                    busca_nome = False
+                    cpf_match = RE_CPF.search(linha)
+                    if cpf_match:
+                        dados.cpf = cpf_match.group(1)
+                    # Nome está antes do CPF
+                    nome_match = RE_NOME.search(linha)
+                    if nome_match:
+                        dados.nome = nome_match.group(1).strip()
+                
+                # 3. Cargo e data de admissão (linha 3)
+                if busca_cargo and indice < 10 and 'Cargo:' in linha and 'Admissão:' in linha:
+                    busca_cargo = False
+                    cargo_match = RE_CARGO.search(linha)
+                    if cargo_match:
+                        dados.cargo = sys.intern(cargo_match.group(1).strip())
+                        dados.data_admissao = cargo_match.group(2)
+                
+                # 4. Matrícula: último número da linha Loc.Trabalho
+                # (ex: "Loc.Trabalho : 006791001 - GAB DEP GILBERTO CATTANI 0 - 47767")
+                if busca_matricula and 'Loc.Trabalho' in linha:
+                    busca_matricula = False
+                    matricula_match = RE_MATRICULA.search(linha)
+                    if matricula_match:
+                        dados.matricula = matricula_match.group(1)
+                
+                # 5. Data de nascimento (a idade é calculada em lote por enriquecer_datas)
+                if busca_nascimento and 'Nasc' in linha:
+                    busca_nascimento = False
+                    nasc_match = RE_NASCIMENTO.search(linha)
+                    if nasc_match:
+                        dados.data_nascimento = nasc_match.group(1)
+            
+            # === Líquido: primeira linha de totalização com valor (convertido ao final) ===
+            if texto_liquido is None and 'Totalizações' in linha:
+                match_total = RE_LIQUIDO.search(linha)
+                if match_total:
+                    texto_liquido = match_total.group(1)
+            
+            # === Eventos (proventos e descontos) ===
+            # Formato: " VALOR1  VALOR2  REF DESCRIÇÃO CÓDIGO"
+            # Exemplo: " 1.465,40  1.465,40  30,00 SUBSIDIO 1"
             if 'Composição de Rendimentos Mensal' in linha:
                 inicio_tabela = True
                 continue
             
-            if 'Cód. Descrição Eventos' in linha:
+            if not inicio_tabela or 'Cód. Descrição Eventos' in linha:
                 continue
             
             # Pular linhas de totalização mas continuar processando
-            if linha.strip().startswith('Proventos:') or linha.strip().startswith('Descontos:') or 'Totalizações' in linha:
+            conteudo = linha.strip()
+            if not conteudo or conteudo.startswith('Proventos:') or conteudo.startswith('Descontos:') or 'Totalizações' in linha:
                 continue
             
-            if inicio_tabela and linha.strip():
-                # Padrão: valor1 valor2 ref descrição código
-                evento_match = re.search(r'^\s*([\d\.,]+)\s+([\d\.,]+)\s+([\d\.,]+)\s+(.+?)\s+(\d+)\s*$', linha)
+            # Guarda barata: a linha de evento começa por um valor
+            if not (conteudo[0].isdigit() or conteudo[0] in '.,'):
+                continue
+            evento_match = RE_EVENTO.match(linha)
+            if not evento_match:
+                continue
+            
+            try:
+                texto_valor, texto_base, texto_referencia, descricao, codigo = evento_match.groups()
+                # O valor do evento é sempre o primeiro valor
+                valor_evento = centavos_br(texto_valor)
+                base_calculo = centavos_br(texto_base)
+                # Referência (dias, horas, percentual) não é valor monetário
+                referencia = float(texto_referencia.replace('.', '').replace(',', '.'))
+                # Normalizar descrição: remover espaços duplos
+                descricao, descricao_upper = normalizar_descricao(descricao)
                 
-                if evento_match:
-                    try:
-                        valor1 = float(evento_match.group(1).replace('.', '').replace(',', '.'))
-                        valor2 = float(evento_match.group(2).replace('.', '').replace(',', '.'))
-                        referencia = float(evento_match.group(3).replace('.', '').replace(',', '.'))
-                        descricao = evento_match.group(4).strip()
-                        # Normalizar descrição: remover espaços duplos
-                        descricao = re.sub(r'\s+', ' ', descricao)
-                        codigo = evento_match.group(5)
-                        
-                        # O valor do evento é sempre o primeiro valor
-                        valor_evento = valor1
-                        base_calculo = valor2
-                        
-                        # === NOVA CLASSIFICAÇÃO BASEADA NA PLANILHA Descricao_Comp_Rend.xlsx ===
-                        descricao_upper = descricao.upper()
-                        
-                        # Buscar tipo do evento no mapeamento
-                        tipo_evento = MAPEAMENTO_EVENTOS.get((codigo, descricao_upper), None)
-                        
-                        # Se não encontrou, registrar como não mapeado
-                        if tipo_evento is None:
-                            EVENTOS_NAO_MAPEADOS.add((codigo, descricao_upper, descricao))
-                        
-                        evento_obj = {
-                            'descricao': descricao,
-                            'valor': valor_evento,
-                            'base_calculo': base_calculo,
-                            'referencia': referencia,
-                            'codigo': codigo
-                        }
-                        
-                        # Classificar baseado no tipo da planilha
-                        if tipo_evento == 'Provento':
-                            dados['proventos'].append(evento_obj)
-                            dados['total_proventos'] += valor_evento
-                        elif tipo_evento == 'Desconto Compulsório (obrigatório)':
-                            dados['descontos_obrigatorios'].append(evento_obj)
-                            dados['total_descontos_obrigatorios'] += valor_evento
-                            dados['total_descontos'] += valor_evento
-                        elif tipo_evento == 'Desconto Facultativo (extra)':
-                            dados['descontos_extras'].append(evento_obj)
-                            dados['total_descontos_extras'] += valor_evento
-                            dados['total_descontos'] += valor_evento
-                        elif tipo_evento == 'Omitir do cálculo':
-                            # Armazenar como evento informativo (não entra no cálculo da margem)
-                            dados['eventos_informativos'].append(evento_obj)
-                        else:
-                            # Se não encontrou no mapeamento, assumir provento (fallback)
-                            # NOTA: Este evento será listado no relatório de não mapeados
-                            dados['proventos'].append(evento_obj)
-                            dados['total_proventos'] += valor_evento
-                    
-                    except Exception as e:
-                        pass
-        
-        # 6. Extrair líquido da linha de totalização
-        for linha in linhas:
-            if 'Totalizações' in linha:
-                match_total = re.search(r'([\d\.,]+)\s*Totalizações', linha)
-                if match_total:
-                    dados['liquido'] = float(match_total.group(1).replace('.', '').replace(',', '.'))
-                    break
-        
-        # Se não encontrou, calcular
-        if dados['liquido'] == 0:
-            dados['liquido'] = dados['total_proventos'] - dados['total_descontos']
+                # === CLASSIFICAÇÃO BASEADA NA PLANILHA Descricao_Comp_Rend.xlsx ===
+                tipo_evento = mapeamento.get((codigo, descricao_upper))
+                if tipo_evento is None:
+                    # Variação de acento/espaçamento de um evento classificado
+                    tipo_evento = variacoes.classificar(codigo, descricao_upper)
+                
+                # Se não encontrou, assumir provento
+                # NOTA: Este evento será listado no relatório de não mapeados (registrar_eventos_nao_mapeados)
+                lista, chave_total, desconto = DESTINO_EVENTOS.get(tipo_evento, DESTINO_FALLBACK)
+                
+                getattr(dados, lista).append(Evento(descricao, valor_evento, base_calculo, referencia, sys.intern(codigo)))
+                if chave_total:
+                    totais[chave_total] = totais.get(chave_total, 0) + valor_evento
+                if desconto:
+                    totais['total_descontos_centavos'] = totais.get('total_descontos_centavos', 0) + valor_evento
+            except Exception as e:
+                pass
+        
+        for chave_total, soma in totais.items():
+            setattr(dados, chave_total, soma)
+        
+        # 6. Líquido da linha de totalização
+        if texto_liquido is not None:
+            dados.liquido_centavos = centavos_br(texto_liquido)
+        
+        # Se não encontrou, calcular (e marcar: a reclassificação recalcula este líquido)
+        if dados.liquido_centavos == 0 and totais:
+            dados.liquido_centavos = totais.get('total_proventos_centavos', 0) - totais.get('total_descontos_centavos', 0)
+            dados.liquido_calculado = True
     
     except Exception as e:
         dados['erro_processamento'] = str(e)
     
     return dados
 
+def extrair_dados_ativos(linhas, caminho_pdf, numero_pagina=None):
+    """Extrai dados de servidores ATIVOS (novo layout)"""
+    return extrair_dados_holerite(linhas, caminho_pdf, numero_pagina, 'Ativo')
+
+def extrair_dados_aposentados(linhas, caminho_pdf, numero_pagina=None):
+    """Extrai dados de APOSENTADOS (mesma tabela de eventos do layout de ativos)"""
+    return extrair_dados_holerite(linhas, caminho_pdf, numero_pagina, 'Aposentado')
+
+def extrair_dados_pensionistas(linhas, caminho_pdf, numero_pagina=None):
+    """Extrai dados de PENSIONISTAS (mesma tabela de eventos do layout de ativos)"""
+    return extrair_dados_holerite(linhas, caminho_pdf, numero_pagina, 'Pensionista')
+
+# ========== REGISTRO DE LAYOUTS ==========
+# Cada layout de holerite tem um extrator; a página é atribuída a um layout pela impressão digital
+# do cabeçalho: o primeiro marcador (em maiúsculas) encontrado nas primeiras linhas da página.
+# Sem marcador, vale o layout padrão (ativos). Um novo layout só precisa de registrar_layout.
+LINHAS_IMPRESSAO_DIGITAL = 15
+LAYOUT_PADRAO = 'ativos'
+EXTRATORES_LAYOUT = {}
+MARCADORES_LAYOUT = []  # (marcador, nome do layout), na ordem de verificação
+
+def registrar_layout(nome, extrator, marcadores=()):
+    """Registra (ou substitui) o extrator de um layout e os marcadores que o identificam"""
+    EXTRATORES_LAYOUT[nome] = extrator
+    MARCADORES_LAYOUT[:] = [(marcador, layout) for marcador, layout in MARCADORES_LAYOUT if layout != nome]
+    MARCADORES_LAYOUT.extend((marcador.upper(), nome) for marcador in marcadores)
+
+def identificar_layout(linhas):
+    """Nome do layout da página, pela impressão digital das primeiras linhas"""
+    cabecalho = '\n'.join(linhas[:LINHAS_IMPRESSAO_DIGITAL]).upper()
+    for marcador, nome in MARCADORES_LAYOUT:
+        if marcador in cabecalho:
+            return nome
+    return LAYOUT_PADRAO
+
+def extrair_dados_pagina(linhas, caminho_pdf, numero_pagina=None):
+    """Extrai os dados da página com o extrator do layout identificado"""
+    return EXTRATORES_LAYOUT[identificar_layout(linhas)](linhas, caminho_pdf, numero_pagina)
+
+# Rótulos do cabeçalho que só existem nos holerites de inativos e de pensionistas
+registrar_layout('pensionistas', extrair_dados_pensionistas, ('Instituidor:', 'Pensionista:'))
+registrar_layout('aposentados', extrair_dados_aposentados, ('Aposentadoria:', 'Inatividade:'))
+registrar_layout(LAYOUT_PADRAO, extrair_dados_ativos)
+
 def extrair_dados_pdf(caminho_pdf, numero_pagina=None):
     """
     Extrai dados estruturados do PDF da folha de pagamento de servidores ATIVOS da SGP.
@@ -331,44 +419,490 @@ def extrair_dados_pdf(caminho_pdf, numero_pagina=None):
                 for pagina in leitor.pages:
                     texto_completo += pagina.extract_text()
             
-            # Extrair informações usando a função específica para servidores ativos
+            # Extrair informações com o extrator do layout da página
             linhas = texto_completo.split('\n')
-            return extrair_dados_ativos(linhas, caminho_pdf, numero_pagina)
+            return extrair_dados_pagina(linhas, caminho_pdf, numero_pagina)
     
     except Exception as e:
         # Retornar dados vazios com erro
-        return {
-            'nome': '',
-            'cpf': '',
-            'matricula': '',
-            'data_nascimento': '',
-            'idade': '',
-            'situacao': '',
-            'competencia': '',
-            'proventos': [],
-            'descontos_obrigatorios': [],
-            'descontos_extras': [],
-            'total_proventos': 0,
-            'total_descontos_obrigatorios': 0,
-            'total_descontos_extras': 0,
-            'total_descontos': 0,
-            'liquido': 0,
-            'arquivo_origem': os.path.basename(caminho_pdf) + (f" (pág. {numero_pagina+1})" if numero_pagina is not None else ""),
-            'erro_processamento': str(e)
-        }
+        return dados_com_erro(caminho_pdf, numero_pagina, e)
 
-def gerar_html_relatorio(dados_folhas):
-    """Gera o relatório HTML completo"""
+def dados_com_erro(caminho_pdf, numero_pagina, erro):
+    """Retorna um registro vazio marcado com o erro de processamento"""
+    return Holerite(
+        nome='',
+        cpf='',
+        matricula='',
+        data_nascimento='',
+        idade='',
+        situacao='',
+        competencia='',
+        proventos=[],
+        descontos_obrigatorios=[],
+        descontos_extras=[],
+        total_proventos_centavos=0,
+        total_descontos_obrigatorios_centavos=0,
+        total_descontos_extras_centavos=0,
+        total_descontos_centavos=0,
+        liquido_centavos=0,
+        arquivo_origem=os.path.basename(caminho_pdf) + (f" (pág. {numero_pagina+1})" if numero_pagina is not None else ""),
+        erro_processamento=str(erro)
+    )
+
+def extrair_textos_pdf(caminho_pdf, exibir=True, inicio=0, fim=None, cache=None, hash_pdf=None, limites=None,
+                       conteudo=None):
+    """
+    Abre o PDF uma única vez e gera (numero_pagina, texto, erro) para cada página, em ordem.
     
-    # Extrair competência do primeiro registro que tiver essa informação
-    competencia_formatada = "Competência não identificada"
-    for folha in dados_folhas:
-        if folha.get('competencia'):
-            competencia_formatada = folha['competencia']
-            break
+    O texto de cada página é extraído uma única vez; o custo passa a ser linear
+    no número de páginas (antes o arquivo era reaberto a cada página).
+    inicio/fim restringem a leitura ao intervalo de páginas [inicio, fim).
+    
+    Com cache (CachePaginas), os textos já extraídos de um PDF com o mesmo conteúdo
+    são reaproveitados e o PyPDF2 só é acionado se faltar alguma página do intervalo.
+    
+    Com limites (LimitesPagina), o texto é extraído em um processo isolado: a página que exceder
+    o tempo ou a memória gera erro (LimitePaginaExcedido) e as demais seguem normalmente.
+    conteudo: bytes do PDF já lidos pela leitura antecipada (o PDF não é relido do disco).
+    """
+    textos = {}
+    num_paginas = None
+    if cache is not None:
+        hash_pdf = hash_pdf or calcular_hash_arquivo(caminho_pdf)
+        num_paginas = cache.num_paginas(hash_pdf)
+        if num_paginas is not None:
+            fim = num_paginas if fim is None else min(fim, num_paginas)
+            textos = cache.obter_textos(hash_pdf, inicio, fim)
+    
+    with ExitStack() as pilha:
+        leitor = None
+        # Só abre o PDF se alguma página do intervalo não estiver no cache
+        if num_paginas is None or len(textos) < fim - inicio:
+            leitor = pilha.enter_context(abrir_extrator(caminho_pdf, limites, conteudo))
+            num_paginas = leitor.num_paginas
+        fim = num_paginas if fim is None else min(fim, num_paginas)
+        
+        if exibir:
+            print(f"📄 Arquivo: {os.path.basename(caminho_pdf)}")
+            print(f"   Total de páginas: {num_paginas}")
+            print(f"   Processando cada holerite...\n")
+        
+        textos_novos = {}
+        for numero_pagina in range(inicio, fim):
+            if exibir:
+                exibir_progresso(numero_pagina + 1, num_paginas)
+            
+            if numero_pagina in textos:
+                texto = textos[numero_pagina]
+            else:
+                if cache is not None:
+                    cache.falhas += 1
+                try:
+                    texto = leitor.extrair(numero_pagina)
+                except Exception as e:
+                    yield numero_pagina, None, e
+                    continue
+                textos_novos[numero_pagina] = texto
+            
+            yield numero_pagina, texto, None
+        
+        if cache is not None and textos_novos:
+            cache.salvar_textos(hash_pdf, num_paginas, textos_novos)
+
+def pagina_descartavel(texto):
+    """
+    Pré-classificação pelo texto: páginas em branco, de capa ou de encerramento não têm a linha
+    'CPF:' nem a tabela de eventos. Sem elas extrair_dados_ativos sempre produziria uma página
+    vazia (sem nome, CPF e eventos), então a análise completa é dispensada.
+    """
+    return 'CPF:' not in texto and 'Composição de Rendimentos Mensal' not in texto
+
+def extrair_paginas_pdf(caminho_pdf, exibir=True, inicio=0, fim=None, cache=None, hash_pdf=None, limites=None,
+                        conteudo=None):
+    """
+    Gera (numero_pagina, dados) para cada página do PDF, a partir do texto de extrair_textos_pdf.
+    Páginas descartadas pela pré-classificação são geradas com dados = None.
+    """
+    for numero_pagina, texto, erro in extrair_textos_pdf(caminho_pdf, exibir, inicio, fim, cache, hash_pdf, limites, conteudo):
+        if erro is not None:
+            yield numero_pagina, dados_com_erro(caminho_pdf, numero_pagina, erro)
+        elif pagina_descartavel(texto):
+            yield numero_pagina, None
+        else:
+            yield numero_pagina, extrair_dados_pagina(texto.split('\n'), caminho_pdf, numero_pagina)
+
+def pagina_vazia(dados):
+    """Página vazia: sem nome, sem CPF, sem eventos (ex.: última página do arquivo)"""
+    return (not dados['nome'] and 
+            not dados['cpf'] and 
+            len(dados['proventos']) == 0 and
+            len(dados['descontos_obrigatorios']) == 0 and
+            len(dados['descontos_extras']) == 0)
+
+def eh_continuacao(dados_pagina1, dados_pagina2):
+    """A página 2 é continuação da página 1 quando ambas têm o mesmo CPF (não vazio)"""
+    return (dados_pagina2['cpf'] == dados_pagina1['cpf'] and 
+            dados_pagina2['cpf'] != '' and
+            dados_pagina1['cpf'] != '')
+
+def mesclar_continuacao(dados_pagina1, dados_pagina2, nome_arquivo, numero_pagina1):
+    """Consolida os eventos e totais da página de continuação na página 1"""
+    dados_pagina1['proventos'].extend(dados_pagina2['proventos'])
+    dados_pagina1['descontos_obrigatorios'].extend(dados_pagina2['descontos_obrigatorios'])
+    dados_pagina1['descontos_extras'].extend(dados_pagina2['descontos_extras'])
+    if dados_pagina2.get('eventos_informativos'):
+        dados_pagina1['eventos_informativos'].extend(dados_pagina2['eventos_informativos'])
+    
+    # Atualizar totais (em centavos)
+    for chave in ('total_proventos_centavos', 'total_descontos_obrigatorios_centavos', 'total_descontos_extras_centavos',
+                  'total_descontos_centavos'):
+        dados_pagina1[chave] += dados_pagina2[chave]
+    dados_pagina1['liquido_centavos'] = dados_pagina1['total_proventos_centavos'] - dados_pagina1['total_descontos_centavos']
+    dados_pagina1['liquido_calculado'] = True
+    
+    # Atualizar origem do arquivo para indicar que usou 2 páginas
+    dados_pagina1['arquivo_origem'] = f"{nome_arquivo} (pág. {numero_pagina1+1}-{numero_pagina1+2})"
+    return dados_pagina1
+
+def consolidar_paginas(paginas, nome_arquivo, nao_mapeados=None):
+    """
+    Consolida a sequência (numero_pagina, dados) em holerites, unindo continuações.
+    
+    Páginas vazias são descartadas e uma página com o mesmo CPF da anterior
+    é mesclada a ela (no máximo 2 páginas por holerite).
+    dados = None indica página descartada pela pré-classificação (tratada como página vazia).
+    Os eventos de cada holerite consolidado que não constam da planilha são registrados em
+    nao_mapeados (EventosNaoMapeados): um holerite de 2 páginas conta uma única vez, como nos
+    holerites reaproveitados, reclassificados ou retomados do checkpoint.
+    """
+    for dados in _consolidar_paginas(paginas, nome_arquivo):
+        registrar_eventos_nao_mapeados(dados, nao_mapeados)
+        yield dados
+
+def _consolidar_paginas(paginas, nome_arquivo):
+    """Holerites consolidados de consolidar_paginas (sem o registro dos eventos não mapeados)"""
+    pendente = None  # (numero_pagina, dados) aguardando possível continuação
+    
+    for numero_pagina, dados in paginas:
+        if dados is None:
+            if pendente is not None:
+                yield pendente[1]
+                pendente = None
+            # Contada depois de entregar o holerite pendente: o checkpoint a associa ao holerite seguinte
+            PRE_CLASSIFICACAO['paginas_descartadas'] += 1
+            continue
+        
+        if pendente is not None:
+            numero_pendente, dados_pendente = pendente
+            pendente = None
+            if eh_continuacao(dados_pendente, dados):
+                yield mesclar_continuacao(dados_pendente, dados, nome_arquivo, numero_pendente)
+                continue
+            yield dados_pendente
+        
+        # Se página vazia, pular e não adicionar aos dados (falhas de extração vão para o log de erros)
+        if pagina_vazia(dados):
+            if dados['erro_processamento']:
+                PAGINAS_COM_ERRO.append(dados)
+            continue
+        
+        pendente = (numero_pagina, dados)
+    
+    if pendente is not None:
+        yield pendente[1]
+
+def extrair_holerites_pdf(caminho_pdf, exibir=True, cache=None, inicio=0, limites=None, conteudo=None, hash_pdf=None,
+                          nao_mapeados=None):
+    """Gera os holerites consolidados de um PDF (a partir da página inicio), lendo cada página uma única vez"""
+    nome_arquivo = os.path.basename(caminho_pdf)
+    paginas = extrair_paginas_pdf(caminho_pdf, exibir, inicio=inicio, cache=cache, hash_pdf=hash_pdf, limites=limites,
+                                  conteudo=conteudo)
+    return consolidar_paginas(paginas, nome_arquivo, nao_mapeados)
+
+def contar_paginas_pdf(caminho_pdf):
+    """Retorna o número de páginas do PDF"""
+    with open(caminho_pdf, 'rb') as arquivo:
+        return len(PyPDF2.PdfReader(arquivo).pages)
+
+def planejar_intervalos(caminhos_pdf, paginas_por_tarefa=PAGINAS_POR_TAREFA, cache=None, pagina_inicial=0, limites=None):
+    """
+    Divide cada PDF em intervalos de páginas (caminho, inicio, fim, hash_pdf, caminho_cache, limites)
+    para distribuir entre os processos. Um PDF grande da competência inteira vira várias tarefas.
+    Com cache, o hash de cada PDF é calculado uma única vez aqui e repassado às tarefas.
+    O primeiro PDF começa em pagina_inicial (retomada de checkpoint).
+    """
+    caminho_cache = cache.caminho_db if cache is not None else None
+    tarefas = []
+    for indice, caminho_pdf in enumerate(caminhos_pdf):
+        hash_pdf = None
+        primeira_pagina = pagina_inicial if indice == 0 else 0
+        try:
+            num_paginas = None
+            if cache is not None:
+                hash_pdf = calcular_hash_arquivo(caminho_pdf)
+                num_paginas = cache.num_paginas(hash_pdf)
+            if num_paginas is None:
+                num_paginas = contar_paginas_pdf(caminho_pdf)
+        except Exception:
+            # Arquivo ilegível: uma única tarefa, para que o erro seja reportado pelo processo
+            tarefas.append((caminho_pdf, primeira_pagina, None, None, caminho_cache, limites))
+            continue
+        
+        for inicio in range(primeira_pagina, num_paginas, paginas_por_tarefa):
+            tarefas.append((caminho_pdf, inicio, min(inicio + paginas_por_tarefa, num_paginas), hash_pdf, caminho_cache, limites))
+    
+    return tarefas
+
+def processar_intervalo_pdf(tarefa):
+    """
+    Unidade de trabalho do modo paralelo: abre o PDF uma vez e extrai as páginas do intervalo.
+    Retorna (paginas, erro, (acertos_cache, falhas_cache)), sendo paginas a lista de (numero_pagina, dados).
+    """
+    caminho_pdf, inicio, fim, hash_pdf, caminho_cache, limites = tarefa
+    
+    paginas = []
+    erro = None
+    cache = CachePaginas(caminho_cache) if caminho_cache else None
+    try:
+        for pagina in extrair_paginas_pdf(caminho_pdf, exibir=False, inicio=inicio, fim=fim, cache=cache, hash_pdf=hash_pdf,
+                                          limites=limites):
+            paginas.append(pagina)
+    except Exception as e:
+        erro = str(e)
+    finally:
+        if cache is not None:
+            cache.fechar()
+    
+    estatisticas_cache = (cache.acertos, cache.falhas) if cache is not None else (0, 0)
+    return paginas, erro, estatisticas_cache
+
+def coletar_intervalos(tarefas, resultados, cache=None):
+    """
+    Percorre os resultados das tarefas (na ordem das tarefas) e gera (caminho_pdf, numero_pagina, dados).
+    Soma as estatísticas de cache de cada tarefa.
+    """
+    for concluidas, (tarefa, (paginas, erro, (acertos, falhas))) in enumerate(zip(tarefas, resultados), 1):
+        caminho_pdf = tarefa[0]
+        if cache is not None:
+            cache.acertos += acertos
+            cache.falhas += falhas
+        if erro:
+            print(f"\n❌ Erro ao processar arquivo {os.path.basename(caminho_pdf)}: {erro}")
+        exibir_progresso(concluidas, len(tarefas))
+        
+        for numero_pagina, dados in paginas:
+            yield caminho_pdf, numero_pagina, dados
+
+def processar_arquivos_paralelo(caminhos_pdf, workers, paginas_por_tarefa=PAGINAS_POR_TAREFA, cache=None, pagina_inicial=0,
+                                limites=None, nao_mapeados=None):
+    """
+    Distribui os intervalos de páginas dos PDFs entre processos e gera os holerites consolidados,
+    sempre na ordem de caminhos_pdf (independente de qual processo termina antes).
+    Os eventos não mapeados dos holerites consolidados são registrados em nao_mapeados e os
+    acertos/falhas de cache de cada processo somados em cache.
+    """
+    tarefas = planejar_intervalos(caminhos_pdf, paginas_por_tarefa, cache, pagina_inicial, limites)
+    if not tarefas:
+        return
+    
+    workers = min(workers, len(tarefas))
+    print(f"⚙️  Processando {len(caminhos_pdf)} arquivo(s) em {len(tarefas)} intervalo(s) de páginas com {workers} processos...\n")
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        paginas = coletar_intervalos(tarefas, executor.map(processar_intervalo_pdf, tarefas), cache)
+        
+        for caminho_pdf, grupo in groupby(paginas, key=lambda item: item[0]):
+            # Junção determinística: a regra sequencial percorre as páginas de todos os intervalos
+            # em ordem, unindo também as continuações (mesmo CPF) que caem na fronteira entre intervalos
+            yield from consolidar_paginas(((numero_pagina, dados) for _, numero_pagina, dados in grupo),
+                                          os.path.basename(caminho_pdf), nao_mapeados)
+
+def ler_holerites(caminhos_pdf, workers=1, paginas_por_tarefa=PAGINAS_POR_TAREFA, cache=None, pagina_inicial=0, limites=None,
+                  antecipar=PDFS_ANTECIPADOS, nao_mapeados=None):
+    """
+    Estágio de leitura do pipeline: gera os holerites consolidados de todos os PDFs,
+    na ordem dos arquivos, um de cada vez (sequencial ou com --workers processos).
+    O primeiro PDF é lido a partir de pagina_inicial (retomada de checkpoint).
+    No modo sequencial, os próximos `antecipar` PDFs são lidos para a memória em uma thread
+    de E/S enquanto o atual é analisado.
+    """
+    if workers > 1:
+        yield from processar_arquivos_paralelo(caminhos_pdf, workers, paginas_por_tarefa, cache, pagina_inicial, limites,
+                                               nao_mapeados)
+        return
+    
+    with LeituraAntecipada(caminhos_pdf, antecipar) as leitura:
+        for indice, caminho_pdf in enumerate(caminhos_pdf):
+            try:
+                conteudo, hash_pdf = leitura.obter(indice)
+                yield from extrair_holerites_pdf(caminho_pdf, cache=cache, inicio=pagina_inicial if indice == 0 else 0,
+                                                 limites=limites, conteudo=conteudo, hash_pdf=hash_pdf,
+                                                 nao_mapeados=nao_mapeados)
+            except Exception as e:
+                print(f"\n❌ Erro ao processar arquivo {os.path.basename(caminho_pdf)}: {str(e)}")
+
+def registrar_eventos_nao_mapeados(dados, nao_mapeados):
+    """Registra em nao_mapeados (EventosNaoMapeados) os eventos do holerite que não constam da planilha"""
+    if nao_mapeados is None:
+        return
+    mapeamento = mapeamento_eventos()
+    indice = indice_classificacao()
+    eventos = [evento for chave in TIPOS_EVENTO for evento in dados.get(chave, ())
+               if (evento['codigo'], evento['descricao'].upper()) not in mapeamento
+               and indice.classificar(evento['codigo'], evento['descricao'].upper()) is None]
+    if eventos:
+        nao_mapeados.registrar(dados, eventos)
+
+def holerites_reaproveitados(caminho_resultado, nomes_inalterados, nao_mapeados=None, substituidos=frozenset()):
+    """
+    Processamento incremental: gera, na ordem anterior, os holerites do resultado.json
+    cujos PDFs não mudaram (segundo o manifesto), sem precisar relê-los.
+    Os holerites cujo id_registro (CPF + matrícula) está em substituidos são omitidos.
+    """
+    reaproveitados = omitidos = 0
+    for dados in ler_json_array(caminho_resultado):
+        if arquivo_do_registro(dados) in nomes_inalterados:
+            if id_registro(dados) in substituidos:
+                omitidos += 1
+                continue
+            holerite = Holerite.from_dict(dados)
+            registrar_eventos_nao_mapeados(holerite, nao_mapeados)
+            reaproveitados += 1
+            yield holerite
+    print(f"♻️  {reaproveitados} holerites reaproveitados do resultado anterior")
+    if omitidos:
+        print(f"🔄 {omitidos} holerite(s) substituído(s) pelos PDFs novos/alterados (mesmo CPF e matrícula)")
+
+def holerites_incrementais(caminho_resultado, nomes_inalterados, lidos, nao_mapeados=None, nao_mapeados_lidos=None):
+    """
+    Processamento incremental: os holerites reaproveitados seguidos dos lidos dos PDFs novos ou alterados
+    (lidos, inclusive os retomados do checkpoint). Um holerite lido substitui o reaproveitado de mesmo
+    CPF e matrícula (PDF de correção). Os lidos são percorridos antes, para que os identificadores
+    sejam conhecidos ao gerar os reaproveitados: só os identificadores ficam em memória, e os holerites
+    vão para um arquivo temporário (RegistrosProcessados), relido no final. Os eventos não mapeados dos
+    lidos (nao_mapeados_lidos) são unidos a nao_mapeados depois dos reaproveitados, na ordem do resultado.
+    """
+    with RegistrosProcessados() as lidos_em_disco:
+        substituidos = set()
+        for dados in lidos:
+            substituidos.add(id_registro(dados))
+            lidos_em_disco.adicionar(dados.to_registro())
+        yield from holerites_reaproveitados(caminho_resultado, nomes_inalterados, nao_mapeados, substituidos)
+        if nao_mapeados is not None and nao_mapeados_lidos is not None:
+            nao_mapeados.mesclar(nao_mapeados_lidos)
+        for registro in lidos_em_disco:
+            yield Holerite.from_registro(registro)
+
+def reclassificar_holerite(dados):
+    """
+    Redistribui os eventos já extraídos de um holerite conforme as tabelas de parâmetros atuais
+    e recalcula os totais (e o líquido, quando ele foi calculado e não lido da linha de totalização).
+    Com as mesmas tabelas, o holerite não muda.
+    """
+    eventos = [evento for lista in TIPOS_EVENTO for evento in dados.get(lista, ())]
+    if not eventos:
+        return dados  # registro de erro ou página sem eventos
+
+    mapeamento = mapeamento_eventos()
+    variacoes = indice_classificacao()
+    for lista in TIPOS_EVENTO:
+        dados[lista] = []
+    totais = {}  # somas em centavos, como na extração
+    for evento in eventos:
+        descricao_upper = evento['descricao'].upper()
+        tipo_evento = mapeamento.get((evento['codigo'], descricao_upper))
+        if tipo_evento is None:
+            tipo_evento = variacoes.classificar(evento['codigo'], descricao_upper)
+        lista, chave_total, desconto = DESTINO_EVENTOS.get(tipo_evento, DESTINO_FALLBACK)
+
+        dados[lista].append(evento)
+        valor_evento = evento['valor_centavos']
+        if chave_total:
+            totais[chave_total] = totais.get(chave_total, 0) + valor_evento
+        if desconto:
+            totais['total_descontos_centavos'] = totais.get('total_descontos_centavos', 0) + valor_evento
+
+    for chave_total in ('total_proventos_centavos', 'total_descontos_obrigatorios_centavos', 'total_descontos_extras_centavos',
+                        'total_descontos_centavos'):
+        dados[chave_total] = totais.get(chave_total, 0)
+    if dados.get('liquido_calculado'):
+        dados['liquido_centavos'] = totais.get('total_proventos_centavos', 0) - totais.get('total_descontos_centavos', 0)
+    return dados
+
+def holerites_reclassificados(caminho_resultado, nomes_inalterados=None, nao_mapeados=None):
+    """
+    Modo --reclassify: os holerites do resultado.json (dos PDFs em nomes_inalterados, ou todos),
+    na ordem anterior, reclassificados com as tabelas atuais. Nenhum PDF é lido.
+    """
+    reclassificados = 0
+    for dados in ler_json_array(caminho_resultado):
+        if nomes_inalterados is None or arquivo_do_registro(dados) in nomes_inalterados:
+            reclassificados += 1
+            holerite = reclassificar_holerite(Holerite.from_dict(dados))
+            registrar_eventos_nao_mapeados(holerite, nao_mapeados)
+            yield holerite
+    print(f"🔁 {reclassificados} holerites reclassificados a partir do resultado anterior")
+
+def ler_holerites_com_checkpoint(checkpoint, caminhos_pdf, retomar=False, workers=1,
+                                 paginas_por_tarefa=PAGINAS_POR_TAREFA, cache=None, limites=None,
+                                 antecipar=PDFS_ANTECIPADOS, nao_mapeados=None):
+    """
+    Estágio de leitura com checkpoint: cada holerite lido é gravado também em checkpoint.
+    Com retomar, os holerites do checkpoint são reaproveitados e a leitura continua a partir
+    do PDF e da página seguintes ao último holerite gravado; as páginas com erro e descartadas
+    antes desse ponto voltam para PAGINAS_COM_ERRO e PRE_CLASSIFICACAO.
+    """
+    indice_arquivo, pagina_inicial = 0, 0
+    if retomar and checkpoint.compativel():
+        indice_arquivo, pagina_inicial = checkpoint.cursor()
+        print(f"⏯️  Retomando: {checkpoint.quantidade} holerites do checkpoint; leitura continua em "
+              f"{checkpoint.nomes[indice_arquivo]} (pág. {pagina_inicial + 1})\n")
+        # Páginas com erro e descartadas antes do cursor não serão lidas de novo
+        paginas_com_erro, paginas_descartadas = checkpoint.paginas()
+        PAGINAS_COM_ERRO.extend(Holerite.from_registro(dados) for dados in paginas_com_erro)
+        PRE_CLASSIFICACAO['paginas_descartadas'] += paginas_descartadas
+        for dados in checkpoint.registros():
+            holerite = Holerite.from_registro(dados)
+            registrar_eventos_nao_mapeados(holerite, nao_mapeados)
+            yield holerite
+        checkpoint.abrir(retomar=True)
+    else:
+        if retomar:
+            print("⚠️  Nenhum checkpoint compatível com os PDFs e parâmetros atuais; processando do início.\n")
+        checkpoint.abrir()
+    
+    # Páginas com erro e descartadas já gravadas (cada holerite leva as registradas desde o anterior)
+    erros_gravados, descartadas_gravadas = len(PAGINAS_COM_ERRO), PRE_CLASSIFICACAO['paginas_descartadas']
+    try:
+        for dados in ler_holerites(caminhos_pdf[indice_arquivo:], workers, paginas_por_tarefa, cache, pagina_inicial, limites,
+                                   antecipar, nao_mapeados):
+            checkpoint.gravar(dados.to_registro(), [pagina.to_registro() for pagina in PAGINAS_COM_ERRO[erros_gravados:]],
+                              PRE_CLASSIFICACAO['paginas_descartadas'] - descartadas_gravadas)
+            erros_gravados, descartadas_gravadas = len(PAGINAS_COM_ERRO), PRE_CLASSIFICACAO['paginas_descartadas']
+            yield dados
+    finally:
+        checkpoint.fechar()
+
+def gerar_html_relatorio(dados_folhas, eventos=None, nao_mapeados=None, agregacao=None):
+    """
+    Gera o relatório HTML completo
+    eventos: TabelaEventos dos mesmos holerites, na mesma ordem (montada aqui se não for informada)
+    nao_mapeados: EventosNaoMapeados da competência (alerta com os de maior impacto financeiro)
+    agregacao: AgregacaoRelatorio dos mesmos holerites, acumulada durante a leitura (montada aqui se
+    não for informada); as seções do relatório só leem dela, sem percorrer os holerites
+    """
+    if eventos is None:
+        eventos = TabelaEventos.de_holerites(dados_folhas)
+    if agregacao is None:
+        agregacao = AgregacaoRelatorio.de_holerites(dados_folhas)
+    agregacao.finalizar(eventos)
+    total_holerites = len(agregacao)
+    
+    # Competência do primeiro registro que tiver essa informação
+    competencia_formatada = agregacao.competencia
     
     # Se não encontrou competência nos dados, usar a data atual como fallback
-    if competencia_formatada == "Competência não identificada":
+    if not competencia_formatada:
         data_processamento = datetime.now()
         mes_competencia = data_processamento.strftime('%B')
         ano_competencia = data_processamento.strftime('%Y')
@@ -382,63 +916,6 @@ def gerar_html_relatorio(dados_folhas):
         mes_competencia = meses_pt.get(mes_competencia, mes_competencia)
         competencia_formatada = f"{mes_competencia}/{ano_competencia}"
     
-    # Calcular totais gerais
-    total_geral_proventos = sum(f['total_proventos'] for f in dados_folhas)
-    total_geral_descontos = sum(f['total_descontos'] for f in dados_folhas)
-    total_geral_descontos_obrigatorios = sum(f.get('total_descontos_obrigatorios', 0) for f in dados_folhas)
-    total_geral_descontos_extras = sum(f.get('total_descontos_extras', 0) for f in dados_folhas)
-    total_geral_liquido = total_geral_proventos - total_geral_descontos
-    
-    # Coletar todos os tipos de proventos e descontos separados por situação
-    tipos_proventos = {}
-    tipos_descontos_obrigatorios = {}
-    tipos_descontos_facultativos = {}
-    
-    for folha in dados_folhas:
-        situacao = folha.get('situacao', '').upper()
-        eh_aposentado = 'APOSENTAD' in situacao
-        eh_pensionista = 'PENSIONISTA' in situacao
-        
-        for provento in folha['proventos']:
-            desc = provento['descricao']
-            if desc not in tipos_proventos:
-                tipos_proventos[desc] = {'aposentados': [], 'pensionistas': [], 'outros': []}
-            
-            if eh_aposentado:
-                tipos_proventos[desc]['aposentados'].append(provento['valor'])
-            elif eh_pensionista:
-                tipos_proventos[desc]['pensionistas'].append(provento['valor'])
-            else:
-                tipos_proventos[desc]['outros'].append(provento['valor'])
-        
-        for desconto in folha.get('descontos_obrigatorios', []):
-            desc = desconto['descricao']
-            valor = desconto['valor']
-            # Sem consolidação - registrar lançamento por lançamento
-            if desc not in tipos_descontos_obrigatorios:
-                tipos_descontos_obrigatorios[desc] = {'aposentados': [], 'pensionistas': [], 'outros': []}
-            
-            if eh_aposentado:
-                tipos_descontos_obrigatorios[desc]['aposentados'].append(valor)
-            elif eh_pensionista:
-                tipos_descontos_obrigatorios[desc]['pensionistas'].append(valor)
-            else:
-                tipos_descontos_obrigatorios[desc]['outros'].append(valor)
-        
-        for desconto in folha.get('descontos_extras', []):
-            desc = desconto['descricao']
-            valor = desconto['valor']
-            # Sem consolidação - registrar lançamento por lançamento
-            if desc not in tipos_descontos_facultativos:
-                tipos_descontos_facultativos[desc] = {'aposentados': [], 'pensionistas': [], 'outros': []}
-            
-            if eh_aposentado:
-                tipos_descontos_facultativos[desc]['aposentados'].append(valor)
-            elif eh_pensionista:
-                tipos_descontos_facultativos[desc]['pensionistas'].append(valor)
-            else:
-                tipos_descontos_facultativos[desc]['outros'].append(valor)
-    
     html = f"""<!DOCTYPE html>
 <html lang="pt-BR">
 <head>
@@ -910,7 +1387,7 @@ def gerar_html_relatorio(dados_folhas):
             <p>Competência: {competencia_formatada}</p>
         </header>
         
-        {'<div style="background: linear-gradient(135deg, #fff3cd 0%, #ffe5b4 100%); border: 3px solid #ff9800; border-radius: 12px; padding: 25px; margin: 20px 0; box-shadow: 0 4px 15px rgba(255, 152, 0, 0.3);"><h3 style="color: #e65100; margin: 0 0 15px 0; display: flex; align-items: center; gap: 10px;"><span style="font-size: 1.8em;">⚠️</span><span>EVENTOS NÃO CLASSIFICADOS DETECTADOS</span></h3><div style="background: white; padding: 20px; border-radius: 8px; margin-bottom: 15px;"><p style="color: #e65100; font-weight: 600; font-size: 1.1em; margin: 0 0 15px 0;">🔍 Foram encontrados <strong>' + str(len(EVENTOS_NAO_MAPEADOS)) + ' eventos novos</strong> que não estão na planilha Excel!</p><p style="color: #666; margin: 0 0 10px 0; line-height: 1.6;">Esses eventos foram classificados como <strong>"Provento"</strong> por padrão (fallback), mas isso pode estar incorreto. Verifique o arquivo <code>EVENTOS_NAO_CLASSIFICADOS.txt</code> para detalhes.</p><p style="color: #666; margin: 0; line-height: 1.6;"><strong>Exemplos:</strong></p><ul style="color: #666; margin: 10px 0 0 20px; line-height: 1.8;">' + ''.join([f'<li><strong>Código {cod}:</strong> {desc[:50]}{"..." if len(desc) > 50 else ""}</li>' for cod, _, desc in sorted(list(EVENTOS_NAO_MAPEADOS), key=lambda x: int(x[0]) if x[0].isdigit() else x[0])[:5]]) + '</ul></div><div style="background: rgba(230, 81, 0, 0.1); padding: 15px; border-radius: 8px; border-left: 4px solid #e65100;"><strong style="color: #e65100;">📋 AÇÃO NECESSÁRIA:</strong><ol style="color: #666; margin: 10px 0 0 20px; line-height: 1.8;"><li>Abra: <code>Descricao_Comp_Rend.xlsx</code></li><li>Classifique os eventos na sheet <strong>"Composição de Rendimentos"</strong></li><li>Se for "Desconto Facultativo", defina ordem (1-4) na sheet <strong>"Ordem de Eliminação"</strong></li><li>Salve e execute o script novamente</li></ol></div></div>' if EVENTOS_NAO_MAPEADOS else ''}
+        {'<div style="background: linear-gradient(135deg, #fff3cd 0%, #ffe5b4 100%); border: 3px solid #ff9800; border-radius: 12px; padding: 25px; margin: 20px 0; box-shadow: 0 4px 15px rgba(255, 152, 0, 0.3);"><h3 style="color: #e65100; margin: 0 0 15px 0; display: flex; align-items: center; gap: 10px;"><span style="font-size: 1.8em;">⚠️</span><span>EVENTOS NÃO CLASSIFICADOS DETECTADOS</span></h3><div style="background: white; padding: 20px; border-radius: 8px; margin-bottom: 15px;"><p style="color: #e65100; font-weight: 600; font-size: 1.1em; margin: 0 0 15px 0;">🔍 Foram encontrados <strong>' + str(len(nao_mapeados)) + ' eventos novos</strong> que não estão na planilha Excel!</p><p style="color: #666; margin: 0 0 10px 0; line-height: 1.6;">Esses eventos foram classificados como <strong>"Provento"</strong> por padrão (fallback), mas isso pode estar incorreto. Verifique o arquivo <code>EVENTOS_NAO_CLASSIFICADOS.txt</code> para detalhes.</p><p style="color: #666; margin: 0; line-height: 1.6;"><strong>Maior impacto financeiro:</strong></p><ul style="color: #666; margin: 10px 0 0 20px; line-height: 1.8;">' + ''.join([f'<li><strong>Código {evento.codigo}:</strong> {evento.descricao[:50]}{"..." if len(evento.descricao) > 50 else ""} (R$ {formatar_centavos_br(evento.valor_total)} em {evento.holerites} holerite(s))</li>' for evento in nao_mapeados.por_impacto()[:5]]) + '</ul></div><div style="background: rgba(230, 81, 0, 0.1); padding: 15px; border-radius: 8px; border-left: 4px solid #e65100;"><strong style="color: #e65100;">📋 AÇÃO NECESSÁRIA:</strong><ol style="color: #666; margin: 10px 0 0 20px; line-height: 1.8;"><li>Abra: <code>Descricao_Comp_Rend.xlsx</code></li><li>Classifique os eventos na sheet <strong>"Composição de Rendimentos"</strong></li><li>Se for "Desconto Facultativo", defina ordem (1-4) na sheet <strong>"Ordem de Eliminação"</strong></li><li>Salve e execute o script novamente</li></ol></div></div>' if nao_mapeados else ''}
         
         <nav id="navegacao" style="display: none;">
             <button onclick="mostrarSecao('indice')">🏠 Início</button>
@@ -954,54 +1431,14 @@ def gerar_html_relatorio(dados_folhas):
                     </p>
 """
     
-    # Análise cruzada: situação x faixa etária
-    situacoes_faixas = {}
-    faixas_def = {
-        '50-59 anos': {'min': 50, 'max': 59},
-        '60-69 anos': {'min': 60, 'max': 69},
-        '70-79 anos': {'min': 70, 'max': 79},
-        '80-89 anos': {'min': 80, 'max': 89},
-        '90+ anos': {'min': 90, 'max': 150}
-    }
-    
-    # Coletar dados para análise cruzada
-    for dados in dados_folhas:
-        sit = dados.get('situacao', 'Não informado')
-        
-        # Extrair idade
-        idade_raw = dados.get('idade', '0')
-        if isinstance(idade_raw, str):
-            idade = int(idade_raw.split()[0]) if idade_raw else 0
-        else:
-            idade = int(idade_raw)
-        
-        # Identificar faixa etária
-        faixa_identificada = 'Não identificado'
-        for faixa_nome, faixa_range in faixas_def.items():
-            if faixa_range['min'] <= idade <= faixa_range['max']:
-                faixa_identificada = faixa_nome
-                break
-        
-        # Inicializar estrutura se necessário
-        if sit not in situacoes_faixas:
-            situacoes_faixas[sit] = {
-                'total_qtd': 0,
-                'total_proventos': 0,
-                'faixas': {faixa: {'qtd': 0, 'total_proventos': 0} for faixa in faixas_def.keys()}
-            }
-        
-        # Acumular dados
-        situacoes_faixas[sit]['total_qtd'] += 1
-        situacoes_faixas[sit]['total_proventos'] += dados.get('total_proventos', 0)
-        if faixa_identificada in situacoes_faixas[sit]['faixas']:
-            situacoes_faixas[sit]['faixas'][faixa_identificada]['qtd'] += 1
-            situacoes_faixas[sit]['faixas'][faixa_identificada]['total_proventos'] += dados.get('total_proventos', 0)
+    # Análise cruzada: situação x faixa etária (acumulada em agregacao)
+    situacoes_faixas = agregacao.situacoes_faixas
     
     # Renderizar tabelas por situação
     for situacao in sorted(situacoes_faixas.keys()):
         stats = situacoes_faixas[situacao]
-        percentual_total = (stats['total_qtd'] / len(dados_folhas)) * 100
-        media_geral_bruta = stats['total_proventos'] / stats['total_qtd'] if stats['total_qtd'] > 0 else 0
+        percentual_total = (stats['total_qtd'] / total_holerites) * 100
+        media_geral_bruta = reais(stats['total_proventos']) / stats['total_qtd'] if stats['total_qtd'] > 0 else 0
         
         html += f"""
                     <div style="margin-bottom: 30px;">
@@ -1021,12 +1458,12 @@ def gerar_html_relatorio(dados_folhas):
 """
         
         # Renderizar faixas etárias para esta situação
-        for faixa_nome in faixas_def.keys():
+        for faixa_nome in FAIXAS_ETARIAS:
             faixa_data = stats['faixas'][faixa_nome]
             if faixa_data['qtd'] > 0:
                 perc_situacao = (faixa_data['qtd'] / stats['total_qtd'] * 100) if stats['total_qtd'] > 0 else 0
-                perc_geral = (faixa_data['qtd'] / len(dados_folhas) * 100)
-                media_bruta_faixa = faixa_data['total_proventos'] / faixa_data['qtd'] if faixa_data['qtd'] > 0 else 0
+                perc_geral = (faixa_data['qtd'] / total_holerites * 100)
+                media_bruta_faixa = reais(faixa_data['total_proventos']) / faixa_data['qtd'] if faixa_data['qtd'] > 0 else 0
                 
                 html += f"""                                <tr>
                                     <td>{faixa_nome}</td>
@@ -1059,7 +1496,7 @@ def gerar_html_relatorio(dados_folhas):
                         <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 15px;">
                             <div style="background: rgba(255,255,255,0.2); padding: 15px; border-radius: 6px; text-align: center;">
                                 <div style="font-size: 12px; opacity: 0.9; margin-bottom: 5px;">Total de Beneficiários</div>
-                                <div style="font-size: 28px; font-weight: bold;">{len(dados_folhas)}</div>
+                                <div style="font-size: 28px; font-weight: bold;">{total_holerites}</div>
                             </div>
                             <div style="background: rgba(255,255,255,0.2); padding: 15px; border-radius: 6px; text-align: center;">
                                 <div style="font-size: 12px; opacity: 0.9; margin-bottom: 5px;">Situações Funcionais</div>
@@ -1077,129 +1514,17 @@ def gerar_html_relatorio(dados_folhas):
                     </p>
 """
     
-    # Análise de saúde financeira - baseada na REMUNERAÇÃO LÍQUIDA
-    saudavel = 0  # Descontos facultativos < 20% da remuneração líquida
-    atencao = 0   # Descontos facultativos entre 20-30% da remuneração líquida
-    risco = 0     # Descontos facultativos entre 30-35% da remuneração líquida
-    critico = 0   # Descontos facultativos > 35% da remuneração líquida
-    sem_descontos = 0
-    
-    beneficiarios_criticos = []  # Lista para armazenar beneficiários em situação crítica (>35%)
-    beneficiarios_rescisao = []  # Lista para armazenar beneficiários em rescisão
-    servidores_cedidos = []  # Lista para armazenar servidores cedidos
-    casos_atipicos = []  # Lista para armazenar casos atípicos
-    
-    for dados in dados_folhas:
-        descontos_extras = dados.get('total_descontos_extras', 0)
-        liquido_final = dados.get('liquido', 0)
-        
-        # Calcular margem consignável (base de cálculo para empréstimos)
-        margem_consignavel = dados.get('total_proventos', 0) - dados.get('total_descontos_obrigatorios', 0)
-        
-        # Verificar se há evento de rescisão (busca flexível)
-        tem_rescisao = any(
-            '13' in evento.get('descricao', '').upper() and 'RESCIS' in evento.get('descricao', '').upper()
-            for evento in dados.get('proventos', []) + dados.get('eventos_informativos', [])
-        )
-        
-        # Verificar se é servidor cedido
-        # Regra: TEM "REPRESENTACAO CONF LC 04/90 - ART. 59" E NÃO TEM "SUBSIDIO" código 1
-        tem_representacao = any(
-            'REPRESENTACAO CONF LC 04/90' in evento.get('descricao', '').upper() or 'ART. 59' in evento.get('descricao', '').upper()
-            for evento in dados.get('proventos', []) + dados.get('eventos_informativos', [])
-        )
-        tem_subsidio_1 = any(
-            evento.get('codigo') == '1' and 'SUBSID' in evento.get('descricao', '').upper()
-            for evento in dados.get('proventos', [])
-        )
-        eh_cedido = tem_representacao and not tem_subsidio_1
-        
-        # Se é servidor cedido, adicionar à lista
-        if eh_cedido:
-            servidores_cedidos.append({
-                'nome': dados.get('nome', 'N/A'),
-                'cpf': dados.get('cpf', 'N/A'),
-                'situacao': dados.get('situacao', 'N/A')
-            })
-        
-        # DETECÇÃO DE CASOS ATÍPICOS (múltiplos critérios)
-        motivo_atipico = None
-        
-        # Critério 1: Margem negativa/zero E não é rescisão E não é cedido
-        if margem_consignavel <= 0 and not tem_rescisao and not eh_cedido:
-            motivo_atipico = 'Margem negativa ou zero'
-        
-        # Critério 2: Proventos zerados mas com descontos
-        elif dados.get('total_proventos', 0) == 0 and dados.get('total_descontos', 0) > 0 and not tem_rescisao and not eh_cedido:
-            motivo_atipico = 'Proventos zerados mas com descontos'
-        
-        # Critério 3: Diferença entre RLM e Líquido quando NÃO há descontos facultativos
-        elif descontos_extras == 0 and not tem_rescisao and not eh_cedido:
-            liquido_final = dados.get('liquido', 0)
-            diferenca = abs(margem_consignavel - liquido_final)
-            # Tolerância de R$ 0.10 para arredondamento
-            if diferenca > 0.10:
-                motivo_atipico = f'Diferença entre RLM e Líquido: R$ {diferenca:.2f}'
-        
-        # Adicionar aos casos atípicos se algum critério foi atendido
-        if motivo_atipico:
-            casos_atipicos.append({
-                'nome': dados.get('nome', 'N/A'),
-                'cpf': dados.get('cpf', 'N/A'),
-                'situacao': dados.get('situacao', 'N/A'),
-                'margem': margem_consignavel,
-                'motivo': motivo_atipico
-            })
-        
-        # Se tem rescisão, adicionar à lista de rescisões
-        if tem_rescisao:
-            beneficiarios_rescisao.append({
-                'nome': dados.get('nome', 'N/A'),
-                'cpf': dados.get('cpf', 'N/A'),
-                'tem_desconto_facultativo': 'Sim' if descontos_extras > 0 else 'Não'
-            })
-        
-        if descontos_extras == 0:
-            sem_descontos += 1
-        elif margem_consignavel > 0:
-            # Calcular o limite ideal (35% da margem consignável)
-            # Base legal: Resolução Administrativa nº 14/2025, Art. 5º
-            limite_ideal = margem_consignavel * 0.35
-            
-            # Percentual sobre o limite ideal de 35%
-            # Exemplo: Se limite = 580,69 e descontos = 2.884,42, então 2.884,42 / 580,69 = 497%
-            percentual = (descontos_extras / limite_ideal) * 100 if limite_ideal > 0 else 0
-            
-            # Classificar baseado no percentual sobre o limite ideal (35%)
-            # Thresholds alinhados com a capacidade de endividamento consignado:
-            # - < 57% do limite = < 20% da margem (SAUDÁVEL)
-            # - 57-86% do limite = 20-30% da margem (ATENÇÃO)
-            # - 86-100% do limite = 30-35% da margem (RISCO)
-            # - > 100% do limite = > 35% da margem (CRÍTICO - acima do limite legal)
-            
-            if percentual < 57:
-                saudavel += 1
-            elif percentual < 86:
-                atencao += 1
-            elif percentual <= 100:
-                risco += 1
-            else:
-                critico += 1
-            
-            # Adicionar à lista de beneficiários críticos quando ultrapassar 100% do limite (descontos > 35% da margem)
-            if percentual > 100:
-                beneficiarios_criticos.append({
-                    'nome': dados.get('nome', 'N/A'),
-                    'cpf': dados.get('cpf', 'N/A'),
-                    'situacao': dados.get('situacao', 'N/A'),
-                    'total_proventos': dados.get('total_proventos', 0),
-                    'total_descontos_obrigatorios': dados.get('total_descontos_obrigatorios', 0),
-                    'margem_consignavel': margem_consignavel,
-                    'liquido_final': liquido_final,
-                    'descontos_extras': descontos_extras,
-                    'percentual': percentual,
-                    'rescisao': 'Sim' if tem_rescisao else 'Não'
-                })
+    # Análise de saúde financeira (percentual dos descontos facultativos sobre o limite de 35% da RLM)
+    # e listas de alertas, na ordem de leitura dos holerites (agregacao.finalizar)
+    saudavel = agregacao.saude['saudavel']
+    atencao = agregacao.saude['atencao']
+    risco = agregacao.saude['risco']
+    critico = agregacao.saude['critico']
+    sem_descontos = agregacao.saude['sem_descontos']
+    beneficiarios_criticos = agregacao.beneficiarios_criticos
+    beneficiarios_rescisao = agregacao.beneficiarios_rescisao
+    servidores_cedidos = agregacao.servidores_cedidos
+    casos_atipicos = agregacao.casos_atipicos
     
     html += f"""
                     <div class="grid-stats">
@@ -1435,7 +1760,7 @@ def gerar_html_relatorio(dados_folhas):
         'Omitir do cálculo': []
     }
     
-    for (codigo, descricao), tipo in sorted(MAPEAMENTO_EVENTOS.items()):
+    for (codigo, descricao), tipo in sorted(mapeamento_eventos().items()):
         eventos_por_tipo[tipo].append((codigo, descricao))
     
     # Gerar HTML para cada tipo
@@ -1504,10 +1829,10 @@ def gerar_html_relatorio(dados_folhas):
     
     <script>
         // Dados dos beneficiários
-        const dadosBeneficiarios = """ + json.dumps(dados_folhas, ensure_ascii=False) + """;
+        const dadosBeneficiarios = """ + MARCADOR_DADOS_BENEFICIARIOS + """;
         
         // Ordem de eliminação da planilha Excel
-        const ordemEliminacao = """ + json.dumps(ORDEM_ELIMINACAO, ensure_ascii=False) + """;
+        const ordemEliminacao = """ + json.dumps(ordem_eliminacao(), ensure_ascii=False) + """;
         
         function mostrarSecao(secaoId) {
             // Esconder todas as seções
@@ -2277,6 +2602,70 @@ def gerar_html_relatorio(dados_folhas):
     
     return html
 
+def escrever_html_relatorio(caminho_html, html, registros):
+    """
+    Grava o HTML do relatório inserindo os dados dos beneficiários no lugar do marcador,
+    copiados registro a registro do armazenamento em disco (sem montar o JSON em memória)
+    """
+    antes, depois = html.split(MARCADOR_DADOS_BENEFICIARIOS)
+    with open(caminho_html, 'w', encoding='utf-8') as f:
+        f.write(antes)
+        registros.escrever_json_compacto(f)
+        f.write(depois)
+
+@contextmanager
+def trava_arquivo(caminho, abandono=120):
+    """
+    Exclusão mútua entre processos (inclusive execuções independentes) por arquivo de trava.
+    Uma trava mais antiga que `abandono` segundos é considerada de um processo interrompido.
+    """
+    while True:
+        try:
+            descritor = os.open(caminho, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(caminho) > abandono:
+                    os.remove(caminho)
+                    continue
+            except OSError:
+                continue
+            time.sleep(0.1)
+    try:
+        yield
+    finally:
+        os.close(descritor)
+        os.remove(caminho)
+
+def copiar_atomico(origem, destino):
+    """Copia origem para destino via arquivo temporário + os.replace (leitores nunca veem um arquivo parcial)"""
+    descritor, temporario = tempfile.mkstemp(prefix=destino.name + '.', suffix='.tmp', dir=destino.parent)
+    os.close(descritor)
+    try:
+        shutil.copyfile(origem, temporario)
+        os.replace(temporario, destino)
+    except BaseException:
+        os.remove(temporario)
+        raise
+
+def publicar_saidas_gerais(caminho_html, caminho_json):
+    """
+    Atualiza as saídas compartilhadas entre competências (output/index.html e o backup geral)
+    a partir das saídas de uma competência. As duas cópias são feitas sob a mesma trava,
+    então execuções concorrentes nunca deixam HTML e backup de competências diferentes.
+    """
+    caminho_base = Path(__file__).parent.parent
+    caminho_output = caminho_base / "output" / "index.html"
+    caminho_backup = caminho_base / "data" / "backup" / "dados_folhas_backup.json"
+    
+    with trava_arquivo(caminho_output.parent / ".publicacao.lock"):
+        copiar_atomico(caminho_html, caminho_output)
+        copiar_atomico(caminho_json, caminho_backup)
+    
+    logger.info(f"\n✅ Relatório geral atualizado!")
+    logger.info(f"📁 Output: {caminho_output}")
+    logger.info(f"💾 Backup geral: {caminho_backup}")
+
 def exibir_progresso(atual, total, largura=50):
     """Exibe uma barra de progresso no console"""
     percentual = (atual / total) * 100
@@ -2285,31 +2674,16 @@ def exibir_progresso(atual, total, largura=50):
     print(f'\r[{barra}] {atual}/{total} ({percentual:.1f}%)', end='', flush=True)
 
 def gerar_relatorio_estatisticas(dados_todas_folhas):
-    """Gera estatísticas do processamento"""
-    total = len(dados_todas_folhas)
-    com_sucesso = len([d for d in dados_todas_folhas if d['nome'] and not d['erro_processamento']])
-    com_erro = len([d for d in dados_todas_folhas if d['erro_processamento']])
-    sem_dados = len([d for d in dados_todas_folhas if not d['nome'] and not d['erro_processamento']])
-    
-    total_proventos = sum(d['total_proventos'] for d in dados_todas_folhas)
-    total_descontos_obrig = sum(d['total_descontos_obrigatorios'] for d in dados_todas_folhas)
-    total_descontos_extras = sum(d['total_descontos_extras'] for d in dados_todas_folhas)
-    total_liquido = sum(d['liquido'] for d in dados_todas_folhas)
-    
-    return {
-        'total': total,
-        'com_sucesso': com_sucesso,
-        'com_erro': com_erro,
-        'sem_dados': sem_dados,
-        'total_proventos': total_proventos,
-        'total_descontos_obrigatorios': total_descontos_obrig,
-        'total_descontos_extras': total_descontos_extras,
-        'total_liquido': total_liquido
-    }
+    """Gera estatísticas do processamento (uma única passagem pelos holerites)"""
+    return AgregacaoRelatorio.de_holerites(dados_todas_folhas).estatisticas
+
+def tem_problema_extracao(d):
+    """Holerite com erro de processamento ou sem dados básicos (nome, CPF)"""
+    return d['erro_processamento'] or (not d['nome'] and d['arquivo_origem'])
 
 def salvar_log_erros(dados_todas_folhas, caminho_pasta):
     """Salva um arquivo de log com os erros encontrados"""
-    erros = [d for d in dados_todas_folhas if d['erro_processamento'] or (not d['nome'] and d['arquivo_origem'])]
+    erros = [d for d in dados_todas_folhas if tem_problema_extracao(d)]
     
     if erros:
         # Salvar log na pasta Folha (pasta raiz)
@@ -2334,367 +2708,573 @@ def salvar_log_erros(dados_todas_folhas, caminho_pasta):
 
 # ========== PROCESSAMENTO PRINCIPAL ==========
 
-# Configurar encoding para UTF-8 no Windows
-import sys
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+def processar_competencia_isolada(competencia, args):
+    """
+    Unidade de trabalho do modo lote: processa uma competência em um processo próprio,
+    com o log e a saída do console gravados em logs/relatorio_AAAA-MM_<data>.log.
+    Retorna (competencia, quantidade_holerites, erro, caminho_log).
+    """
+    log_dir = Path(__file__).parent.parent / "logs"
+    log_dir.mkdir(exist_ok=True)
+    caminho_log = log_dir / f"relatorio_{competencia['pasta']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+    
+    with open(caminho_log, 'w', encoding='utf-8') as arquivo_log:
+        raiz = logging.getLogger()
+        for handler in raiz.handlers[:]:
+            raiz.removeHandler(handler)
+        handler = logging.StreamHandler(arquivo_log)
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        raiz.addHandler(handler)
+        raiz.setLevel(logging.INFO)
+        
+        with redirect_stdout(arquivo_log):
+            try:
+                quantidade = processar_competencia(competencia, args, publicar=False)
+                erro = None
+            except Exception as e:
+                logger.exception(f"❌ Erro ao processar a competência {competencia['pasta']}")
+                quantidade, erro = 0, str(e)
+        raiz.removeHandler(handler)
+    
+    return competencia, quantidade, erro, caminho_log
 
-logger.info("="*80)
-logger.info("🚀 SISTEMA DE ANÁLISE DE FOLHAS DE PAGAMENTO")
-logger.info("="*80)
+def processar_lote(competencias, args):
+    """
+    Processa várias competências (até --workers ao mesmo tempo); cada uma grava apenas as próprias saídas.
+    As saídas gerais são atualizadas uma única vez no final, com a competência mais recente disponível,
+    se ela estiver entre as processadas com sucesso. Retorna a competência publicada (ou None).
+    """
+    workers = min(max(args.workers, 1), len(competencias))
+    concluidas = []
+    
+    if workers > 1:
+        # Dentro de cada competência a leitura é sequencial: o paralelismo é entre competências
+        args_competencia = argparse.Namespace(**{**vars(args), 'workers': 1})
+        print(f"⚙️  Processando {len(competencias)} competência(s) com {workers} processos...\n")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for competencia, quantidade, erro, caminho_log in executor.map(
+                    processar_competencia_isolada, competencias, [args_competencia] * len(competencias)):
+                if erro:
+                    logger.error(f"❌ {competencia['pasta']}: {erro} (log: {caminho_log})")
+                else:
+                    logger.info(f"✅ {competencia['pasta']}: {quantidade} holerites (log: {caminho_log})")
+                    concluidas.append(competencia)
+    else:
+        for competencia in competencias:
+            try:
+                processar_competencia(competencia, args, publicar=False)
+                concluidas.append(competencia)
+            except Exception as e:
+                logger.error(f"❌ Erro ao processar a competência {competencia['pasta']}: {e}")
+    
+    logger.info(f"\n📊 Lote concluído: {len(concluidas)}/{len(competencias)} competência(s) processada(s)")
+    
+    disponiveis = detectar_competencias_disponiveis()
+    mais_recente = disponiveis[0]['pasta'] if disponiveis else None
+    for competencia in concluidas:
+        if competencia['pasta'] == mais_recente:
+            pasta_competencia = Path(__file__).parent.parent / "data" / "competencias" / competencia['pasta']
+            publicar_saidas_gerais(pasta_competencia / "relatorio.html", pasta_competencia / "resultado.json")
+            return competencia
+    
+    logger.info(f"ℹ️  Saídas gerais (output/index.html) mantidas: a competência mais recente ({mais_recente}) não foi reprocessada")
+    return None
 
-# Selecionar competência
-competencia = selecionar_competencia()
-if not competencia:
-    exit(1)
+def situacao_pasta(caminhos_pdf):
+    """Nome, tamanho e mtime dos PDFs: muda enquanto arquivos estão sendo copiados para a pasta"""
+    situacao = []
+    for caminho_pdf in caminhos_pdf:
+        try:
+            info = os.stat(caminho_pdf)
+        except OSError:
+            continue  # removido entre a listagem e o stat
+        situacao.append((caminho_pdf.name, info.st_size, info.st_mtime_ns))
+    return tuple(sorted(situacao))
 
-# Configurações
-caminho_base = Path(__file__).parent.parent
-caminho_pasta = competencia['caminho']
-competencia_nome = competencia['pasta']
+def competencia_desatualizada(competencia, hash_tabelas):
+    """A competência tem PDFs novos/alterados/removidos em relação ao manifesto (ou nunca foi processada)"""
+    pasta_competencia = Path(__file__).parent.parent / "data" / "competencias" / competencia['pasta']
+    if not (pasta_competencia / "resultado.json").exists():
+        return True
+    manifesto = Manifesto(pasta_competencia / "manifesto.json", hash_tabelas)
+    return manifesto.desatualizado(listar_pdfs(competencia['caminho']))
 
-# Caminhos de saída para a competência
-pasta_competencia = caminho_base / "data" / "competencias" / competencia_nome
-caminho_output_comp = pasta_competencia / "relatorio.html"
-caminho_backup_comp = pasta_competencia / "resultado.json"
+def monitorar_competencias(args):
+    """
+    Modo --watch: verifica as pastas holerites/ a cada args.intervalo segundos e processa
+    (de forma incremental, pelo manifesto) as competências com PDFs novos ou alterados.
+    Uma competência só é processada depois que seus PDFs ficam inalterados por uma verificação
+    inteira (lote de arquivos assentado). A planilha de parâmetros fica em memória e só é relida
+    quando é alterada.
+    """
+    logger.info(f"\n👀 Monitorando data/competencias/*/holerites/ a cada {args.intervalo}s (Ctrl+C para encerrar)")
+    
+    situacoes = {}    # pasta → situação vista na última verificação
+    verificadas = {}  # pasta → situação já conferida/processada
+    mtime_parametros = CAMINHO_PARAMETROS.stat().st_mtime_ns if CAMINHO_PARAMETROS.exists() else None
+    
+    try:
+        while True:
+            atual = CAMINHO_PARAMETROS.stat().st_mtime_ns if CAMINHO_PARAMETROS.exists() else None
+            if atual != mtime_parametros:
+                logger.info("📋 Planilha de parâmetros alterada: recarregando classificações")
+                recarregar_parametros()
+                mtime_parametros = atual
+                verificadas.clear()  # o manifesto de cada competência deixa de valer
+            hash_tabelas = hash_parametros()
+            
+            competencias = detectar_competencias_disponiveis()
+            mais_recente = competencias[0]['pasta'] if competencias else None
+            for competencia in competencias:
+                pasta = competencia['pasta']
+                situacao = situacao_pasta(listar_pdfs(competencia['caminho']))
+                if situacoes.get(pasta) != situacao:
+                    situacoes[pasta] = situacao  # arquivos chegando: aguardar a próxima verificação
+                    continue
+                if verificadas.get(pasta) == situacao:
+                    continue
+                
+                if competencia_desatualizada(competencia, hash_tabelas):
+                    logger.info(f"\n📥 {pasta}: PDFs novos ou alterados, processando...")
+                    try:
+                        quantidade = processar_competencia(competencia, args, publicar=(pasta == mais_recente))
+                        logger.info(f"✅ {pasta}: {quantidade} holerites")
+                    except Exception as e:
+                        logger.error(f"❌ Erro ao processar a competência {pasta}: {e}")
+                verificadas[pasta] = situacao
+            
+            time.sleep(args.intervalo)
+    except KeyboardInterrupt:
+        logger.info("\n⏹️  Monitoramento encerrado.")
 
-# Caminhos gerais (raiz)
-caminho_output = caminho_base / "output" / "index.html"
-caminho_index_raiz = caminho_base / "index.html"
-caminho_backup = caminho_base / "data" / "backup" / "dados_folhas_backup.json"
+def processar_competencia(competencia, args, publicar=True):
+    """
+    Processa os holerites de uma competência e grava resultado.json e relatorio.html na pasta dela.
+    Com publicar, atualiza também as saídas gerais (output/index.html e o backup geral).
+    Retorna a quantidade de holerites processados.
+    """
+    # Configurações
+    caminho_base = Path(__file__).parent.parent
+    caminho_pasta = competencia['caminho']
+    competencia_nome = competencia['pasta']
 
-# Buscar todos os PDFs
-arquivos_pdf = [f.name for f in caminho_pasta.glob('*.pdf') if 'Logo' not in f.name]
+    # Caminhos de saída para a competência
+    pasta_competencia = caminho_base / "data" / "competencias" / competencia_nome
+    caminho_output_comp = pasta_competencia / "relatorio.html"
+    caminho_backup_comp = pasta_competencia / "resultado.json"
+    caminho_manifesto = pasta_competencia / "manifesto.json"
+    caminho_checkpoint = pasta_competencia / "checkpoint.jsonl"
 
-logger.info(f"\n📂 Pasta: {caminho_pasta}")
-logger.info(f"📄 Arquivos PDF encontrados: {len(arquivos_pdf)}")
+    # Caminho geral (raiz)
+    caminho_index_raiz = caminho_base / "index.html"
 
-logger.info("\n" + "="*80)
-logger.info("📊 PROCESSANDO FOLHAS DE PAGAMENTO...")
-logger.info("="*80 + "\n")
+    # Buscar todos os PDFs
+    arquivos_pdf = [caminho_pdf.name for caminho_pdf in listar_pdfs(caminho_pasta)]
 
-dados_todas_folhas = []
-inicio = datetime.now()
+    logger.info(f"\n📂 Pasta: {caminho_pasta}")
+    logger.info(f"📄 Arquivos PDF encontrados: {len(arquivos_pdf)}")
 
-# Processar cada PDF
-for arquivo in arquivos_pdf:
-    caminho_completo = caminho_pasta / arquivo
-    
-    # Verificar quantas páginas o PDF tem
-    try:
-        with open(caminho_completo, 'rb') as f:
-            leitor = PyPDF2.PdfReader(f)
-            num_paginas = len(leitor.pages)
-        
-        print(f"📄 Arquivo: {arquivo}")
-        print(f"   Total de páginas: {num_paginas}")
-        print(f"   Processando cada holerite...\n")
-        
-        # Processar cada página individualmente e consolidar continuações
-        pagina_atual = 0
-        while pagina_atual < num_paginas:
-            # Atualizar barra de progresso
-            exibir_progresso(pagina_atual + 1, num_paginas)
-            
-            # Processar página atual
-            dados_pagina1 = extrair_dados_pdf(caminho_completo, numero_pagina=pagina_atual)
-            
-            # Verificar se a página está vazia (última página ou página sem dados)
-            # Página vazia: sem nome, sem CPF, sem eventos
-            pagina_vazia = (not dados_pagina1['nome'] and 
-                           not dados_pagina1['cpf'] and 
-                           len(dados_pagina1['proventos']) == 0 and
-                           len(dados_pagina1['descontos_obrigatorios']) == 0 and
-                           len(dados_pagina1['descontos_extras']) == 0)
-            
-            # Se página vazia, pular e não adicionar aos dados
-            if pagina_vazia:
-                pagina_atual += 1
-                continue
-            
-            # Verificar se próxima página é continuação do mesmo beneficiário
-            if pagina_atual + 1 < num_paginas:
-                dados_pagina2 = extrair_dados_pdf(caminho_completo, numero_pagina=pagina_atual + 1)
-                
-                # Se a próxima página tem o mesmo CPF, é continuação
-                if (dados_pagina2['cpf'] == dados_pagina1['cpf'] and 
-                    dados_pagina2['cpf'] != '' and
-                    dados_pagina1['cpf'] != ''):
-                    
-                    # Consolidar eventos da página 2 na página 1
-                    dados_pagina1['proventos'].extend(dados_pagina2['proventos'])
-                    dados_pagina1['descontos_obrigatorios'].extend(dados_pagina2['descontos_obrigatorios'])
-                    dados_pagina1['descontos_extras'].extend(dados_pagina2['descontos_extras'])
-                    
-                    # Atualizar totais
-                    dados_pagina1['total_proventos'] += dados_pagina2['total_proventos']
-                    dados_pagina1['total_descontos_obrigatorios'] += dados_pagina2['total_descontos_obrigatorios']
-                    dados_pagina1['total_descontos_extras'] += dados_pagina2['total_descontos_extras']
-                    dados_pagina1['total_descontos'] += dados_pagina2['total_descontos']
-                    dados_pagina1['liquido'] = dados_pagina1['total_proventos'] - dados_pagina1['total_descontos']
-                    
-                    # Atualizar origem do arquivo para indicar que usou 2 páginas
-                    dados_pagina1['arquivo_origem'] = f"{arquivo} (pág. {pagina_atual+1}-{pagina_atual+2})"
-                    
-                    # Pular a próxima página (já foi consolidada)
-                    pagina_atual += 2
-                    exibir_progresso(pagina_atual, num_paginas)  # Atualizar progresso da página pulada
-                else:
-                    # Não é continuação, processar normalmente
-                    pagina_atual += 1
-            else:
-                # Última página, não tem continuação
-                pagina_atual += 1
-            
-            # Adicionar dados consolidados
-            dados_todas_folhas.append(dados_pagina1)
-    
-    except Exception as e:
-        print(f"\n❌ Erro ao processar arquivo {arquivo}: {str(e)}")
-        continue
+    logger.info("\n" + "="*80)
+    logger.info("📊 PROCESSANDO FOLHAS DE PAGAMENTO...")
+    logger.info("="*80 + "\n")
 
-logger.info("\n\n" + "="*80)
-logger.info("📈 ESTATÍSTICAS DO PROCESSAMENTO")
-logger.info("="*80)
+    PRE_CLASSIFICACAO['paginas_descartadas'] = 0
+    PAGINAS_COM_ERRO.clear()
 
-# Gerar estatísticas
-stats = gerar_relatorio_estatisticas(dados_todas_folhas)
+    # Pipeline em fluxo: PDFs → páginas → holerites → estatísticas e armazenamento em disco.
+    # Os holerites não ficam todos em memória: são gravados em disco e relidos na geração das saídas
+    dados_todas_folhas = RegistrosProcessados(formatar=resultado_do_registro)
+    # Estatísticas, totais, análise cruzada e alertas do relatório, acumulados holerite a holerite
+    agregacao = AgregacaoRelatorio()
+    # Tabela fato dos eventos, montada junto com a leitura (mesma ordem de dados_todas_folhas)
+    eventos = TabelaEventos()
+    # Eventos fora da planilha, com ocorrências, valor e holerites de exemplo (unidos entre os processos)
+    nao_mapeados = EventosNaoMapeados()
+    erros = []
+    inicio = datetime.now()
 
-logger.info(f"\n✅ Processados com sucesso: {stats['com_sucesso']}/{stats['total']}")
-logger.info(f"⚠️  Sem dados extraídos: {stats['sem_dados']}/{stats['total']}")
-logger.info(f"❌ Com erros: {stats['com_erro']}/{stats['total']}")
+    # Tabelas de parâmetros em uso (o hash fica registrado no manifesto junto com os resultados)
+    hash_tabelas = hash_parametros()
+    caminhos_pdf = [caminho_pasta / arquivo for arquivo in arquivos_pdf]
+    cache = checkpoint = None
 
-logger.info(f"\n💰 Total de Proventos: R$ {formatar_moeda_br(stats['total_proventos'])}")
-logger.info(f"⚠️  Total Descontos Compulsórios (Obrigatórios): R$ {formatar_moeda_br(stats['total_descontos_obrigatorios'])}")
-logger.info(f"💳 Total Descontos Facultativos: R$ {formatar_moeda_br(stats['total_descontos_extras'])}")
-logger.info(f"💵 Total Líquido: R$ {formatar_moeda_br(stats['total_liquido'])}")
+    if args.reclassify:
+        # Reclassificação: os eventos já extraídos (resultado.json) com as tabelas atuais, sem PyPDF2
+        if not caminho_backup_comp.exists():
+            logger.error(f"❌ {caminho_backup_comp} não existe: processe a competência antes de reclassificar")
+            return 0
+        manifesto = Manifesto(caminho_manifesto, hash_tabelas, exigir_parametros=False)
+        inalterados, alterados, removidos = manifesto.comparar(caminhos_pdf)
+        if manifesto.valido and (alterados or removidos):
+            print(f"⚠️  {len(alterados)} PDF(s) novo(s)/alterado(s) e {len(removidos)} removido(s) desde o último "
+                  f"processamento não são relidos na reclassificação: execute sem --reclassify para lê-los\n")
+        # Todos os holerites do resultado.json são reclassificados; os PDFs alterados continuam desatualizados
+        # no manifesto e são lidos na próxima execução normal
+        holerites = holerites_reclassificados(caminho_backup_comp, nao_mapeados=nao_mapeados)
+        manifesto.marcar_desatualizados(alterados)
+    else:
+        # Cache do texto das páginas (reprocessamentos de PDFs inalterados não passam pelo PyPDF2)
+        cache = None if args.sem_cache else CachePaginas()
 
-tempo_decorrido = (datetime.now() - inicio).total_seconds()
-logger.info(f"\n⏱️  Tempo de processamento: {tempo_decorrido:.2f} segundos")
-if len(dados_todas_folhas) > 0:
-    print(f"⚡ Velocidade: {len(dados_todas_folhas)/tempo_decorrido:.1f} holerites/segundo")
+        # Manifesto da competência: só os PDFs novos ou alterados desde a última execução são lidos
+        manifesto = Manifesto(caminho_manifesto, hash_tabelas)
+        if args.completo or not caminho_backup_comp.exists():
+            manifesto.descartar_anterior()
 
-# Salvar log de erros se houver
-salvar_log_erros(dados_todas_folhas, caminho_pasta)
+        inalterados, alterados, removidos = manifesto.comparar(caminhos_pdf)
 
-# Gerar relatório de eventos não mapeados
-if EVENTOS_NAO_MAPEADOS:
-    print("\n" + "="*80)
-    print("⚠️  ATENÇÃO: EVENTOS NÃO CLASSIFICADOS DETECTADOS!")
-    print("="*80)
-    print(f"\n🔍 Foram encontrados {len(EVENTOS_NAO_MAPEADOS)} eventos novos que não estão na planilha Excel.")
-    print("📋 Esses eventos foram classificados como 'Provento' por padrão (fallback).")
-    print("📝 Você precisa classificá-los manualmente na planilha 'Descricao_Comp_Rend.xlsx'!\n")
-    
-    # Gerar arquivo de eventos não mapeados
-    pasta_raiz = os.path.dirname(caminho_pasta)
-    caminho_nao_mapeados = os.path.join(pasta_raiz, "EVENTOS_NAO_CLASSIFICADOS.txt")
-    
-    with open(caminho_nao_mapeados, 'w', encoding='utf-8') as f:
-        f.write("="*80 + "\n")
-        f.write("⚠️  EVENTOS NÃO CLASSIFICADOS - AÇÃO NECESSÁRIA\n")
-        f.write("="*80 + "\n")
-        f.write(f"Data/Hora: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
-        f.write(f"Total de eventos não classificados: {len(EVENTOS_NAO_MAPEADOS)}\n")
-        f.write("="*80 + "\n\n")
-        
-        f.write("📋 INSTRUÇÕES:\n")
-        f.write("-" * 80 + "\n")
-        f.write("1. Abra a planilha: Descricao_Comp_Rend.xlsx\n")
-        f.write("2. Acesse a sheet: 'Composição de Rendimentos'\n")
-        f.write("3. Adicione cada evento abaixo com sua classificação:\n")
-        f.write("   - Provento\n")
-        f.write("   - Desconto Compulsório (obrigatório)\n")
-        f.write("   - Desconto Facultativo (extra)\n")
-        f.write("   - Omitir do cálculo\n")
-        f.write("4. Se for 'Desconto Facultativo', adicione também na sheet 'Ordem de Eliminação'\n")
-        f.write("   com a prioridade correta (1, 2, 3 ou 4)\n")
-        f.write("5. Salve a planilha e execute o script novamente\n")
-        f.write("="*80 + "\n\n")
-        
-        f.write("📊 EVENTOS NÃO CLASSIFICADOS:\n")
-        f.write("="*80 + "\n\n")
-        
-        # Ordenar por código
-        eventos_ordenados = sorted(EVENTOS_NAO_MAPEADOS, key=lambda x: int(x[0]) if x[0].isdigit() else x[0])
-        
-        for codigo, descricao_upper, descricao_original in eventos_ordenados:
-            f.write(f"Código: {codigo}\n")
-            f.write(f"Descrição: {descricao_original}\n")
-            f.write(f"Descrição Normalizada: {descricao_upper}\n")
-            f.write("-" * 80 + "\n\n")
-        
-        f.write("="*80 + "\n")
-        f.write("💡 DICA: Copie as informações acima e cole na planilha Excel\n")
-        f.write("="*80 + "\n")
-    
-    print(f"📄 Lista completa salva em: {caminho_nao_mapeados}")
-    print("\n" + "="*80)
-    print("🚨 EVENTOS NÃO CLASSIFICADOS:")
-    print("="*80 + "\n")
-    
-    eventos_ordenados = sorted(EVENTOS_NAO_MAPEADOS, key=lambda x: int(x[0]) if x[0].isdigit() else x[0])
-    for i, (codigo, descricao_upper, descricao_original) in enumerate(eventos_ordenados, 1):
-        print(f"{i}. Código {codigo} - {descricao_original}")
-    
-    print("\n" + "="*80)
-    print("⚠️  AÇÃO NECESSÁRIA:")
-    print("="*80)
-    print("1. Abra: Descricao_Comp_Rend.xlsx")
-    print("2. Classifique cada evento acima")
-    print("3. Se for 'Desconto Facultativo', defina a ordem de eliminação (1-4)")
-    print("4. Salve e execute o script novamente")
-    print("="*80 + "\n")
+        # Checkpoint dos PDFs lidos nesta execução (--resume continua uma execução interrompida)
+        checkpoint = Checkpoint(caminho_checkpoint, alterados, hash_tabelas)
+        # Limites por página (opcionais): a extração roda em processo isolado e páginas problemáticas não travam a execução
+        limites = limites_efetivos(LimitesPagina(args.limite_pagina, args.limite_memoria))
+        if manifesto.valido:
+            print(f"♻️  Incremental: {len(inalterados)} PDF(s) inalterado(s), {len(alterados)} novo(s)/alterado(s), "
+                  f"{len(removidos)} removido(s)\n")
+            # Holerites dos PDFs novos/alterados substituem os reaproveitados de mesmo CPF e matrícula
+            nao_mapeados_lidos = EventosNaoMapeados()
+            lidos = ler_holerites_com_checkpoint(checkpoint, alterados, args.resume, args.workers, args.paginas_por_tarefa,
+                                                 cache, limites, args.antecipar, nao_mapeados_lidos)
+            holerites = holerites_incrementais(caminho_backup_comp, {caminho_pdf.name for caminho_pdf in inalterados},
+                                               lidos, nao_mapeados, nao_mapeados_lidos)
+        else:
+            # Sem manifesto válido, todos os PDFs estão em alterados
+            holerites = ler_holerites_com_checkpoint(checkpoint, alterados, args.resume, args.workers,
+                                                     args.paginas_por_tarefa, cache, limites, args.antecipar, nao_mapeados)
+
+    # Idade e tempo de serviço na data da competência, margem e status, calculados em lote
+    data_referencia = data_referencia_competencia(competencia_nome)
+    for lote in em_lotes(holerites, TAMANHO_LOTE_DATAS):
+        enriquecer_datas(lote, data_referencia)
+        enriquecer_margens(lote)
+        for dados in lote:
+            dados_todas_folhas.adicionar(dados.to_registro())
+            eventos.adicionar(dados)
+            manifesto.registrar(dados)
+            agregacao.adicionar(dados)
+            if tem_problema_extracao(dados):
+                erros.append(dados)
+
+    stats = agregacao.estatisticas
+    logger.info("\n\n" + "="*80)
+    logger.info("📈 ESTATÍSTICAS DO PROCESSAMENTO")
+    logger.info("="*80)
+
+    logger.info(f"\n✅ Processados com sucesso: {stats['com_sucesso']}/{stats['total']}")
+    logger.info(f"⚠️  Sem dados extraídos: {stats['sem_dados']}/{stats['total']}")
+    logger.info(f"❌ Com erros: {stats['com_erro']}/{stats['total']}")
+    if PAGINAS_COM_ERRO:
+        logger.info(f"⛔ Páginas não extraídas (erro ou limite excedido): {len(PAGINAS_COM_ERRO)}")
 
-# Gerar HTML
-logger.info("\n" + "="*80)
-logger.info("📝 GERANDO RELATÓRIO HTML...")
-logger.info("="*80 + "\n")
+    logger.info(f"\n💰 Total de Proventos: R$ {formatar_centavos_br(stats['total_proventos'])}")
+    logger.info(f"⚠️  Total Descontos Compulsórios (Obrigatórios): R$ {formatar_centavos_br(stats['total_descontos_obrigatorios'])}")
+    logger.info(f"💳 Total Descontos Facultativos: R$ {formatar_centavos_br(stats['total_descontos_extras'])}")
+    logger.info(f"💵 Total Líquido: R$ {formatar_centavos_br(stats['total_liquido'])}")
 
-html_final = gerar_html_relatorio(dados_todas_folhas)
+    tempo_decorrido = (datetime.now() - inicio).total_seconds()
+    logger.info(f"\n⏱️  Tempo de processamento: {tempo_decorrido:.2f} segundos")
+    if len(dados_todas_folhas) > 0:
+        print(f"⚡ Velocidade: {len(dados_todas_folhas)/tempo_decorrido:.1f} holerites/segundo")
 
-# Salvar na pasta da competência
-with open(caminho_output_comp, 'w', encoding='utf-8') as f:
-    f.write(html_final)
+    if cache is not None:
+        logger.info(f"🗄️  Cache de páginas: {cache.acertos} acertos, {cache.falhas} falhas (PyPDF2)")
+        cache.fechar()
+
+    logger.info(f"🧹 Pré-classificação: {PRE_CLASSIFICACAO['paginas_descartadas']} página(s) em branco, "
+                f"de capa ou de encerramento descartada(s) sem análise completa")
+
+    # Salvar log de erros se houver
+    salvar_log_erros(erros + PAGINAS_COM_ERRO, caminho_pasta)
+
+    # Gerar relatório de eventos não mapeados
+    if nao_mapeados:
+        print("\n" + "="*80)
+        print("⚠️  ATENÇÃO: EVENTOS NÃO CLASSIFICADOS DETECTADOS!")
+        print("="*80)
+        print(f"\n🔍 Foram encontrados {len(nao_mapeados)} eventos novos que não estão na planilha Excel.")
+        print("📋 Esses eventos foram classificados como 'Provento' por padrão (fallback).")
+        print("📝 Você precisa classificá-los manualmente na planilha 'Descricao_Comp_Rend.xlsx'!\n")
+    
+        # Gerar arquivo de eventos não mapeados (os de maior impacto financeiro primeiro)
+        eventos_por_impacto = nao_mapeados.por_impacto()
+        pasta_raiz = os.path.dirname(caminho_pasta)
+        caminho_nao_mapeados = os.path.join(pasta_raiz, "EVENTOS_NAO_CLASSIFICADOS.txt")
     
-with open(caminho_backup_comp, 'w', encoding='utf-8') as f:
-    json.dump(dados_todas_folhas, f, ensure_ascii=False, indent=2)
+        with open(caminho_nao_mapeados, 'w', encoding='utf-8') as f:
+            f.write("="*80 + "\n")
+            f.write("⚠️  EVENTOS NÃO CLASSIFICADOS - AÇÃO NECESSÁRIA\n")
+            f.write("="*80 + "\n")
+            f.write(f"Data/Hora: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}\n")
+            f.write(f"Total de eventos não classificados: {len(nao_mapeados)}\n")
+            f.write("="*80 + "\n\n")
+        
+            f.write("📋 INSTRUÇÕES:\n")
+            f.write("-" * 80 + "\n")
+            f.write("1. Abra a planilha: Descricao_Comp_Rend.xlsx\n")
+            f.write("2. Acesse a sheet: 'Composição de Rendimentos'\n")
+            f.write("3. Adicione cada evento abaixo com sua classificação:\n")
+            f.write("   - Provento\n")
+            f.write("   - Desconto Compulsório (obrigatório)\n")
+            f.write("   - Desconto Facultativo (extra)\n")
+            f.write("   - Omitir do cálculo\n")
+            f.write("4. Se for 'Desconto Facultativo', adicione também na sheet 'Ordem de Eliminação'\n")
+            f.write("   com a prioridade correta (1, 2, 3 ou 4)\n")
+            f.write("5. Salve a planilha e execute o script novamente\n")
+            f.write("="*80 + "\n\n")
+        
+            f.write("📊 EVENTOS NÃO CLASSIFICADOS (do maior para o menor valor total):\n")
+            f.write("="*80 + "\n\n")
+        
+            for evento in eventos_por_impacto:
+                f.write(f"Código: {evento.codigo}\n")
+                f.write(f"Descrição: {evento.descricao}\n")
+                f.write(f"Descrição Normalizada: {evento.descricao_normalizada}\n")
+                f.write(f"Valor total: R$ {formatar_centavos_br(evento.valor_total)} "
+                        f"({evento.ocorrencias} ocorrência(s) em {evento.holerites} holerite(s))\n")
+                for nome, cpf, arquivo in evento.exemplos:
+                    f.write(f"Exemplo: {nome or '(sem nome)'} - CPF {cpf or '(sem CPF)'} - {arquivo}\n")
+                for sugestao in indice_classificacao().sugerir(evento.codigo, evento.descricao_normalizada):
+                    f.write(f"Sugestão: {sugestao.tipo} (semelhante a Código {sugestao.codigo} - "
+                            f"{sugestao.descricao}, similaridade {sugestao.similaridade:.0%})\n")
+                f.write("-" * 80 + "\n\n")
+        
+            f.write("="*80 + "\n")
+            f.write("💡 DICA: Copie as informações acima e cole na planilha Excel\n")
+            f.write("="*80 + "\n")
+    
+        print(f"📄 Lista completa salva em: {caminho_nao_mapeados}")
+        print("\n" + "="*80)
+        print("🚨 EVENTOS NÃO CLASSIFICADOS:")
+        print("="*80 + "\n")
+    
+        for i, evento in enumerate(eventos_por_impacto, 1):
+            sugestoes = indice_classificacao().sugerir(evento.codigo, evento.descricao_normalizada)
+            dica = f"  (sugestão: {sugestoes[0].tipo}, {sugestoes[0].similaridade:.0%})" if sugestoes else ""
+            print(f"{i}. Código {evento.codigo} - {evento.descricao} - R$ {formatar_centavos_br(evento.valor_total)} "
+                  f"em {evento.holerites} holerite(s){dica}")
+    
+        print("\n" + "="*80)
+        print("⚠️  AÇÃO NECESSÁRIA:")
+        print("="*80)
+        print("1. Abra: Descricao_Comp_Rend.xlsx")
+        print("2. Classifique cada evento acima")
+        print("3. Se for 'Desconto Facultativo', defina a ordem de eliminação (1-4)")
+        print("4. Salve e execute o script novamente")
+        print("="*80 + "\n")
+
+    # Gerar HTML
+    logger.info("\n" + "="*80)
+    logger.info("📝 GERANDO RELATÓRIO HTML...")
+    logger.info("="*80 + "\n")
+
+    html_final = gerar_html_relatorio(dados_todas_folhas, eventos, nao_mapeados, agregacao)
+
+    # Salvar na pasta da competência (cada saída é serializada uma única vez; as demais são cópias)
+    escrever_html_relatorio(caminho_output_comp, html_final, dados_todas_folhas)
+    dados_todas_folhas.salvar_json(caminho_backup_comp)
+    manifesto.salvar()
+    if checkpoint is not None:
+        checkpoint.remover()
+
+    logger.info(f"✅ Relatório da competência {competencia_nome} salvo!")
+    logger.info(f"📋 Tabelas de parâmetros: {hash_tabelas}")
+    logger.info(f"📁 HTML: {caminho_output_comp}")
+    logger.info(f"📁 JSON: {caminho_backup_comp}")
+
+    # Salvar também na pasta geral (output/) e no backup geral
+    if publicar:
+        publicar_saidas_gerais(caminho_output_comp, caminho_backup_comp)
+    dados_todas_folhas.fechar()
 
-logger.info(f"✅ Relatório da competência {competencia_nome} salvo!")
-logger.info(f"📁 HTML: {caminho_output_comp}")
-logger.info(f"📁 JSON: {caminho_backup_comp}")
+    logger.info("\n" + "="*80)
+    logger.info("🎉 PROCESSAMENTO CONCLUÍDO COM SUCESSO!")
+    logger.info("="*80)
+    print("\n🌐 Abra o arquivo HTML no navegador para visualizar o relatório!")
+    print(f"   → {caminho_index_raiz}\n")
 
-# Salvar também na pasta geral (output/)
-with open(caminho_output, 'w', encoding='utf-8') as f:
-    f.write(html_final)
+    return len(dados_todas_folhas)
 
-logger.info(f"\n✅ Relatório geral atualizado!")
-logger.info(f"📁 Output: {caminho_output}")
+def main():
+    # Configurar encoding para UTF-8 no Windows
+    import sys
+    if sys.platform == 'win32':
+        import io
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-# Backup geral
-with open(caminho_backup, 'w', encoding='utf-8') as f:
-    json.dump(dados_todas_folhas, f, ensure_ascii=False, indent=2)
-logger.info(f"💾 Backup geral: {caminho_backup}")
+    configurar_logging()
 
-logger.info("\n" + "="*80)
-logger.info("🎉 PROCESSAMENTO CONCLUÍDO COM SUCESSO!")
-logger.info("="*80)
-print("\n🌐 Abra o arquivo HTML no navegador para visualizar o relatório!")
-print(f"   → {caminho_index_raiz}\n")
+    parser = argparse.ArgumentParser(description='Análise de Margem Consignável - SGP/ALMT')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Número de processos para ler os PDFs em paralelo (padrão: 1)')
+    parser.add_argument('--paginas-por-tarefa', type=int, default=PAGINAS_POR_TAREFA,
+                        help=f'Páginas por intervalo no modo paralelo (padrão: {PAGINAS_POR_TAREFA})')
+    parser.add_argument('--sem-cache', action='store_true',
+                        help='Não usar o cache de texto das páginas (data/cache/paginas.db)')
+    parser.add_argument('--antecipar', type=int, default=PDFS_ANTECIPADOS,
+                        help=f'PDFs lidos antecipadamente para a memória no modo sequencial; 0 desativa (padrão: {PDFS_ANTECIPADOS})')
+    parser.add_argument('--limite-pagina', type=float, default=LIMITE_SEGUNDOS_PAGINA,
+                        help=f'Tempo máximo (s) de extração por página, em processo isolado; 0 desativa (padrão: {LIMITE_SEGUNDOS_PAGINA:g})')
+    parser.add_argument('--limite-memoria', type=float, default=LIMITE_MEMORIA_PAGINA_MB,
+                        help=f'Memória adicional máxima (MB) do processo de extração, medida em /proc (ignorada com aviso '
+                             f'onde não existe, ex.: Windows); 0 desativa (padrão: {LIMITE_MEMORIA_PAGINA_MB:g})')
+    parser.add_argument('--completo', action='store_true',
+                        help='Reprocessar todos os PDFs, ignorando o manifesto da competência')
+    parser.add_argument('--resume', action='store_true',
+                        help='Continuar uma execução interrompida a partir do último checkpoint')
+    parser.add_argument('--reclassify', action='store_true',
+                        help='Reclassificar os eventos já extraídos (resultado.json) com a planilha atual, sem ler os PDFs')
+    lote = parser.add_mutually_exclusive_group()
+    lote.add_argument('--watch', action='store_true',
+                      help='Monitorar as pastas holerites/ e processar os PDFs à medida que chegam')
+    lote.add_argument('--all', action='store_true',
+                      help='Processar todas as competências (em paralelo com --workers)')
+    lote.add_argument('--range', type=intervalo_competencias, metavar='AAAA-MM:AAAA-MM',
+                      help='Processar as competências do intervalo, ex.: 2025-01:2025-12')
+    parser.add_argument('--intervalo', type=float, default=30,
+                        help='Segundos entre verificações no modo --watch (padrão: 30)')
+    args = parser.parse_args()
+    if args.reclassify and (args.watch or args.resume or args.completo):
+        parser.error('--reclassify não pode ser combinado com --watch, --resume ou --completo')
 
-# ============================================
-# SINCRONIZAÇÃO AUTOMÁTICA COM GITHUB
-# ============================================
-print("="*80)
-print("🔄 SINCRONIZAÇÃO COM GITHUB")
-print("="*80)
+    logger.info("="*80)
+    logger.info("🚀 SISTEMA DE ANÁLISE DE FOLHAS DE PAGAMENTO")
+    logger.info("="*80)
 
-try:
-    import subprocess
+    if args.watch:
+        monitorar_competencias(args)
+        return
+
+    if args.all or args.range:
+        # Modo lote: várias competências, cada uma em seu próprio processo
+        competencias = selecionar_competencias_lote(args.range)
+        if not competencias:
+            exit(1)
+        publicada = processar_lote(competencias, args)
+        if publicada is None:
+            return
+        pasta_raiz = os.path.dirname(publicada['caminho'])
+    else:
+        # Selecionar competência
+        competencia = selecionar_competencia()
+        if not competencia:
+            exit(1)
+        processar_competencia(competencia, args)
+        pasta_raiz = os.path.dirname(competencia['caminho'])
+
+    # ============================================
+    # SINCRONIZAÇÃO AUTOMÁTICA COM GITHUB
+    # ============================================
+    print("="*80)
+    print("🔄 SINCRONIZAÇÃO COM GITHUB")
+    print("="*80)
+
+    try:
+        import subprocess
     
-    print(f"✅ Arquivo index.html pronto para sincronização!")
+        print(f"✅ Arquivo index.html pronto para sincronização!")
     
-    # Verificar se Git está disponível
-    try:
-        subprocess.run(['git', '--version'], capture_output=True, check=True, cwd=pasta_raiz)
-    except:
-        print("⚠️  Git não encontrado. Arquivo index.html criado, mas não foi sincronizado.")
-        print("💡 Para enviar ao GitHub:")
-        print("   1. Abra o terminal no VS Code")
-        print("   2. Execute: git add index.html")
-        print("   3. Execute: git commit -m 'Atualização'")
-        print("   4. Execute: git push origin main")
-        print("\n")
-        import sys
-        sys.exit(0)
-    
-    # Verificar se há repositório Git
-    result = subprocess.run(['git', 'status'], capture_output=True, text=True, cwd=pasta_raiz)
-    if result.returncode != 0:
-        print("⚠️  Esta pasta não é um repositório Git.")
-        print("💡 Execute: git init")
-        print("\n")
-        import sys
-        sys.exit(0)
-    
-    # Perguntar se deseja fazer push
-    print("\n📤 Deseja enviar para o GitHub agora?")
-    resposta = input("   Digite 's' para SIM ou qualquer outra tecla para NÃO: ").strip().lower()
-    
-    if resposta == 's':
-        # Adicionar ao Git
-        subprocess.run(['git', 'add', 'index.html'], cwd=pasta_raiz, check=True)
-        print("✅ Arquivo adicionado ao Git")
-        
-        # Commit
-        data_hora = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-        result = subprocess.run(
-            ['git', 'commit', '-m', f'Atualização automática - {data_hora}'],
-            capture_output=True,
-            text=True,
-            cwd=pasta_raiz
-        )
-        
-        if "nothing to commit" in result.stdout:
-            print("ℹ️  Nenhuma alteração para enviar (arquivo já está atualizado)")
-        else:
-            print("✅ Commit realizado")
-            
-            # Pull antes do Push (para sincronizar com remoto)
-            print("🔄 Sincronizando com repositório remoto...")
-            result_pull = subprocess.run(
-                ['git', 'pull', '--rebase', 'origin', 'main'],
+        # Verificar se Git está disponível
+        try:
+            subprocess.run(['git', '--version'], capture_output=True, check=True, cwd=pasta_raiz)
+        except:
+            print("⚠️  Git não encontrado. Arquivo index.html criado, mas não foi sincronizado.")
+            print("💡 Para enviar ao GitHub:")
+            print("   1. Abra o terminal no VS Code")
+            print("   2. Execute: git add index.html")
+            print("   3. Execute: git commit -m 'Atualização'")
+            print("   4. Execute: git push origin main")
+            print("\n")
+            import sys
+            sys.exit(0)
+    
+        # Verificar se há repositório Git
+        result = subprocess.run(['git', 'status'], capture_output=True, text=True, cwd=pasta_raiz)
+        if result.returncode != 0:
+            print("⚠️  Esta pasta não é um repositório Git.")
+            print("💡 Execute: git init")
+            print("\n")
+            import sys
+            sys.exit(0)
+    
+        # Perguntar se deseja fazer push
+        print("\n📤 Deseja enviar para o GitHub agora?")
+        resposta = input("   Digite 's' para SIM ou qualquer outra tecla para NÃO: ").strip().lower()
+    
+        if resposta == 's':
+            # Adicionar ao Git
+            subprocess.run(['git', 'add', 'index.html'], cwd=pasta_raiz, check=True)
+            print("✅ Arquivo adicionado ao Git")
+        
+            # Commit
+            data_hora = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+            result = subprocess.run(
+                ['git', 'commit', '-m', f'Atualização automática - {data_hora}'],
                 capture_output=True,
                 text=True,
                 cwd=pasta_raiz
             )
-            
-            if result_pull.returncode == 0:
-                print("✅ Sincronizado com repositório remoto")
+        
+            if "nothing to commit" in result.stdout:
+                print("ℹ️  Nenhuma alteração para enviar (arquivo já está atualizado)")
             else:
-                # Se der erro no pull, tenta sem rebase
+                print("✅ Commit realizado")
+            
+                # Pull antes do Push (para sincronizar com remoto)
+                print("🔄 Sincronizando com repositório remoto...")
                 result_pull = subprocess.run(
-                    ['git', 'pull', 'origin', 'main'],
+                    ['git', 'pull', '--rebase', 'origin', 'main'],
                     capture_output=True,
                     text=True,
                     cwd=pasta_raiz
                 )
+            
                 if result_pull.returncode == 0:
                     print("✅ Sincronizado com repositório remoto")
+                else:
+                    # Se der erro no pull, tenta sem rebase
+                    result_pull = subprocess.run(
+                        ['git', 'pull', 'origin', 'main'],
+                        capture_output=True,
+                        text=True,
+                        cwd=pasta_raiz
+                    )
+                    if result_pull.returncode == 0:
+                        print("✅ Sincronizado com repositório remoto")
+            
+                # Push
+                print("📤 Enviando para GitHub...")
+                result = subprocess.run(
+                    ['git', 'push', 'origin', 'main'],
+                    capture_output=True,
+                    text=True,
+                    cwd=pasta_raiz
+                )
             
-            # Push
-            print("📤 Enviando para GitHub...")
-            result = subprocess.run(
-                ['git', 'push', 'origin', 'main'],
-                capture_output=True,
-                text=True,
-                cwd=pasta_raiz
-            )
-            
-            if result.returncode == 0:
-                print("🚀 Enviado para GitHub com sucesso!")
-                print("🌐 Disponível em: https://pablogusen.github.io/folha_sgp/")
-                print("⏱️  Aguarde 1-2 minutos para o GitHub Pages atualizar.")
-            else:
-                print("⚠️  Erro ao enviar para GitHub:")
-                print(result.stderr)
-                print("\n💡 Tente manualmente:")
-                print("   git push origin main")
-    else:
-        print("⏸️  Sincronização cancelada.")
-        print("💡 Para enviar depois, execute no terminal:")
+                if result.returncode == 0:
+                    print("🚀 Enviado para GitHub com sucesso!")
+                    print("🌐 Disponível em: https://pablogusen.github.io/folha_sgp/")
+                    print("⏱️  Aguarde 1-2 minutos para o GitHub Pages atualizar.")
+                else:
+                    print("⚠️  Erro ao enviar para GitHub:")
+                    print(result.stderr)
+                    print("\n💡 Tente manualmente:")
+                    print("   git push origin main")
+        else:
+            print("⏸️  Sincronização cancelada.")
+            print("💡 Para enviar depois, execute no terminal:")
+            print("   git add index.html")
+            print("   git commit -m 'Atualização'")
+            print("   git push origin main")
+        
+    except KeyboardInterrupt:
+        print("\n\n⏸️  Sincronização cancelada pelo usuário.")
+    except Exception as e:
+        print(f"\n⚠️  Erro na sincronização: {e}")
+        print("\n💡 Arquivo index.html foi criado. Para enviar manualmente:")
         print("   git add index.html")
         print("   git commit -m 'Atualização'")
         print("   git push origin main")
-        
-except KeyboardInterrupt:
-    print("\n\n⏸️  Sincronização cancelada pelo usuário.")
-except Exception as e:
-    print(f"\n⚠️  Erro na sincronização: {e}")
-    print("\n💡 Arquivo index.html foi criado. Para enviar manualmente:")
-    print("   git add index.html")
-    print("   git commit -m 'Atualização'")
-    print("   git push origin main")
 
-print("\n")
+    print("\n")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,222 @@
+"""
+Registros compactos de holerite e de evento (__slots__)
+Um holerite em dict carrega uma tabela de 22 chaves e cada evento outro dict com cópias próprias
+das descrições; com __slots__ e strings internadas (código, descrição, cargo...) a memória por
+beneficiário cai a uma fração, o que importa no modo paralelo e em competências com dezenas de
+milhares de holerites. Os valores monetários ficam em centavos inteiros no registro, no armazenamento
+em disco e no checkpoint (to_registro); o formato exportado (resultado.json, relatório HTML) continua
+o mesmo, em reais: to_dict
+"""
+
+import sys
+
+from moeda import centavos, reais
+
+# Ordem dos campos no resultado.json (a mesma do dict montado pela extração)
+CAMPOS_HOLERITE = (
+    'nome', 'cpf', 'matricula', 'data_nascimento', 'idade', 'idade_anos', 'situacao', 'competencia', 'cargo',
+    'data_admissao', 'tempo_servico_anos', 'proventos', 'descontos_obrigatorios', 'descontos_extras', 'eventos_informativos',
+    'total_proventos', 'total_descontos_obrigatorios', 'total_descontos_extras', 'total_descontos',
+    'liquido', 'liquido_calculado', 'margem_consignavel', 'percentual_limite', 'status_margem',
+    'arquivo_origem', 'erro_processamento',
+)
+# Valores monetários, em centavos no registro: campo do resultado.json → campo do registro
+CAMPOS_CENTAVOS = {
+    'total_proventos': 'total_proventos_centavos',
+    'total_descontos_obrigatorios': 'total_descontos_obrigatorios_centavos',
+    'total_descontos_extras': 'total_descontos_extras_centavos',
+    'total_descontos': 'total_descontos_centavos',
+    'liquido': 'liquido_centavos',
+    'margem_consignavel': 'margem_centavos',
+}
+# Campos do registro (slots), na ordem do resultado.json
+CAMPOS_REGISTRO = tuple(CAMPOS_CENTAVOS.get(campo, campo) for campo in CAMPOS_HOLERITE)
+CAMPOS_SLOTS = frozenset(CAMPOS_REGISTRO)
+LISTAS_EVENTOS = frozenset(('proventos', 'descontos_obrigatorios', 'descontos_extras', 'eventos_informativos'))
+# Textos que se repetem entre os holerites de uma competência: uma única cópia em memória
+CAMPOS_INTERNADOS = frozenset(('situacao', 'competencia', 'cargo'))
+
+class Registro:
+    """Acesso no estilo dict (registro['campo'], get, in) aos campos de um registro com __slots__"""
+
+    __slots__ = ()
+
+    def __getitem__(self, campo):
+        try:
+            return getattr(self, campo)
+        except AttributeError:
+            raise KeyError(campo) from None
+
+    def __setitem__(self, campo, valor):
+        setattr(self, campo, valor)
+
+    def __contains__(self, campo):
+        return hasattr(self, campo)
+
+    def get(self, campo, padrao=None):
+        return getattr(self, campo, padrao)
+
+    def __eq__(self, outro):
+        if isinstance(outro, Registro):
+            outro = outro.to_dict()
+        return self.to_dict() == outro
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+class Evento(Registro):
+    """Lançamento da tabela de rendimentos (valor e base de cálculo em centavos)"""
+
+    __slots__ = ('descricao', 'valor_centavos', 'base_centavos', 'referencia', 'codigo')
+
+    def __init__(self, descricao, valor_centavos, base_centavos, referencia, codigo):
+        # Sem sys.intern aqui: a extração já passa descrição e código compartilhados (normalizar_descricao)
+        self.descricao = descricao
+        self.valor_centavos = valor_centavos
+        self.base_centavos = base_centavos
+        self.referencia = referencia
+        self.codigo = codigo
+
+    def to_dict(self):
+        """Dict no formato do resultado.json (valores em reais)"""
+        return {'descricao': self.descricao, 'valor': reais(self.valor_centavos), 'base_calculo': reais(self.base_centavos),
+                'referencia': self.referencia, 'codigo': self.codigo}
+
+    @classmethod
+    def from_dict(cls, dados):
+        return cls(sys.intern(dados['descricao']), centavos(dados['valor']), centavos(dados['base_calculo']),
+                   dados['referencia'], sys.intern(dados['codigo']))
+
+    def to_registro(self):
+        """Dict com os campos do registro (valores em centavos), gravado em disco"""
+        return {'descricao': self.descricao, 'valor_centavos': self.valor_centavos, 'base_centavos': self.base_centavos,
+                'referencia': self.referencia, 'codigo': self.codigo}
+
+    @classmethod
+    def from_registro(cls, dados):
+        return cls(sys.intern(dados['descricao']), dados['valor_centavos'], dados['base_centavos'], dados['referencia'],
+                   sys.intern(dados['codigo']))
+
+class Holerite(Registro):
+    """
+    Holerite consolidado. Campos não informados ficam ausentes (e fora do to_dict), como as
+    chaves que o registro de erro não tem; chaves desconhecidas vão para `extras`.
+    Os valores monetários são os campos *_centavos (CAMPOS_CENTAVOS); em reais só no to_dict.
+    """
+
+    __slots__ = CAMPOS_REGISTRO + ('extras',)
+
+    def __init__(self, **campos):
+        self.extras = None
+        for campo, valor in campos.items():
+            if campo in CAMPOS_INTERNADOS or campo not in CAMPOS_SLOTS:
+                self[campo] = valor
+            else:
+                setattr(self, campo, valor)
+
+    @classmethod
+    def vazio(cls, situacao, arquivo_origem):
+        """
+        Holerite com os campos preenchidos pela extração ainda vazios (totais zerados), atribuídos
+        direto aos slots: criado a cada página, sem o laço por campo do __init__
+        """
+        holerite = cls.__new__(cls)
+        holerite.extras = None
+        holerite.nome = holerite.cpf = holerite.matricula = holerite.data_nascimento = holerite.idade = ''
+        holerite.situacao = sys.intern(situacao)
+        holerite.competencia = holerite.cargo = holerite.data_admissao = ''
+        holerite.proventos = []
+        holerite.descontos_obrigatorios = []
+        holerite.descontos_extras = []
+        holerite.eventos_informativos = []
+        holerite.total_proventos_centavos = holerite.total_descontos_obrigatorios_centavos = 0
+        holerite.total_descontos_extras_centavos = holerite.total_descontos_centavos = holerite.liquido_centavos = 0
+        holerite.arquivo_origem = arquivo_origem
+        holerite.erro_processamento = None
+        return holerite
+
+    def __setitem__(self, campo, valor):
+        if campo in CAMPOS_INTERNADOS and isinstance(valor, str):
+            valor = sys.intern(valor)
+        if campo in CAMPOS_SLOTS:
+            setattr(self, campo, valor)
+        else:
+            if campo in CAMPOS_CENTAVOS:
+                raise KeyError(f"{campo} é guardado em centavos no holerite: use {CAMPOS_CENTAVOS[campo]}")
+            if self.extras is None:
+                self.extras = {}
+            self.extras[campo] = valor
+
+    def __getitem__(self, campo):
+        if campo in CAMPOS_SLOTS:
+            return super().__getitem__(campo)
+        if self.extras is not None and campo in self.extras:
+            return self.extras[campo]
+        raise KeyError(campo)
+
+    def __contains__(self, campo):
+        return hasattr(self, campo) if campo in CAMPOS_SLOTS else self.extras is not None and campo in self.extras
+
+    def get(self, campo, padrao=None):
+        try:
+            return self[campo]
+        except KeyError:
+            return padrao
+
+    def to_dict(self):
+        """Dict no formato do resultado.json (mesmas chaves, na mesma ordem, valores em reais)"""
+        dados = {}
+        for campo, campo_registro in zip(CAMPOS_HOLERITE, CAMPOS_REGISTRO):
+            try:
+                valor = getattr(self, campo_registro)
+            except AttributeError:
+                continue
+            if campo in LISTAS_EVENTOS:
+                valor = [evento.to_dict() for evento in valor]
+            elif campo != campo_registro:
+                valor = reais(valor)
+            dados[campo] = valor
+        if self.extras:
+            dados.update(self.extras)
+        return dados
+
+    @classmethod
+    def from_dict(cls, dados):
+        """Holerite a partir do dict do resultado.json (valores em reais)"""
+        holerite = cls()
+        for campo, valor in dados.items():
+            if campo in LISTAS_EVENTOS:
+                valor = [Evento.from_dict(evento) for evento in valor]
+            elif campo in CAMPOS_CENTAVOS:
+                campo, valor = CAMPOS_CENTAVOS[campo], centavos(valor)
+            holerite[campo] = valor
+        return holerite
+
+    def to_registro(self):
+        """Dict com os campos do registro (valores em centavos), gravado no armazenamento em disco e no checkpoint"""
+        dados = {}
+        for campo in CAMPOS_REGISTRO:
+            try:
+                valor = getattr(self, campo)
+            except AttributeError:
+                continue
+            dados[campo] = [evento.to_registro() for evento in valor] if campo in LISTAS_EVENTOS else valor
+        if self.extras:
+            dados.update(self.extras)
+        return dados
+
+    @classmethod
+    def from_registro(cls, dados):
+        """Holerite a partir do dict gravado por to_registro"""
+        holerite = cls()
+        for campo, valor in dados.items():
+            if campo in LISTAS_EVENTOS:
+                valor = [Evento.from_registro(evento) for evento in valor]
+            holerite[campo] = valor
+        return holerite
+
+def resultado_do_registro(dados):
+    """Dict do resultado.json (valores em reais) a partir de um registro gravado por to_registro"""
+    return Holerite.from_registro(dados).to_dict()
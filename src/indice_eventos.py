@@ -0,0 +1,97 @@
+"""
+Índice de classificação tolerante a variações de grafia dos eventos
+A classificação da planilha é buscada pela chave exata (código, descrição em maiúsculas); uma variação
+de acento ou de espaçamento (ex.: 'CONTRIBUICAO  PREVIDENCIÁRIA') cairia no fallback 'Provento' e
+inflaria a RLM. Aqui a descrição é normalizada (sem acentos, espaços colapsados) para uma segunda busca
+exata e, se ainda assim o evento não for encontrado, um índice de trigramas sugere o evento classificado
+mais parecido, com a similaridade (coeficiente de Dice entre os trigramas das descrições)
+"""
+
+import unicodedata
+from collections import namedtuple
+
+import numpy as np
+
+Sugestao = namedtuple('Sugestao', ['codigo', 'descricao', 'tipo', 'similaridade'])
+
+# Similaridade mínima para uma sugestão ser apresentada
+SIMILARIDADE_MINIMA = 0.5
+
+def normalizar_descricao(texto):
+    """Maiúsculas, sem acentos e com os espaços colapsados"""
+    decomposto = unicodedata.normalize('NFKD', texto.upper())
+    sem_acentos = ''.join(caractere for caractere in decomposto if not unicodedata.combining(caractere))
+    return ' '.join(sem_acentos.split())
+
+def trigramas(texto_normalizado):
+    """Trigramas de cada palavra, com a palavra delimitada por espaços (como o pg_trgm)"""
+    resultado = set()
+    for palavra in texto_normalizado.split():
+        palavra = f"  {palavra} "
+        resultado.update(palavra[i:i + 3] for i in range(len(palavra) - 2))
+    return resultado
+
+class IndiceClassificacao:
+    """
+    Construído uma vez a partir do mapeamento {(código, descrição): tipo} da planilha.
+    As consultas são memorizadas por (código, descrição): cada evento não mapeado distinto
+    é analisado uma única vez, por maior que seja a competência.
+    """
+
+    def __init__(self, mapeamento):
+        self.normalizado = {}
+        ambiguos = set()
+        for (codigo, descricao), tipo in mapeamento.items():
+            chave = (codigo, normalizar_descricao(descricao))
+            if self.normalizado.get(chave, tipo) != tipo:
+                ambiguos.add(chave)  # variações com tipos diferentes: não classifica automaticamente
+            self.normalizado[chave] = tipo
+        for chave in ambiguos:
+            del self.normalizado[chave]
+
+        # Índice invertido trigrama → entradas (arrays NumPy: a contagem de trigramas em comum com a
+        # descrição consultada é um bincount sobre as listas dos trigramas dela)
+        self._entradas = [(codigo, descricao, tipo) for (codigo, descricao), tipo in mapeamento.items()]
+        self._codigos = np.array([codigo for codigo, _, _ in self._entradas], dtype=str)
+        postagens = {}
+        tamanhos = []
+        for indice, (_, descricao, _) in enumerate(self._entradas):
+            grams = trigramas(normalizar_descricao(descricao))
+            tamanhos.append(len(grams))
+            for gram in grams:
+                postagens.setdefault(gram, []).append(indice)
+        self._postagens = {gram: np.array(indices, dtype=np.int32) for gram, indices in postagens.items()}
+        self._tamanhos = np.array(tamanhos, dtype=np.float64)
+
+        self._classificacoes = {}
+        self._sugestoes = {}
+
+    def classificar(self, codigo, descricao):
+        """Tipo do evento pela descrição normalizada (mesmo código), ou None"""
+        chave = (codigo, descricao)
+        if chave not in self._classificacoes:
+            self._classificacoes[chave] = self.normalizado.get((codigo, normalizar_descricao(descricao)))
+        return self._classificacoes[chave]
+
+    def sugerir(self, codigo, descricao, quantidade=1, minimo=SIMILARIDADE_MINIMA):
+        """
+        Até `quantidade` eventos classificados mais parecidos com a descrição, do mais ao menos
+        semelhante (em empate, o de mesmo código primeiro). Só entram similaridades >= minimo.
+        """
+        chave = (codigo, descricao, quantidade)
+        if chave not in self._sugestoes:
+            self._sugestoes[chave] = self._mais_parecidos(codigo, descricao, quantidade)
+        return [sugestao for sugestao in self._sugestoes[chave] if sugestao.similaridade >= minimo]
+
+    def _mais_parecidos(self, codigo, descricao, quantidade):
+        grams = trigramas(normalizar_descricao(descricao))
+        listas = [self._postagens[gram] for gram in grams if gram in self._postagens]
+        if not listas:
+            return []
+        comuns = np.bincount(np.concatenate(listas), minlength=len(self._entradas))
+        candidatos = np.flatnonzero(comuns)
+        similaridades = 2 * comuns[candidatos] / (len(grams) + self._tamanhos[candidatos])
+        mesmo_codigo = self._codigos[candidatos] == codigo
+        # Maior similaridade primeiro; em empate, o de mesmo código e depois a ordem da planilha
+        ordem = np.lexsort((candidatos, ~mesmo_codigo, -similaridades))[:quantidade]
+        return [Sugestao(*self._entradas[candidatos[i]], round(float(similaridades[i]), 3)) for i in ordem]
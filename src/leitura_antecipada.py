@@ -0,0 +1,66 @@
+"""
+Leitura antecipada dos PDFs: enquanto um arquivo é analisado (CPU), os próximos são lidos
+do disco/rede para a memória em uma thread de E/S, junto com o hash do conteúdo
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from cache_paginas import calcular_hash_conteudo
+
+# Quantidade de PDFs lidos à frente do que está sendo analisado (--antecipar)
+PDFS_ANTECIPADOS = 2
+
+def ler_pdf(caminho_pdf):
+    """Lê o PDF inteiro para a memória e calcula seu hash; retorna (conteudo, hash_pdf)"""
+    info = os.stat(caminho_pdf)
+    with open(caminho_pdf, 'rb') as arquivo:
+        conteudo = arquivo.read()
+    return conteudo, calcular_hash_conteudo(caminho_pdf, info, conteudo)
+
+class LeituraAntecipada:
+    """
+    Mantém até `quantidade` PDFs à frente já lidos (ou em leitura) por uma única thread de E/S.
+    obter(indice) devolve (conteudo, hash_pdf) do PDF de posição indice e agenda os seguintes;
+    com quantidade = 0 não há leitura antecipada e obter devolve (None, None).
+    Em memória ficam no máximo quantidade + 1 arquivos.
+    """
+
+    def __init__(self, caminhos_pdf, quantidade=PDFS_ANTECIPADOS):
+        self.caminhos_pdf = list(caminhos_pdf)
+        self.quantidade = quantidade
+        self._leituras = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='leitura_pdf') if quantidade > 0 else None
+        self._agendar(0, quantidade)
+
+    def _agendar(self, inicio, fim):
+        if self._executor is None:
+            return
+        for indice in range(inicio, min(fim, len(self.caminhos_pdf))):
+            if indice not in self._leituras:
+                self._leituras[indice] = self._executor.submit(ler_pdf, self.caminhos_pdf[indice])
+
+    def obter(self, indice):
+        """(conteudo, hash_pdf) do PDF de posição indice; erros de leitura são relançados aqui"""
+        if self._executor is None:
+            return None, None
+        self._agendar(indice, indice + 1)
+        leitura = self._leituras.pop(indice)
+        # Leituras de posições já puladas não serão usadas
+        for anterior in [i for i in self._leituras if i < indice]:
+            self._leituras.pop(anterior).cancel()
+        self._agendar(indice + 1, indice + 1 + self.quantidade)
+        return leitura.result()
+
+    def fechar(self):
+        if self._executor is not None:
+            for leitura in self._leituras.values():
+                leitura.cancel()
+            self._leituras.clear()
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
@@ -0,0 +1,138 @@
+"""
+Manifesto dos PDFs processados de uma competência (manifesto.json, ao lado do resultado.json)
+Permite o processamento incremental: apenas PDFs novos ou alterados são lidos novamente
+"""
+
+import json
+import os
+from pathlib import Path
+
+from cache_paginas import calcular_hash_arquivo
+
+VERSAO_MANIFESTO = 1
+
+def id_registro(dados):
+    """Identificador do holerite: CPF + matrícula (sem CPF, a origem arquivo/página)"""
+    if dados.get('cpf'):
+        return f"{dados['cpf']}|{dados.get('matricula', '')}"
+    return f"origem:{dados.get('arquivo_origem', '')}"
+
+def arquivo_do_registro(dados):
+    """Nome do PDF de origem do holerite (arquivo_origem sem a indicação de página)"""
+    return dados.get('arquivo_origem', '').split(' (pág.')[0]
+
+class Manifesto:
+    """
+    Para cada PDF da pasta holerites/: nome, tamanho, mtime, hash do conteúdo e os
+    identificadores dos holerites que ele originou no resultado.json.
+    O manifesto só é aproveitado se foi gerado com as mesmas tabelas de parâmetros
+    (hash_parametros); caso contrário a competência é reprocessada por completo.
+    Na reclassificação (exigir_parametros=False) o manifesto de outras tabelas também vale:
+    os holerites são reaproveitados e apenas reclassificados.
+    """
+
+    def __init__(self, caminho, hash_parametros=None, exigir_parametros=True):
+        self.caminho = Path(caminho)
+        self.hash_parametros = hash_parametros
+        self.anterior = {}
+        self.valido = False
+        self._entradas = {}
+        self._registros = {}
+
+        if self.caminho.exists():
+            try:
+                with open(self.caminho, encoding='utf-8') as f:
+                    conteudo = json.load(f)
+            except (OSError, ValueError):
+                conteudo = None
+
+            if (conteudo and conteudo.get('versao') == VERSAO_MANIFESTO
+                    and (conteudo.get('hash_parametros') == hash_parametros or not exigir_parametros)):
+                self.anterior = conteudo.get('arquivos', {})
+                self.valido = True
+
+    def descartar_anterior(self):
+        """Ignora o manifesto anterior (reprocessamento completo)"""
+        self.anterior = {}
+        self.valido = False
+
+    def desatualizado(self, caminhos_pdf):
+        """
+        Verificação rápida (sem hash): há PDFs novos, removidos ou com tamanho/mtime
+        diferentes dos registrados, ou o manifesto não é aproveitável
+        """
+        if not self.valido:
+            return True
+        atuais = {Path(caminho_pdf).name: os.stat(caminho_pdf) for caminho_pdf in caminhos_pdf}
+        if set(atuais) != set(self.anterior):
+            return True
+        return any(self.anterior[nome]['tamanho'] != info.st_size or self.anterior[nome]['mtime'] != info.st_mtime
+                   for nome, info in atuais.items())
+
+    def comparar(self, caminhos_pdf):
+        """
+        Compara os PDFs atuais com o manifesto anterior.
+        Retorna (inalterados, alterados, removidos): listas de caminhos, caminhos e nomes.
+        O hash só é recalculado quando tamanho ou mtime mudaram; PDFs novos não precisam dele
+        para a comparação.
+        """
+        inalterados = []
+        alterados = []
+        for caminho_pdf in caminhos_pdf:
+            info = os.stat(caminho_pdf)
+            anterior = self.anterior.get(caminho_pdf.name)
+            entrada = {'caminho': caminho_pdf, 'tamanho': info.st_size, 'mtime': info.st_mtime}
+
+            if anterior and anterior['tamanho'] == info.st_size and anterior['mtime'] == info.st_mtime:
+                entrada['hash'] = anterior['hash']
+            elif anterior:
+                entrada['hash'] = calcular_hash_arquivo(caminho_pdf)
+            else:
+                entrada['hash'] = None  # PDF novo: o hash é obtido na leitura (ou em salvar)
+            self._entradas[caminho_pdf.name] = entrada
+
+            if anterior and anterior['hash'] == entrada['hash']:
+                inalterados.append(caminho_pdf)
+            else:
+                alterados.append(caminho_pdf)
+
+        removidos = [nome for nome in self.anterior if nome not in self._entradas]
+        return inalterados, alterados, removidos
+
+    def marcar_desatualizados(self, caminhos_pdf):
+        """
+        PDFs novos/alterados que não foram lidos nesta execução (--reclassify): o manifesto a gravar mantém a
+        entrada anterior de cada um (e os holerites que ele já tinha gerado), e os PDFs novos ficam de fora,
+        de modo que a próxima execução normal os encontra alterados e os lê
+        """
+        for caminho_pdf in caminhos_pdf:
+            nome = Path(caminho_pdf).name
+            anterior = self.anterior.get(nome)
+            if anterior is None:
+                self._entradas.pop(nome, None)
+            else:
+                self._entradas[nome] = {'caminho': caminho_pdf, 'tamanho': anterior['tamanho'],
+                                        'mtime': anterior['mtime'], 'hash': anterior['hash']}
+
+    def registrar(self, dados):
+        """Associa um holerite do resultado final ao PDF de origem"""
+        self._registros.setdefault(arquivo_do_registro(dados), []).append(id_registro(dados))
+
+    def salvar(self):
+        """Grava o manifesto (substituição atômica do arquivo)"""
+        for nome, entrada in self._entradas.items():
+            if entrada['hash'] is None:
+                entrada['hash'] = calcular_hash_arquivo(entrada['caminho'])
+        conteudo = {
+            'versao': VERSAO_MANIFESTO,
+            'hash_parametros': self.hash_parametros,
+            'arquivos': {
+                nome: {'tamanho': entrada['tamanho'], 'mtime': entrada['mtime'], 'hash': entrada['hash'],
+                       'registros': self._registros.get(nome, [])}
+                for nome, entrada in sorted(self._entradas.items())
+            }
+        }
+        temporario = self.caminho.with_name(self.caminho.name + '.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(conteudo, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, self.caminho)
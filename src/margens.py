@@ -0,0 +1,82 @@
+"""
+Margem consignável e status de comprometimento calculados em colunas (NumPy/pandas)
+RLM = proventos - descontos compulsórios; limite ideal = 35% da RLM (Resolução Administrativa nº 14/2025,
+Art. 5º); percentual = descontos facultativos / limite ideal. Todos os holerites de um lote (ou da
+competência) são classificados de uma vez, com operações sobre vetores: o relatório HTML, o resultado.json
+e a comparação de críticos usam o mesmo cálculo
+"""
+
+import numpy as np
+import pandas as pd
+
+# Limite consignável: 35% da RLM
+PERCENTUAL_LIMITE_LEGAL = 0.35
+
+# Thresholds alinhados com a capacidade de endividamento consignado (percentual do limite ideal):
+# - < 57% do limite = < 20% da margem (SAUDÁVEL)
+# - 57-86% do limite = 20-30% da margem (ATENÇÃO)
+# - 86-100% do limite = 30-35% da margem (RISCO)
+# - > 100% do limite = > 35% da margem (CRÍTICO - acima do limite legal)
+# O último limite é o menor float acima de 100: com searchsorted(side='right'), exatamente 100% ainda é RISCO
+LIMITES_FAIXAS = np.array([57.0, 86.0, np.nextafter(100.0, np.inf)])
+STATUS_FAIXAS = ('SAUDÁVEL', 'ATENÇÃO', 'RISCO', 'CRÍTICO')
+
+# Holerites fora das faixas: sem descontos facultativos, ou com descontos facultativos e RLM negativa/zero
+SEM_DESCONTOS = 'SEM DESCONTOS'
+SEM_MARGEM = 'SEM MARGEM'
+STATUS_MARGEM = (SEM_DESCONTOS,) + STATUS_FAIXAS + (SEM_MARGEM,)
+
+# Campos do holerite (em centavos) usados no cálculo
+COLUNAS_MARGEM = ('total_proventos_centavos', 'total_descontos_obrigatorios_centavos', 'total_descontos_extras_centavos')
+
+def calcular_margens(proventos_centavos, obrigatorios_centavos, extras_centavos):
+    """
+    DataFrame com uma linha por holerite (na ordem recebida), a partir dos vetores de valores em centavos:
+    margem_centavos (int64), margem_consignavel, limite_ideal e percentual_limite (float64, em reais e em %
+    do limite ideal; percentual 0 sem RLM positiva) e status (Categorical com as categorias de STATUS_MARGEM)
+    """
+    proventos = np.asarray(proventos_centavos, dtype=np.int64)
+    extras = np.asarray(extras_centavos, dtype=np.int64)
+    # Margem consignável (base de cálculo para empréstimos), exata em centavos
+    margem_centavos = proventos - np.asarray(obrigatorios_centavos, dtype=np.int64)
+    margem_consignavel = margem_centavos / 100
+    limite_ideal = margem_consignavel * PERCENTUAL_LIMITE_LEGAL
+
+    # Percentual sobre o limite ideal de 35%
+    # Exemplo: Se limite = 580,69 e descontos = 2.884,42, então 2.884,42 / 580,69 = 497%
+    com_margem = margem_centavos > 0
+    percentual = np.zeros(len(margem_centavos))
+    np.divide(extras / 100, limite_ideal, out=percentual, where=com_margem)
+    percentual *= 100
+
+    faixa = np.searchsorted(LIMITES_FAIXAS, percentual, side='right')
+    codigos = np.select([extras == 0, ~com_margem],
+                        [STATUS_MARGEM.index(SEM_DESCONTOS), STATUS_MARGEM.index(SEM_MARGEM)],
+                        default=faixa + 1)
+    return pd.DataFrame({
+        'margem_centavos': margem_centavos,
+        'margem_consignavel': margem_consignavel,
+        'limite_ideal': limite_ideal,
+        'percentual_limite': percentual,
+        'status': pd.Categorical.from_codes(codigos, categories=STATUS_MARGEM),
+    })
+
+def calcular_margens_holerites(holerites):
+    """calcular_margens dos holerites (Holerite ou registro gravado em disco, totais em centavos)"""
+    proventos, obrigatorios, extras = ([holerite.get(coluna) or 0 for holerite in holerites] for coluna in COLUNAS_MARGEM)
+    return calcular_margens(proventos, obrigatorios, extras)
+
+def enriquecer_margens(holerites):
+    """
+    Preenche em cada holerite (na própria lista) margem_centavos, percentual_limite (arredondado a 2 casas)
+    e status_margem, gravados no resultado.json (a margem como margem_consignavel, em reais)
+    """
+    if not holerites:
+        return
+    margens = calcular_margens_holerites(holerites)
+    for holerite, margem, percentual, status in zip(holerites, margens['margem_centavos'].tolist(),
+                                                     margens['percentual_limite'].round(2).tolist(),
+                                                     margens['status'].tolist()):
+        holerite['margem_centavos'] = margem
+        holerite['percentual_limite'] = percentual
+        holerite['status_margem'] = status
@@ -0,0 +1,36 @@
+"""
+Valores monetários em centavos inteiros
+Os valores do holerite são lidos do texto do PDF direto para centavos e somados como inteiros,
+sem o erro de arredondamento acumulado pela soma de floats; a conversão para reais
+(resultado.json, relatório HTML, log) acontece apenas na saída
+"""
+
+def centavos_br(texto):
+    """
+    Converte um valor no padrão brasileiro para centavos: '1.465,40' → 146540, '30' → 3000.
+    Casas decimais além dos centavos são arredondadas; texto sem dígitos gera ValueError.
+    """
+    if texto[-3:-2] == ',' and ',' not in texto[:-3] and texto[-2:].isdigit():
+        # Caso comum do holerite (sempre 2 casas decimais): basta remover a pontuação
+        return int(texto.replace('.', '').replace(',', ''))
+    inteiro, _, fracao = texto.replace('.', '').partition(',')
+    if not (inteiro + fracao).isdigit():
+        raise ValueError(f"Valor monetário inválido: {texto!r}")
+    valor = int(inteiro or '0') * 100 + int(fracao[:2].ljust(2, '0'))
+    if len(fracao) > 2 and fracao[2] >= '5':
+        valor += 1
+    return valor
+
+def centavos(reais):
+    """Converte um valor em reais (ex.: lido do resultado.json) para centavos"""
+    return round(reais * 100)
+
+def reais(centavos):
+    """Converte centavos para reais, o formato dos valores no resultado.json e no relatório"""
+    return centavos / 100
+
+def formatar_centavos_br(centavos):
+    """Formata centavos no padrão brasileiro, sem passar por float: 145015 → '1.450,15'"""
+    sinal = '-' if centavos < 0 else ''
+    inteiro, fracao = divmod(abs(centavos), 100)
+    return f"{sinal}{inteiro:,}".replace(',', '.') + f",{fracao:02d}"
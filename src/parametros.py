@@ -0,0 +1,234 @@
+"""
+Repositório de classificação dos eventos (data/parametros/eventos.db)
+A planilha Descricao_Comp_Rend.xlsx continua sendo onde os eventos são classificados; o banco SQLite
+é a forma compilada que o sistema lê. Ele é sincronizado automaticamente quando a planilha é mais nova
+que o banco e tem conteúdo diferente (SHA-256 gravado no próprio banco), e serve as duas tabelas
+(classificação e ordem de eliminação) no mesmo formato, por uma única conexão somente leitura
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+
+from cache_paginas import calcular_hash_arquivo
+
+PASTA_PARAMETROS = Path(__file__).parent.parent / 'data' / 'parametros'
+CAMINHO_PLANILHA = PASTA_PARAMETROS / 'Descricao_Comp_Rend.xlsx'
+CAMINHO_EVENTOS_DB = PASTA_PARAMETROS / 'eventos.db'
+
+# Incrementar quando o esquema mudar (o banco é recriado a partir da planilha)
+VERSAO_ESQUEMA = 3
+
+ESQUEMA = (
+    'CREATE TABLE metadados (chave TEXT PRIMARY KEY, valor TEXT NOT NULL)',
+    '''CREATE TABLE eventos (
+        codigo TEXT NOT NULL,
+        descricao TEXT NOT NULL,
+        tipo TEXT NOT NULL,
+        posicao INTEGER NOT NULL,
+        PRIMARY KEY (codigo, descricao)
+    ) WITHOUT ROWID''',
+    'CREATE INDEX idx_eventos_tipo ON eventos(tipo)',
+    '''CREATE TABLE ordem_eliminacao (
+        descricao TEXT PRIMARY KEY,
+        ordem INTEGER NOT NULL,
+        nome_ordem TEXT NOT NULL,
+        posicao INTEGER NOT NULL
+    ) WITHOUT ROWID''',
+)
+
+def calcular_hash_tabelas(mapeamento, ordem):
+    """SHA-256 do conteúdo das tabelas (na ordem da planilha): muda só quando a classificação muda"""
+    conteudo = json.dumps([[[codigo, descricao, tipo] for (codigo, descricao), tipo in mapeamento.items()],
+                           [[descricao, item['ordem'], item['nome_ordem']] for descricao, item in ordem.items()]],
+                          ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+def ler_mapeamento_eventos(caminho_planilha):
+    """Mapeamento (código, descrição em maiúsculas) → tipo de evento, da sheet 'Composição de Rendimentos'"""
+    df_eventos = pd.read_excel(caminho_planilha, sheet_name='Composição de Rendimentos')
+
+    mapeamento = {}
+    for _, row in df_eventos.iterrows():
+        codigo = str(row['CÓDIGO']).strip()
+        descricao = str(row['DESCRIÇÃO EVENTOS']).strip().upper()
+        tipo = str(row['TIPO']).strip()
+        mapeamento[(codigo, descricao)] = tipo
+
+    return mapeamento
+
+def ler_ordem_eliminacao(caminho_planilha):
+    """
+    Ordem de eliminação da sheet 'Ordem de Eliminação'
+    Retorna dicionário: {descricao_normalizada: {'ordem': 1..5, 'nome_ordem': texto da planilha}}
+    """
+    df_ordem = pd.read_excel(caminho_planilha, sheet_name='Ordem de Eliminação')
+
+    prioridades = {}
+    for _, row in df_ordem.iterrows():
+        descricao = str(row['DESCRIÇÃO EVENTOS']).strip().upper()
+        ordem_texto = str(row['ORDEM']).strip()
+
+        # Extrair número da ordem (1, 2, 3 ou 4)
+        if '1 -' in ordem_texto:
+            ordem_num = 1
+        elif '2 -' in ordem_texto:
+            ordem_num = 2
+        elif '3 -' in ordem_texto:
+            ordem_num = 3
+        elif '4 -' in ordem_texto:
+            ordem_num = 4
+        else:
+            ordem_num = 5  # Fallback para desconhecidos
+
+        prioridades[descricao] = {
+            'ordem': ordem_num,
+            'nome_ordem': ordem_texto
+        }
+
+    return prioridades
+
+class RepositorioClassificacao:
+    """
+    Classificação dos eventos em eventos.db, sincronizada a partir da planilha.
+    mapeamento_eventos()/ordem_eliminacao() carregam as tabelas inteiras (classificação em lote);
+    tipo_evento()/ordem() são consultas pontuais pela chave primária, para processos de longa duração
+    (modo --watch) que não precisam manter as tabelas em memória.
+    """
+
+    def __init__(self, caminho_planilha=CAMINHO_PLANILHA, caminho_db=CAMINHO_EVENTOS_DB):
+        self.caminho_planilha = Path(caminho_planilha)
+        self.caminho_db = Path(caminho_db)
+        self._conn = None
+        self._pid = None
+
+    @property
+    def conexao(self):
+        """Conexão somente leitura, aberta na primeira consulta e reutilizada (uma por processo)"""
+        if self._conn is None or self._pid != os.getpid():
+            # Depois de um fork (--workers) a conexão herdada do processo pai não é reutilizada
+            self._conn = sqlite3.connect(f"{self.caminho_db.resolve().as_uri()}?mode=ro", uri=True,
+                                         check_same_thread=False)
+            self._pid = os.getpid()
+        return self._conn
+
+    def fechar(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    def _metadados(self):
+        """{chave: valor} do banco, ou None se o banco não existe ou não está no esquema atual"""
+        if not self.caminho_db.exists():
+            return None
+        try:
+            metadados = dict(self.conexao.execute('SELECT chave, valor FROM metadados').fetchall())
+        except sqlite3.Error:
+            return None
+        return metadados if metadados.get('versao_esquema') == str(VERSAO_ESQUEMA) else None
+
+    def sincronizar(self, forcar=False):
+        """
+        Recria o banco a partir da planilha se ele não existe, está em outro esquema ou se a planilha
+        é mais nova e tem outro hash. Retorna True se o banco foi recriado. Se a planilha não puder ser
+        lida, o banco existente continua sendo usado.
+        """
+        metadados = self._metadados()
+        if not self.caminho_planilha.exists():
+            if metadados is None:
+                print(f"⚠️  Aviso: Planilha de parâmetros não encontrada: {self.caminho_planilha}")
+                print("   O sistema usará a classificação padrão.")
+            return False
+
+        if metadados is not None and not forcar:
+            mtime_planilha = self.caminho_planilha.stat().st_mtime_ns
+            if mtime_planilha <= self.caminho_db.stat().st_mtime_ns:
+                return False
+            if metadados.get('hash_planilha') == calcular_hash_arquivo(self.caminho_planilha):
+                # Mesmo conteúdo (cópia, checkout, `touch`): só alinha o mtime do banco ao da planilha
+                try:
+                    os.utime(self.caminho_db, ns=(mtime_planilha, mtime_planilha))
+                except OSError:
+                    pass
+                return False
+
+        try:
+            mapeamento = ler_mapeamento_eventos(self.caminho_planilha)
+            ordem = ler_ordem_eliminacao(self.caminho_planilha)
+        except Exception as e:
+            print(f"⚠️  Aviso: Não foi possível ler a planilha de parâmetros: {e}")
+            if metadados is None:
+                print("   O sistema usará a classificação padrão.")
+            else:
+                print("   Usando a classificação já gravada em eventos.db.")
+            return False
+
+        self._gravar(mapeamento, ordem, calcular_hash_arquivo(self.caminho_planilha))
+        return True
+
+    def _gravar(self, mapeamento, ordem, hash_planilha):
+        """Recria as tabelas em uma única transação (leitores concorrentes veem o banco antigo ou o novo)"""
+        self.caminho_db.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.caminho_db, timeout=60, isolation_level=None)
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            tabelas = [nome for nome, tipo in conn.execute("SELECT name, type FROM sqlite_master") if tipo == 'table']
+            for nome in tabelas:
+                conn.execute(f'DROP TABLE "{nome}"')
+            for comando in ESQUEMA:
+                conn.execute(comando)
+            conn.executemany('INSERT INTO eventos (codigo, descricao, tipo, posicao) VALUES (?, ?, ?, ?)',
+                             [(codigo, descricao, tipo, posicao)
+                              for posicao, ((codigo, descricao), tipo) in enumerate(mapeamento.items())])
+            conn.executemany('INSERT INTO ordem_eliminacao (descricao, ordem, nome_ordem, posicao) VALUES (?, ?, ?, ?)',
+                             [(descricao, item['ordem'], item['nome_ordem'], posicao)
+                              for posicao, (descricao, item) in enumerate(ordem.items())])
+            conn.executemany('INSERT INTO metadados (chave, valor) VALUES (?, ?)',
+                             [('versao_esquema', str(VERSAO_ESQUEMA)), ('hash_planilha', hash_planilha),
+                              ('hash_tabelas', calcular_hash_tabelas(mapeamento, ordem))])
+            conn.execute('COMMIT')
+            conn.execute('VACUUM')  # devolve as páginas das tabelas antigas (o banco fica pequeno no repositório)
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def hash_tabelas(self):
+        """Hash do conteúdo das tabelas gravadas (registrado com os resultados), ou None sem banco"""
+        metadados = self._metadados()
+        return metadados.get('hash_tabelas') if metadados else None
+
+    def _consultar(self, sql, parametros=()):
+        """Linhas da consulta, ou nenhuma se o banco ainda não existe/não está no esquema atual"""
+        try:
+            return self.conexao.execute(sql, parametros).fetchall()
+        except sqlite3.Error:
+            return []
+
+    def mapeamento_eventos(self):
+        """{(código, descrição): tipo}, na ordem da planilha"""
+        linhas = self._consultar('SELECT codigo, descricao, tipo FROM eventos ORDER BY posicao')
+        return {(codigo, descricao): tipo for codigo, descricao, tipo in linhas}
+
+    def ordem_eliminacao(self):
+        """{descrição: {'ordem': n, 'nome_ordem': texto}}, na ordem da planilha"""
+        linhas = self._consultar('SELECT descricao, ordem, nome_ordem FROM ordem_eliminacao ORDER BY posicao')
+        return {descricao: {'ordem': ordem, 'nome_ordem': nome_ordem} for descricao, ordem, nome_ordem in linhas}
+
+    def tipo_evento(self, codigo, descricao):
+        """Tipo do evento (código, descrição), ou None se não está classificado"""
+        linhas = self._consultar('SELECT tipo FROM eventos WHERE codigo = ? AND descricao = ?',
+                                 (str(codigo).strip(), descricao.strip().upper()))
+        return linhas[0][0] if linhas else None
+
+    def ordem(self, descricao):
+        """{'ordem': n, 'nome_ordem': texto} do desconto, ou None se não consta da ordem de eliminação"""
+        linhas = self._consultar('SELECT ordem, nome_ordem FROM ordem_eliminacao WHERE descricao = ?',
+                                 (descricao.strip().upper(),))
+        return {'ordem': linhas[0][0], 'nome_ordem': linhas[0][1]} if linhas else None
@@ -0,0 +1,131 @@
+"""
+Armazenamento em disco dos holerites processados, registro a registro
+A memória do processamento fica limitada aos agregados: os holerites são gravados
+em um arquivo temporário (JSON Lines) e relidos sob demanda pelos geradores de saída
+"""
+
+import json
+import os
+import tempfile
+import weakref
+
+def escrever_json_indentado(registros, destino):
+    """
+    Escreve os registros como array JSON, no mesmo formato de
+    json.dump(lista, destino, ensure_ascii=False, indent=2), sem montar a lista em memória
+    """
+    vazio = True
+    for dados in registros:
+        destino.write('[\n  ' if vazio else ',\n  ')
+        # Strings JSON nunca contêm quebra de linha literal, então basta indentar cada linha
+        destino.write(json.dumps(dados, ensure_ascii=False, indent=2).replace('\n', '\n  '))
+        vazio = False
+    destino.write('[]' if vazio else '\n]')
+
+def ler_json_array(caminho, tamanho_bloco=1024 * 1024):
+    """
+    Gera os objetos de um array JSON gravado em arquivo (ex.: resultado.json), um por vez,
+    lendo o arquivo em blocos em vez de carregá-lo inteiro com json.load
+    """
+    decodificador = json.JSONDecoder()
+    with open(caminho, encoding='utf-8') as arquivo:
+        buffer = ''
+        posicao = 0
+        inicio_array = True
+        
+        while True:
+            # Pular espaços e separadores até o próximo elemento
+            while posicao < len(buffer) and buffer[posicao] in ' \t\r\n,':
+                posicao += 1
+            
+            if posicao < len(buffer):
+                if inicio_array:
+                    if buffer[posicao] != '[':
+                        raise ValueError(f"{caminho} não contém um array JSON")
+                    posicao += 1
+                    inicio_array = False
+                    continue
+                if buffer[posicao] == ']':
+                    return
+                try:
+                    elemento, fim = decodificador.raw_decode(buffer, posicao)
+                except json.JSONDecodeError:
+                    fim = None  # elemento incompleto: ler mais um bloco
+                if fim is not None:
+                    posicao = fim
+                    yield elemento
+                    continue
+            
+            bloco = arquivo.read(tamanho_bloco)
+            if not bloco:
+                raise ValueError(f"{caminho} terminou antes do fim do array JSON")
+            buffer = buffer[posicao:] + bloco
+            posicao = 0
+
+class RegistrosProcessados:
+    """
+    Sequência de holerites gravada em disco à medida que é produzida.
+    Pode ser percorrida várias vezes (cada iteração relê o arquivo) e informa len().
+    formatar converte cada registro gravado para o formato das saídas (resultado.json e HTML),
+    ex.: valores em centavos → reais; sem ele, os registros são escritos como foram gravados.
+    """
+
+    def __init__(self, pasta=None, formatar=None):
+        descritor, self.caminho = tempfile.mkstemp(prefix='holerites_', suffix='.jsonl', dir=pasta)
+        self._arquivo = os.fdopen(descritor, 'w', encoding='utf-8')
+        self._quantidade = 0
+        self.formatar = formatar
+        # Garante a remoção do arquivo temporário mesmo se a execução for interrompida
+        self._finalizador = weakref.finalize(self, RegistrosProcessados._remover, self._arquivo, self.caminho)
+
+    @staticmethod
+    def _remover(arquivo, caminho):
+        arquivo.close()
+        if os.path.exists(caminho):
+            os.remove(caminho)
+
+    def adicionar(self, dados):
+        """Grava um holerite (uma linha JSON compacta)"""
+        self._arquivo.write(json.dumps(dados, ensure_ascii=False))
+        self._arquivo.write('\n')
+        self._quantidade += 1
+
+    def __len__(self):
+        return self._quantidade
+
+    def _linhas(self):
+        self._arquivo.flush()
+        with open(self.caminho, encoding='utf-8') as arquivo:
+            for linha in arquivo:
+                yield linha.rstrip('\n')
+
+    def __iter__(self):
+        for linha in self._linhas():
+            yield json.loads(linha)
+
+    def escrever_json_compacto(self, destino):
+        """Escreve os registros como array JSON compacto (mesmo formato de json.dumps(lista))"""
+        destino.write('[')
+        for i, linha in enumerate(self._linhas()):
+            if i:
+                destino.write(', ')
+            if self.formatar is not None:
+                linha = json.dumps(self.formatar(json.loads(linha)), ensure_ascii=False)
+            destino.write(linha)
+        destino.write(']')
+
+    def salvar_json(self, caminho_destino):
+        """Grava os registros em caminho_destino no formato indentado de resultado.json"""
+        registros = self if self.formatar is None else map(self.formatar, self)
+        with open(caminho_destino, 'w', encoding='utf-8') as f:
+            escrever_json_indentado(registros, f)
+
+    def fechar(self):
+        """Remove o arquivo temporário"""
+        self._finalizador()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
@@ -0,0 +1,153 @@
+"""
+Tabela fato dos eventos dos holerites, em colunas (NumPy)
+Montada à medida que os holerites são lidos: cada evento vira uma linha com
+holerite_id, codigo_id, descricao_id, tipo, valor_centavos, base_centavos e referencia.
+Códigos e descrições continuam textos (como na planilha), codificados em dicionário.
+Totais, contagens e percentis por código, e a detecção de casos especiais por descrição,
+viram operações vetorizadas em vez de laços sobre as listas de eventos de cada holerite
+"""
+
+from array import array
+
+import numpy as np
+
+# Código do tipo de evento = posição da lista correspondente no holerite
+TIPOS_EVENTO = ('proventos', 'descontos_obrigatorios', 'descontos_extras', 'eventos_informativos')
+
+COLUNAS = (
+    ('holerite_id', 'q', np.int64),
+    ('codigo_id', 'i', np.int32),
+    ('descricao_id', 'i', np.int32),
+    ('tipo', 'b', np.int8),
+    ('valor_centavos', 'q', np.int64),
+    ('base_centavos', 'q', np.int64),
+    ('referencia', 'd', np.float64),
+)
+
+def chave_codigo(codigo):
+    """Ordenação dos códigos: numéricos pelo valor (desempate pelo texto), depois os não numéricos"""
+    return (0, int(codigo), codigo) if codigo.isdigit() else (1, 0, codigo)
+
+class TabelaEventos:
+    """
+    Colunas acumuladas em array.array (compactas durante a leitura) e expostas como arrays NumPy.
+    Códigos e descrições são codificados em dicionário: codigos[codigo_id] é o código do evento
+    (texto, como na planilha) e descricoes[descricao_id] o texto do evento.
+    """
+
+    def __init__(self):
+        self.codigos = []
+        self._ids_codigo = {}
+        self.descricoes = []
+        self._ids_descricao = {}
+        self.quantidade_holerites = 0
+        self._dados = {nome: array(codigo_array) for nome, codigo_array, _ in COLUNAS}
+        self._colunas = None
+
+    def __len__(self):
+        return len(self._dados['holerite_id'])
+
+    def codigo_id(self, codigo):
+        """Identificador do código no dicionário (cadastrado na primeira ocorrência)"""
+        identificador = self._ids_codigo.get(codigo)
+        if identificador is None:
+            identificador = self._ids_codigo[codigo] = len(self.codigos)
+            self.codigos.append(codigo)
+        return identificador
+
+    def descricao_id(self, descricao):
+        """Identificador da descrição no dicionário (cadastrada na primeira ocorrência)"""
+        identificador = self._ids_descricao.get(descricao)
+        if identificador is None:
+            identificador = self._ids_descricao[descricao] = len(self.descricoes)
+            self.descricoes.append(descricao)
+        return identificador
+
+    def adicionar(self, holerite):
+        """Acrescenta os eventos de um holerite (na ordem de leitura) e retorna o holerite_id"""
+        holerite_id = self.quantidade_holerites
+        self.quantidade_holerites += 1
+        self._colunas = None
+        dados = self._dados
+        for tipo, lista in enumerate(TIPOS_EVENTO):
+            for evento in holerite.get(lista, ()):
+                dados['holerite_id'].append(holerite_id)
+                dados['codigo_id'].append(self.codigo_id(evento['codigo']))
+                dados['descricao_id'].append(self.descricao_id(evento['descricao']))
+                dados['tipo'].append(tipo)
+                dados['valor_centavos'].append(evento['valor_centavos'])
+                dados['base_centavos'].append(evento['base_centavos'])
+                dados['referencia'].append(evento['referencia'])
+        return holerite_id
+
+    @classmethod
+    def de_holerites(cls, holerites):
+        tabela = cls()
+        for holerite in holerites:
+            tabela.adicionar(holerite)
+        return tabela
+
+    def colunas(self):
+        """Colunas como arrays NumPy (copiadas: os array.array continuam livres para crescer)"""
+        if self._colunas is None:
+            self._colunas = {nome: np.frombuffer(self._dados[nome], dtype=tipo_numpy).copy() if len(self._dados[nome])
+                             else np.zeros(0, dtype=tipo_numpy)
+                             for nome, _, tipo_numpy in COLUNAS}
+        return self._colunas
+
+    def _filtro_tipos(self, tipos):
+        tipo = self.colunas()['tipo']
+        if tipos is None:
+            return np.ones(len(tipo), dtype=bool)
+        return np.isin(tipo, [TIPOS_EVENTO.index(nome) for nome in tipos])
+
+    def resumo_por_codigo(self, tipos=None, percentis=()):
+        """
+        Agrupa os eventos (dos tipos indicados, ou todos) por código.
+        Retorna um dict de arrays alinhados: codigo (texto), quantidade, total_centavos e,
+        para cada p em percentis, 'p<p>' com o percentil do valor em centavos.
+        Os códigos vêm na ordem de chave_codigo (numérica; os não numéricos no final).
+        """
+        colunas = self.colunas()
+        filtro = self._filtro_tipos(tipos)
+        # Posição de cada codigo_id na ordem dos códigos
+        ordem_codigos = sorted(range(len(self.codigos)), key=lambda i: chave_codigo(self.codigos[i]))
+        posicao_codigo = np.zeros(len(self.codigos), dtype=np.int64)
+        posicao_codigo[ordem_codigos] = np.arange(len(self.codigos))
+        codigo = posicao_codigo[colunas['codigo_id'][filtro]]
+        valor = colunas['valor_centavos'][filtro]
+
+        ordem = np.lexsort((valor, codigo))
+        codigo, valor = codigo[ordem], valor[ordem]
+        posicoes, inicios, quantidades = np.unique(codigo, return_index=True, return_counts=True)
+
+        resumo = {
+            'codigo': np.array([self.codigos[ordem_codigos[i]] for i in posicoes], dtype=object),
+            'quantidade': quantidades,
+            'total_centavos': np.add.reduceat(valor, inicios) if len(valor) else np.zeros(0, dtype=np.int64),
+        }
+        for p in percentis:
+            # Interpolação linear dentro de cada grupo (valores já ordenados), como np.percentile
+            posicao = inicios + (quantidades - 1) * (p / 100)
+            abaixo = np.floor(posicao).astype(np.int64)
+            acima = np.minimum(abaixo + 1, inicios + quantidades - 1)
+            fracao = posicao - abaixo
+            resumo[f'p{p:g}'] = valor[abaixo] + (valor[acima] - valor[abaixo]) * fracao
+        return resumo
+
+    def holerites_com(self, condicao, tipos=None, codigo=None):
+        """
+        Vetor booleano por holerite_id: o holerite tem algum evento (dos tipos indicados e, se
+        informado, do código indicado, em texto: codigo='1') cuja descrição em maiúsculas satisfaz condicao(descricao).
+        A condição é avaliada uma única vez por descrição distinta.
+        """
+        colunas = self.colunas()
+        descricoes_validas = np.fromiter((bool(condicao(descricao.upper())) for descricao in self.descricoes),
+                                         dtype=bool, count=len(self.descricoes))
+        filtro = self._filtro_tipos(tipos) & descricoes_validas[colunas['descricao_id']]
+        if codigo is not None:
+            filtro &= colunas['codigo_id'] == self._ids_codigo.get(codigo, -1)
+
+        resultado = np.zeros(self.quantidade_holerites, dtype=bool)
+        resultado[colunas['holerite_id'][filtro]] = True
+        return resultado
@@ -0,0 +1,93 @@
+"""
+Testes da agregação do relatório em uma única passagem pelos holerites
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from agregacao import AgregacaoRelatorio, faixa_etaria
+from tabela_eventos import TabelaEventos
+from holerite import Holerite
+
+def evento(codigo, descricao, valor):
+    return {'descricao': descricao, 'valor': valor, 'base_calculo': valor, 'referencia': 0.0, 'codigo': codigo}
+
+def holerite(nome, situacao='Ativo', idade=40, proventos=(), obrigatorios=(), extras=(), informativos=(), liquido=None,
+             competencia='Novembro/2025', erro=None):
+    total_proventos = round(sum(e['valor'] for e in proventos), 2)
+    total_obrigatorios = round(sum(e['valor'] for e in obrigatorios), 2)
+    total_extras = round(sum(e['valor'] for e in extras), 2)
+    total_descontos = round(total_obrigatorios + total_extras, 2)
+    return {
+        'nome': nome, 'cpf': f'{nome}-cpf', 'situacao': situacao, 'competencia': competencia, 'idade_anos': idade,
+        'proventos': list(proventos), 'descontos_obrigatorios': list(obrigatorios), 'descontos_extras': list(extras),
+        'eventos_informativos': list(informativos), 'total_proventos': total_proventos,
+        'total_descontos_obrigatorios': total_obrigatorios, 'total_descontos_extras': total_extras,
+        'total_descontos': total_descontos,
+        'liquido': round(total_proventos - total_descontos, 2) if liquido is None else liquido,
+        'arquivo_origem': 'folha.pdf', 'erro_processamento': erro,
+    }
+
+SUBSIDIO = evento('1', 'SUBSIDIO', 1000.0)
+PREVIDENCIA = evento('501', 'CONTRIBUICAO PREVIDENCIARIA', 100.0)
+
+HOLERITES = [
+    # RLM 900, limite 315: 100 → 31,7% do limite (saudável)
+    holerite('ANA', idade=55, proventos=[SUBSIDIO], obrigatorios=[PREVIDENCIA], extras=[evento('720', 'EMPRESTIMO', 100.0)]),
+    # 400 → 127% do limite (crítico), com rescisão
+    holerite('BETO', situacao='Aposentado', idade=72, proventos=[SUBSIDIO, evento('613', '13 SALARIO RESCISAO', 0.01)],
+             obrigatorios=[PREVIDENCIA], extras=[evento('720', 'EMPRESTIMO', 399.99)]),
+    # Sem descontos facultativos, líquido diferente da RLM (atípico)
+    holerite('CARLA', idade=61, proventos=[SUBSIDIO], obrigatorios=[PREVIDENCIA], liquido=850.0),
+    # Cedido: representação sem subsídio, margem zero (não é atípico por ser cedido)
+    holerite('DANI', proventos=[], informativos=[evento('59', 'REPRESENTACAO CONF LC 04/90 - ART. 59', 800.0)]),
+    # Registro de erro de extração
+    holerite('', situacao='', competencia='', erro='falha'),
+]
+
+class TestAgregacaoRelatorio(unittest.TestCase):
+    """Testes para os totais, a análise cruzada e os alertas acumulados em uma passagem"""
+
+    def setUp(self):
+        holerites = [Holerite.from_dict(dados) for dados in HOLERITES]
+        self.agregacao = AgregacaoRelatorio.de_holerites(holerites)
+        self.agregacao.finalizar(TabelaEventos.de_holerites(holerites))
+
+    def test_estatisticas(self):
+        """Contagens do processamento e totais exatos em centavos"""
+        stats = self.agregacao.estatisticas
+        self.assertEqual(len(self.agregacao), 5)
+        self.assertEqual((stats['com_sucesso'], stats['sem_dados'], stats['com_erro']), (4, 0, 1))
+        self.assertEqual(stats['total_proventos'], 300001)
+        self.assertEqual(stats['total_descontos_extras'], 49999)
+        self.assertEqual(self.agregacao.competencia, 'Novembro/2025')
+
+    def test_situacao_faixa_etaria(self):
+        """Quantidade e proventos por situação, e por faixa etária a partir dos 50 anos"""
+        self.assertEqual(faixa_etaria(49), 'Não identificado')
+        self.assertEqual(faixa_etaria(90), '90+ anos')
+        ativos = self.agregacao.situacoes_faixas['Ativo']
+        self.assertEqual((ativos['total_qtd'], ativos['total_proventos']), (3, 200000))
+        self.assertEqual(ativos['faixas']['50-59 anos'], {'qtd': 1, 'total_proventos': 100000})
+        self.assertEqual(ativos['faixas']['60-69 anos']['qtd'], 1)
+        self.assertEqual(self.agregacao.situacoes_faixas['Aposentado']['faixas']['70-79 anos']['qtd'], 1)
+        self.assertEqual(self.agregacao.situacoes_faixas['']['total_qtd'], 1)
+
+    def test_saude_e_alertas(self):
+        """Classificação pelo percentual do limite de 35% da RLM e listas de alertas em ordem de leitura"""
+        self.assertEqual(self.agregacao.saude, {'saudavel': 1, 'atencao': 0, 'risco': 0, 'critico': 1, 'sem_descontos': 3})
+        critico, = self.agregacao.beneficiarios_criticos
+        self.assertEqual((critico['nome'], critico['rescisao'], critico['margem_consignavel']), ('BETO', 'Sim', 900.01))
+        self.assertAlmostEqual(critico['percentual'], 39999 / (90001 * 0.35) * 100)
+        self.assertEqual(self.agregacao.beneficiarios_rescisao, [{'nome': 'BETO', 'cpf': 'BETO-cpf', 'tem_desconto_facultativo': 'Sim'}])
+        self.assertEqual([s['nome'] for s in self.agregacao.servidores_cedidos], ['DANI'])
+        self.assertEqual([(c['nome'], c['motivo']) for c in self.agregacao.casos_atipicos],
+                         [('CARLA', 'Diferença entre RLM e Líquido: R$ 50.00'), ('', 'Margem negativa ou zero')])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+"""
+Testes do cache de texto das páginas dos holerites
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from cache_paginas import CachePaginas, calcular_hash_arquivo
+
+class TestCachePaginas(unittest.TestCase):
+    """Testes para o cache de páginas (hash do conteúdo + número da página)"""
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.cache = CachePaginas(Path(self.pasta.name) / 'paginas.db')
+
+    def tearDown(self):
+        self.cache.fechar()
+        self.pasta.cleanup()
+
+    def test_salvar_e_obter(self):
+        """Textos gravados voltam idênticos e contam como acertos"""
+        self.cache.salvar_textos('abc', 3, {0: 'Competência: Novembro/2025', 2: 'Página em branco'})
+
+        self.assertEqual(self.cache.num_paginas('abc'), 3)
+        self.assertEqual(self.cache.obter_textos('abc', 0, 3), {0: 'Competência: Novembro/2025', 2: 'Página em branco'})
+        self.assertEqual(self.cache.obter_textos('abc', 1, 2), {})
+        self.assertEqual(self.cache.acertos, 2)
+
+    def test_arquivo_desconhecido(self):
+        """PDF nunca lido não tem número de páginas no cache"""
+        self.assertIsNone(self.cache.num_paginas('inexistente'))
+
+    def test_hash_pelo_conteudo(self):
+        """O hash depende do conteúdo, não do nome do arquivo"""
+        pasta = Path(self.pasta.name)
+        (pasta / 'a.pdf').write_bytes(b'%PDF-1.4 conteudo')
+        (pasta / 'b.pdf').write_bytes(b'%PDF-1.4 conteudo')
+        (pasta / 'c.pdf').write_bytes(b'%PDF-1.4 outro conteudo')
+
+        self.assertEqual(calcular_hash_arquivo(pasta / 'a.pdf'), calcular_hash_arquivo(pasta / 'b.pdf'))
+        self.assertNotEqual(calcular_hash_arquivo(pasta / 'a.pdf'), calcular_hash_arquivo(pasta / 'c.pdf'))
+
+if __name__ == '__main__':
+    unittest.main()
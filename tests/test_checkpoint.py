@@ -0,0 +1,139 @@
+"""
+Testes do checkpoint de leitura dos PDFs (--resume)
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import unittest.mock
+import sys
+import tempfile
+from pathlib import Path
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from checkpoint import Checkpoint, ultima_pagina
+import gerar_relatorio
+from gerar_relatorio import consolidar_paginas, dados_com_erro, ler_holerites_com_checkpoint, PAGINAS_COM_ERRO, PRE_CLASSIFICACAO
+from holerite import Holerite
+
+def pagina(cpf, numero_pagina):
+    """Página de holerite com um único provento"""
+    return Holerite.from_dict({
+        'nome': f'SERVIDOR {cpf}', 'cpf': cpf, 'matricula': '',
+        'proventos': [{'descricao': 'SUBSIDIO', 'valor': 100.0, 'base_calculo': 100.0, 'referencia': 30.0, 'codigo': '1'}],
+        'descontos_obrigatorios': [], 'descontos_extras': [], 'total_proventos': 100.0, 'total_descontos_obrigatorios': 0,
+        'total_descontos_extras': 0, 'total_descontos': 0, 'liquido': 100.0,
+        'arquivo_origem': f'a.pdf (pág. {numero_pagina + 1})', 'erro_processamento': None,
+    })
+
+class TestCheckpoint(unittest.TestCase):
+    """Testes para a gravação do checkpoint e o cálculo do cursor de retomada"""
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.raiz = Path(self.pasta.name)
+        self.pdfs = [self.raiz / 'a.pdf', self.raiz / 'b.pdf']
+        for caminho_pdf in self.pdfs:
+            caminho_pdf.write_bytes(b'%PDF-1.4 ' + caminho_pdf.name.encode())
+        self.caminho = self.raiz / 'checkpoint.jsonl'
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def test_ultima_pagina(self):
+        """A retomada continua após a última página do holerite (1 ou 2 páginas)"""
+        self.assertEqual(ultima_pagina({'arquivo_origem': 'a.pdf (pág. 7)'}), 7)
+        self.assertEqual(ultima_pagina({'arquivo_origem': 'a.pdf (pág. 7-8)'}), 8)
+
+    def test_cursor_e_linha_truncada(self):
+        """O cursor vem do último holerite completo; uma linha truncada é descartada"""
+        checkpoint = Checkpoint(self.caminho, self.pdfs, 'p1', intervalo=1)
+        checkpoint.abrir()
+        checkpoint.gravar({'cpf': '1', 'arquivo_origem': 'a.pdf (pág. 1-2)'})
+        checkpoint.gravar({'cpf': '2', 'arquivo_origem': 'b.pdf (pág. 3)'})
+        checkpoint.fechar()
+        with open(self.caminho, 'a', encoding='utf-8') as f:
+            f.write('{"cpf": "3", "arquivo_or')
+
+        retomada = Checkpoint(self.caminho, self.pdfs, 'p1')
+        self.assertTrue(retomada.compativel())
+        self.assertEqual(retomada.cursor(), (1, 3))
+        self.assertEqual(retomada.quantidade, 2)
+
+        retomada.abrir(retomar=True)
+        retomada.gravar({'cpf': '4', 'arquivo_origem': 'b.pdf (pág. 4)'})
+        retomada.fechar()
+        self.assertEqual([d['cpf'] for d in retomada.registros()], ['1', '2', '4'])
+
+    def test_incompativel(self):
+        """Checkpoint de outros PDFs ou de outra planilha de parâmetros não é retomado"""
+        checkpoint = Checkpoint(self.caminho, self.pdfs, 'p1')
+        checkpoint.abrir()
+        checkpoint.fechar()
+
+        self.assertFalse(Checkpoint(self.caminho, self.pdfs, 'p2').compativel())
+        self.assertFalse(Checkpoint(self.caminho, self.pdfs[:1], 'p1').compativel())
+        self.pdfs[1].write_bytes(b'%PDF-1.4 alterado')
+        self.assertFalse(Checkpoint(self.caminho, self.pdfs, 'p1').compativel())
+
+    def test_retomada_com_pagina_com_erro(self):
+        """Páginas com erro e descartadas antes da interrupção entram no resultado retomado uma única vez"""
+        caminho_pdf = self.pdfs[0]
+        # pág. 1: A; pág. 2: erro; pág. 3: descartada; pág. 4: B; pág. 5: descartada; pág. 6: C
+        paginas = [pagina('1', 0), dados_com_erro(caminho_pdf, 1, 'limite excedido'), None, pagina('2', 3), None,
+                   pagina('3', 5)]
+
+        def ler_holerites(caminhos_pdf, workers, paginas_por_tarefa, cache, pagina_inicial, *args):
+            return consolidar_paginas(((numero, paginas[numero]) for numero in range(pagina_inicial, len(paginas))), 'a.pdf')
+
+        def executar(retomar, interromper_apos=None):
+            PAGINAS_COM_ERRO.clear()
+            PRE_CLASSIFICACAO['paginas_descartadas'] = 0
+            checkpoint = Checkpoint(self.caminho, [caminho_pdf], 'p1', intervalo=1)
+            holerites = []
+            with unittest.mock.patch.object(gerar_relatorio, 'ler_holerites', ler_holerites), \
+                    unittest.mock.patch('builtins.print'):
+                leitura = ler_holerites_com_checkpoint(checkpoint, [caminho_pdf], retomar)
+                for dados in leitura:
+                    holerites.append(dados['arquivo_origem'])
+                    if len(holerites) == interromper_apos:
+                        leitura.close()
+                        break
+            return holerites, [dados['arquivo_origem'] for dados in PAGINAS_COM_ERRO], PRE_CLASSIFICACAO['paginas_descartadas']
+
+        completo = executar(retomar=False)
+        self.assertEqual(completo, (['a.pdf (pág. 1)', 'a.pdf (pág. 4)', 'a.pdf (pág. 6)'], ['a.pdf (pág. 2)'], 2))
+
+        # Interrompida depois de B: a pág. 5 (descartada) é lida de novo na retomada
+        executar(retomar=False, interromper_apos=2)
+        self.assertEqual(executar(retomar=True), completo)
+        PAGINAS_COM_ERRO.clear()
+        PRE_CLASSIFICACAO['paginas_descartadas'] = 0
+
+    def test_paginas_sem_holerite_seguinte(self):
+        """Páginas gravadas sem o holerite seguinte não valem e são descartadas ao retomar a gravação"""
+        checkpoint = Checkpoint(self.caminho, self.pdfs, 'p1', intervalo=1)
+        checkpoint.abrir()
+        checkpoint.gravar({'cpf': '1', 'arquivo_origem': 'a.pdf (pág. 1)'}, [{'arquivo_origem': 'a.pdf (pág. 0)'}], 1)
+        checkpoint.fechar()
+        with open(self.caminho, 'a', encoding='utf-8') as f:
+            f.write('{"_paginas": {"com_erro": [], "descartadas": 5}}\n{"cpf": "2", "arq')
+
+        retomada = Checkpoint(self.caminho, self.pdfs, 'p1')
+        self.assertEqual(retomada.paginas(), ([{'arquivo_origem': 'a.pdf (pág. 0)'}], 1))
+        retomada.abrir(retomar=True)
+        retomada.gravar({'cpf': '3', 'arquivo_origem': 'a.pdf (pág. 3)'}, paginas_descartadas=1)
+        retomada.fechar()
+        self.assertEqual([d['cpf'] for d in retomada.registros()], ['1', '3'])
+        self.assertEqual(retomada.paginas(), ([{'arquivo_origem': 'a.pdf (pág. 0)'}], 2))
+
+    def test_remover(self):
+        """Após uma execução concluída o checkpoint é removido"""
+        checkpoint = Checkpoint(self.caminho, self.pdfs)
+        checkpoint.abrir()
+        checkpoint.remover()
+        self.assertFalse(self.caminho.exists())
+
+if __name__ == '__main__':
+    unittest.main()
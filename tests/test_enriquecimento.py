@@ -0,0 +1,62 @@
+"""
+Testes do enriquecimento em lote (idade e tempo de serviço)
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import sys
+from datetime import date
+from pathlib import Path
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from enriquecimento import data_referencia_competencia, enriquecer_datas, em_lotes
+from holerite import Holerite
+
+class TestEnriquecimento(unittest.TestCase):
+    """Testes para o cálculo de idade e tempo de serviço na data da competência"""
+
+    def test_data_referencia(self):
+        """Último dia do mês da competência"""
+        self.assertEqual(data_referencia_competencia('2025-11'), date(2025, 11, 30))
+        self.assertEqual(data_referencia_competencia('2024-02'), date(2024, 2, 29))
+        self.assertIsNone(data_referencia_competencia('novembro'))
+        self.assertIsNone(data_referencia_competencia('2025-13'))
+        self.assertIsNone(data_referencia_competencia(None))
+
+    def test_anos_completos(self):
+        """Aniversário até a data de referência conta; depois dela, não"""
+        holerites = [
+            Holerite(data_nascimento='30/11/1980', data_admissao='01/02/2019'),
+            Holerite(data_nascimento='01/12/1980', data_admissao='30/11/2024'),
+            Holerite(data_nascimento='29/02/2000', data_admissao=''),
+        ]
+        enriquecer_datas(holerites, date(2025, 11, 30))
+        self.assertEqual([h['idade_anos'] for h in holerites], [45, 44, 25])
+        self.assertEqual([h['tempo_servico_anos'] for h in holerites], [6, 1, None])
+        self.assertEqual(holerites[0]['idade'], '45 anos')
+
+    def test_datas_ausentes_ou_invalidas(self):
+        """Sem data (registro de erro) ou com data inválida: None e idade vazia"""
+        holerites = [Holerite(nome='ERRO'), {'data_nascimento': '31/02/1980', 'data_admissao': 'N/A'}]
+        enriquecer_datas(holerites, date(2025, 11, 30))
+        for dados in holerites:
+            self.assertIsNone(dados['idade_anos'])
+            self.assertIsNone(dados['tempo_servico_anos'])
+            self.assertEqual(dados['idade'], '')
+
+    def test_tipos_nativos(self):
+        """Inteiros do Python (serializáveis no resultado.json), não tipos do pandas"""
+        dados = {'data_nascimento': '15/03/1980', 'data_admissao': '01/02/2019'}
+        enriquecer_datas([dados], date(2025, 11, 30))
+        self.assertIs(type(dados['idade_anos']), int)
+        self.assertIs(type(dados['tempo_servico_anos']), int)
+
+    def test_em_lotes(self):
+        """Lotes na ordem original, o último possivelmente menor"""
+        self.assertEqual(list(em_lotes(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(em_lotes([], 2)), [])
+
+if __name__ == '__main__':
+    unittest.main()
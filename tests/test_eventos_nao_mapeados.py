@@ -0,0 +1,67 @@
+"""
+Testes do coletor de eventos não classificados (ocorrências, valor e exemplos)
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import sys
+import pickle
+from pathlib import Path
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from eventos_nao_mapeados import EventosNaoMapeados
+
+def holerite(nome, cpf, arquivo):
+    return {'nome': nome, 'cpf': cpf, 'arquivo_origem': arquivo}
+
+def evento(codigo, descricao, valor_centavos):
+    return {'codigo': codigo, 'descricao': descricao, 'valor_centavos': valor_centavos}
+
+# (holerite, eventos não classificados) na ordem de leitura
+REGISTROS = [
+    (holerite('ANA', '111.111.111-11', 'a.pdf (pág. 1)'), [evento('9001', 'Gratificacao Nova', 10010), evento('9002', 'AUXILIO X', 50)]),
+    (holerite('BETO', '222.222.222-22', 'a.pdf (pág. 2)'), [evento('9001', 'GRATIFICACAO NOVA', 20020)]),
+    (holerite('CARLA', '333.333.333-33', 'b.pdf (pág. 1)'), [evento('9002', 'AUXILIO X', 50), evento('9002', 'AUXILIO X', 50)]),
+    (holerite('DANI', '444.444.444-44', 'b.pdf (pág. 2)'), [evento('9001', 'GRATIFICACAO NOVA', 1)]),
+]
+
+class TestEventosNaoMapeados(unittest.TestCase):
+    """Testes para a contagem, a ordenação por impacto e a união entre processos"""
+
+    def coletar(self, registros, maximo_exemplos=2):
+        coletor = EventosNaoMapeados(maximo_exemplos)
+        for dados, eventos in registros:
+            coletor.registrar(dados, eventos)
+        return coletor
+
+    def test_contagem_e_impacto(self):
+        """Mesma descrição em maiúsculas é o mesmo evento; o de maior valor total vem primeiro"""
+        coletor = self.coletar(REGISTROS)
+        self.assertEqual(len(coletor), 2)
+        self.assertIn(('9001', 'GRATIFICACAO NOVA'), coletor)
+        gratificacao, auxilio = coletor.por_impacto()
+        self.assertEqual((gratificacao.codigo, gratificacao.descricao), ('9001', 'Gratificacao Nova'))
+        self.assertEqual((gratificacao.ocorrencias, gratificacao.holerites, gratificacao.valor_total), (3, 3, 30031))
+        self.assertEqual([cpf for _, cpf, _ in gratificacao.exemplos], ['111.111.111-11', '222.222.222-22'])
+        # Duas ocorrências no mesmo holerite: um holerite afetado, um exemplo
+        self.assertEqual((auxilio.ocorrencias, auxilio.holerites, auxilio.valor_total), (3, 2, 150))
+        self.assertEqual([nome for nome, _, _ in auxilio.exemplos], ['ANA', 'CARLA'])
+
+    def test_uniao_entre_tarefas(self):
+        """Coletores das tarefas (serializados entre processos) unidos em ordem = coleta sequencial"""
+        sequencial = self.coletar(REGISTROS)
+        tarefas = [pickle.loads(pickle.dumps(self.coletar(REGISTROS[inicio:inicio + 2]))) for inicio in (0, 2)]
+        unido = EventosNaoMapeados(2)
+        for coletor in tarefas:
+            unido.mesclar(coletor)
+        self.assertEqual(unido.por_impacto(), sequencial.por_impacto())
+
+    def test_vazio(self):
+        coletor = EventosNaoMapeados()
+        self.assertFalse(coletor)
+        self.assertEqual(coletor.por_impacto(), [])
+
+if __name__ == '__main__':
+    unittest.main()
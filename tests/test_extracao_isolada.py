@@ -0,0 +1,83 @@
+"""
+Testes da extração de páginas em processo isolado (limites de tempo e memória)
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import unittest.mock
+import sys
+import time
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+import PyPDF2
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import extracao_isolada
+from extracao_isolada import ExtratorIsolado, ExtratorPdf, LimitesPagina, LimitePaginaExcedido, abrir_extrator, limites_efetivos
+
+class TestExtracaoIsolada(unittest.TestCase):
+    """Testes para o isolamento da extração de texto por página"""
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.caminho_pdf = Path(self.pasta.name) / 'folha.pdf'
+        escritor = PyPDF2.PdfWriter()
+        for _ in range(3):
+            escritor.add_blank_page(width=595, height=842)
+        with open(self.caminho_pdf, 'wb') as f:
+            escritor.write(f)
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def test_sem_limites_no_proprio_processo(self):
+        """Sem limites a extração não cria processo filho"""
+        with abrir_extrator(self.caminho_pdf, LimitesPagina(0, 0)) as extrator:
+            self.assertIsInstance(extrator, ExtratorPdf)
+            self.assertEqual(extrator.num_paginas, 3)
+            self.assertEqual(extrator.extrair(0), '')
+
+    def test_limite_de_memoria_sem_proc(self):
+        """Sem /proc o limite de memória é desativado com aviso; sem limite de tempo, a extração fica no próprio processo"""
+        with unittest.mock.patch.object(extracao_isolada, 'memoria_residente_mb', return_value=None), \
+                unittest.mock.patch('builtins.print') as aviso:
+            self.assertEqual(limites_efetivos(LimitesPagina(60, 1024)), LimitesPagina(60, 0))
+            self.assertEqual(limites_efetivos(LimitesPagina(0, 1024)), LimitesPagina(0, 0))
+            self.assertEqual(aviso.call_count, 2)
+            self.assertEqual(limites_efetivos(LimitesPagina(0, 0)), LimitesPagina(0, 0))
+            self.assertEqual(aviso.call_count, 2)
+
+    def test_isolado_equivalente(self):
+        """O processo isolado devolve o mesmo texto da extração local"""
+        with abrir_extrator(self.caminho_pdf, LimitesPagina(10, 0)) as extrator:
+            self.assertIsInstance(extrator, ExtratorIsolado)
+            self.assertEqual([extrator.extrair(n) for n in range(3)], ['', '', ''])
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork', 'requer start method fork')
+    def test_pagina_travada(self):
+        """Página que excede o tempo gera LimitePaginaExcedido e as seguintes continuam"""
+        original = ExtratorPdf.extrair
+
+        def extrair_lento(extrator, numero_pagina):
+            if numero_pagina == 1:
+                time.sleep(30)
+            return original(extrator, numero_pagina)
+
+        extracao_isolada.ExtratorPdf.extrair = extrair_lento
+        try:
+            with ExtratorIsolado(self.caminho_pdf, LimitesPagina(0.5, 0)) as extrator:
+                self.assertEqual(extrator.extrair(0), '')
+                inicio = time.monotonic()
+                with self.assertRaises(LimitePaginaExcedido):
+                    extrator.extrair(1)
+                self.assertLess(time.monotonic() - inicio, 5)
+                self.assertEqual(extrator.extrair(2), '')
+        finally:
+            extracao_isolada.ExtratorPdf.extrair = original
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+"""
+Testes dos registros compactos de holerite e de evento
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import pickle
+import sys
+from pathlib import Path
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from holerite import Holerite, Evento
+from gerar_relatorio import dados_com_erro
+
+def holerite_dict():
+    """Holerite no formato do resultado.json"""
+    return {
+        'nome': 'JOSE DA SILVA', 'cpf': '111.111.111-11', 'matricula': '47767',
+        'data_nascimento': '15/03/1980', 'idade': '45 anos', 'situacao': 'Ativo',
+        'competencia': 'Novembro/2025', 'cargo': 'ASSESSOR', 'data_admissao': '01/02/2019',
+        'proventos': [{'descricao': 'SUBSIDIO', 'valor': 1465.4, 'base_calculo': 1465.4, 'referencia': 30.0, 'codigo': '1'}],
+        'descontos_obrigatorios': [], 'descontos_extras': [], 'eventos_informativos': [],
+        'total_proventos': 1465.4, 'total_descontos_obrigatorios': 0, 'total_descontos_extras': 0,
+        'total_descontos': 0, 'liquido': 1465.4, 'arquivo_origem': 'folha.pdf (pág. 1)', 'erro_processamento': None
+    }
+
+class TestHolerite(unittest.TestCase):
+    """Testes para a conversão e o acesso aos campos dos registros"""
+
+    def test_ida_e_volta_sem_perdas(self):
+        """from_dict/to_dict preservam chaves, ordem e valores"""
+        dados = holerite_dict()
+        convertido = Holerite.from_dict(dados).to_dict()
+        self.assertEqual(convertido, dados)
+        self.assertEqual(list(convertido), list(dados))
+
+    def test_campos_ausentes_e_extras(self):
+        """Chaves ausentes continuam ausentes; chaves desconhecidas são preservadas"""
+        erro = dados_com_erro('/tmp/folha.pdf', 2, 'falha')
+        self.assertNotIn('cargo', erro)
+        self.assertNotIn('cargo', erro.to_dict())
+        self.assertEqual(erro.get('cargo', 'N/A'), 'N/A')
+        with self.assertRaises(KeyError):
+            erro['eventos_informativos']
+
+        dados = dict(holerite_dict(), observacao='manual')
+        holerite = Holerite.from_dict(dados)
+        self.assertEqual(holerite['observacao'], 'manual')
+        self.assertEqual(holerite.to_dict(), dados)
+
+    def test_acesso_como_dict(self):
+        """O restante do código continua lendo e alterando campos como em um dict"""
+        holerite = Holerite.from_dict(holerite_dict())
+        holerite['liquido_centavos'] = 1000
+        holerite['proventos'].append(Evento('GRATIFICACAO', 500, 0, 0.0, '2'))
+        self.assertEqual(holerite['liquido_centavos'], 1000)
+        self.assertEqual(holerite['proventos'][1]['descricao'], 'GRATIFICACAO')
+        self.assertEqual(holerite['proventos'][1].get('codigo'), '2')
+        self.assertEqual(holerite, holerite.to_dict())
+
+    def test_registro_em_centavos(self):
+        """Registro gravado em disco: valores em centavos inteiros; em reais só no formato do resultado.json"""
+        holerite = Holerite.from_dict(holerite_dict())
+        registro = holerite.to_registro()
+        self.assertEqual((registro['total_proventos_centavos'], registro['liquido_centavos']), (146540, 146540))
+        self.assertEqual(registro['proventos'][0]['valor_centavos'], 146540)
+        self.assertNotIn('liquido', registro)
+        self.assertEqual(Holerite.from_registro(registro).to_dict(), holerite_dict())
+        with self.assertRaises(KeyError):
+            holerite['liquido']
+
+    def test_strings_internadas(self):
+        """Código, descrição e textos repetidos são compartilhados entre os registros"""
+        a = Holerite.from_dict(holerite_dict())
+        b = Holerite.from_dict(holerite_dict())
+        self.assertIs(a['proventos'][0]['descricao'], b['proventos'][0]['descricao'])
+        self.assertIs(a['cargo'], b['cargo'])
+
+    def test_vazio(self):
+        """Holerite vazio da extração: mesmos campos do construtor por nome, sem passar pelo laço por campo"""
+        campos = dict(nome='', cpf='', matricula='', data_nascimento='', idade='', situacao='Ativo', competencia='',
+                      cargo='', data_admissao='', proventos=[], descontos_obrigatorios=[], descontos_extras=[],
+                      eventos_informativos=[], total_proventos_centavos=0, total_descontos_obrigatorios_centavos=0,
+                      total_descontos_extras_centavos=0, total_descontos_centavos=0, liquido_centavos=0,
+                      arquivo_origem='folha.pdf (pág. 1)', erro_processamento=None)
+        self.assertEqual(Holerite.vazio('Ativo', 'folha.pdf (pág. 1)').to_registro(), Holerite(**campos).to_registro())
+
+    def test_sem_dict_por_instancia(self):
+        """__slots__: nenhum registro carrega um __dict__ próprio"""
+        holerite = Holerite.from_dict(holerite_dict())
+        self.assertFalse(hasattr(holerite, '__dict__'))
+        self.assertFalse(hasattr(holerite['proventos'][0], '__dict__'))
+
+    def test_pickle(self):
+        """Os registros atravessam o pool de processos do modo paralelo"""
+        erro = dados_com_erro('/tmp/folha.pdf', 0, 'falha')
+        for registro in (Holerite.from_dict(holerite_dict()), erro):
+            copia = pickle.loads(pickle.dumps(registro))
+            self.assertEqual(copia.to_dict(), registro.to_dict())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Testes do índice de classificação tolerante a variações de grafia
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from indice_eventos import IndiceClassificacao, normalizar_descricao, trigramas
+
+MAPEAMENTO = {
+    ('1', 'SUBSIDIO'): 'Provento',
+    ('501', 'CONTRIBUIÇÃO PREVIDENCIÁRIA'): 'Desconto Compulsório (obrigatório)',
+    ('720', 'EMPRESTIMO CONSIGNADO BANCO DO BRASIL'): 'Desconto Facultativo (extra)',
+    ('721', 'EMPRESTIMO CONSIGNADO CAIXA'): 'Desconto Facultativo (extra)',
+    ('59', 'REPRESENTACAO CONF LC 04/90 - ART. 59'): 'Omitir do cálculo',
+    # Mesma descrição normalizada com tipos diferentes: não é resolvida automaticamente
+    ('90', 'AUXÍLIO SAÚDE'): 'Provento',
+    ('90', 'AUXILIO SAUDE'): 'Omitir do cálculo',
+}
+
+class TestIndiceClassificacao(unittest.TestCase):
+    """Testes para a busca normalizada e as sugestões por trigramas"""
+
+    def setUp(self):
+        self.indice = IndiceClassificacao(MAPEAMENTO)
+
+    def test_normalizacao(self):
+        self.assertEqual(normalizar_descricao('  Contribuição   previdenciária '), 'CONTRIBUICAO PREVIDENCIARIA')
+        self.assertEqual(trigramas('AB'), {'  A', ' AB', 'AB '})
+
+    def test_variacoes_de_grafia(self):
+        """Acentos e espaços não impedem a classificação; o código precisa ser o mesmo"""
+        self.assertEqual(self.indice.classificar('501', 'CONTRIBUICAO  PREVIDENCIARIA'), 'Desconto Compulsório (obrigatório)')
+        self.assertEqual(self.indice.classificar('1', 'SUBSÍDIO'), 'Provento')
+        self.assertIsNone(self.indice.classificar('502', 'CONTRIBUICAO PREVIDENCIARIA'))
+        self.assertIsNone(self.indice.classificar('90', 'AUXILIO SAUDE'))
+
+    def test_sugestoes(self):
+        """O evento classificado mais parecido, com a similaridade; em empate, o de mesmo código"""
+        sugestao, = self.indice.sugerir('725', 'EMPRESTIMO CONSIGNADO BCO DO BRASIL')
+        self.assertEqual((sugestao.codigo, sugestao.tipo), ('720', 'Desconto Facultativo (extra)'))
+        self.assertGreater(sugestao.similaridade, 0.7)
+
+        sugestoes = self.indice.sugerir('721', 'EMPRESTIMO CONSIGNADO', quantidade=2)
+        self.assertEqual([s.codigo for s in sugestoes], ['721', '720'])
+        self.assertGreater(sugestoes[0].similaridade, sugestoes[1].similaridade)
+
+        self.assertEqual(self.indice.sugerir('9999', 'HORA EXTRA NOTURNA'), [])
+
+    def test_consultas_memorizadas(self):
+        """A mesma consulta repetida (milhares de holerites) é resolvida pelo cache"""
+        primeira = self.indice.sugerir('725', 'EMPRESTIMO CONSIGNADO BCO DO BRASIL', quantidade=3)
+        self.assertEqual(self.indice.sugerir('725', 'EMPRESTIMO CONSIGNADO BCO DO BRASIL', quantidade=3), primeira)
+        self.assertEqual(len(self.indice._sugestoes), 1)
+
+    def test_mapeamento_vazio(self):
+        indice = IndiceClassificacao({})
+        self.assertIsNone(indice.classificar('1', 'SUBSIDIO'))
+        self.assertEqual(indice.sugerir('1', 'SUBSIDIO'), [])
+
+if __name__ == '__main__':
+    unittest.main()
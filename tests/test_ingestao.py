@@ -0,0 +1,225 @@
+"""
+Testes da consolidação de páginas dos holerites (continuações e páginas vazias)
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import gerar_relatorio
+from gerar_relatorio import (consolidar_paginas, pagina_descartavel, extrair_dados_ativos, pagina_vazia, PAGINAS_COM_ERRO,
+                             identificar_layout, extrair_dados_pagina, registrar_layout, registrar_eventos_nao_mapeados)
+from eventos_nao_mapeados import EventosNaoMapeados
+from holerite import Holerite, Evento
+
+def pagina(cpf, nome='SERVIDOR TESTE', valor=100.0):
+    """Cria os dados de uma página com um único provento"""
+    return Holerite.from_dict({
+        'nome': nome if cpf else '',
+        'cpf': cpf,
+        'matricula': '',
+        'proventos': [{'descricao': 'SUBSIDIO', 'valor': valor, 'base_calculo': valor, 'referencia': 30.0, 'codigo': '1'}] if cpf else [],
+        'descontos_obrigatorios': [],
+        'descontos_extras': [],
+        'total_proventos': valor if cpf else 0,
+        'total_descontos_obrigatorios': 0,
+        'total_descontos_extras': 0,
+        'total_descontos': 0,
+        'liquido': valor if cpf else 0,
+        'arquivo_origem': 'folha.pdf',
+        'erro_processamento': None
+    })
+
+class TestConsolidacaoPaginas(unittest.TestCase):
+    """Testes para a junção de páginas em holerites"""
+
+    def test_continuacao_mesmo_cpf(self):
+        """Página seguinte com o mesmo CPF é mesclada na anterior"""
+        paginas = enumerate([pagina('111.111.111-11', valor=100.0), pagina('111.111.111-11', valor=50.0)])
+        holerites = list(consolidar_paginas(paginas, 'folha.pdf'))
+
+        self.assertEqual(len(holerites), 1)
+        self.assertEqual(holerites[0]['total_proventos_centavos'], 15000)
+        self.assertEqual(len(holerites[0]['proventos']), 2)
+        self.assertEqual(holerites[0]['arquivo_origem'], 'folha.pdf (pág. 1-2)')
+
+    def test_continuacao_eventos_nao_mapeados(self):
+        """Evento não mapeado nas duas páginas de um holerite: um holerite afetado, um exemplo"""
+        paginas = [pagina('111.111.111-11', valor=100.0), pagina('111.111.111-11', valor=50.0)]
+        for dados in paginas:
+            dados['proventos'][0]['descricao'], dados['proventos'][0]['codigo'] = 'AUXILIO TESTE', '9216'
+        nao_mapeados = EventosNaoMapeados()
+        holerite, = consolidar_paginas(enumerate(paginas), 'folha.pdf', nao_mapeados)
+
+        evento, = nao_mapeados.por_impacto()
+        self.assertEqual((evento.ocorrencias, evento.holerites, evento.valor_total), (2, 1, 15000))
+        self.assertEqual(evento.exemplos, (('SERVIDOR TESTE', '111.111.111-11', 'folha.pdf'),))
+
+    def test_paginas_vazias_descartadas(self):
+        """Páginas sem nome, CPF e eventos não geram holerite"""
+        paginas = enumerate([pagina(''), pagina('111.111.111-11'), pagina('')])
+        holerites = list(consolidar_paginas(paginas, 'folha.pdf'))
+
+        self.assertEqual([h['cpf'] for h in holerites], ['111.111.111-11'])
+
+    def test_maximo_duas_paginas(self):
+        """A terceira página com o mesmo CPF inicia um novo holerite (regra sequencial)"""
+        paginas = enumerate([pagina('111.111.111-11') for _ in range(3)])
+        holerites = list(consolidar_paginas(paginas, 'folha.pdf'))
+
+        self.assertEqual(len(holerites), 2)
+
+    def test_continuacao_eventos_informativos(self):
+        """
+        Eventos informativos da página de continuação são mantidos, e o líquido (recalculado na mesclagem)
+        fica marcado como calculado; antes só os da primeira página ficavam e o líquido parecia lido do PDF
+        """
+        pagina1, pagina2 = pagina('111.111.111-11', valor=100.0), pagina('111.111.111-11', valor=50.0)
+        informativo = Evento('REPRESENTACAO', 8000, 0, 0.0, '59')
+        pagina1['eventos_informativos'], pagina2['eventos_informativos'] = [], [informativo]
+        holerite, = consolidar_paginas(enumerate([pagina1, pagina2]), 'folha.pdf')
+
+        self.assertEqual(holerite['eventos_informativos'], [informativo])
+        self.assertEqual(holerite['liquido_centavos'], 15000)
+        self.assertTrue(holerite['liquido_calculado'])
+
+    def test_pagina_pre_classificada_interrompe_continuacao(self):
+        """Página descartada pela pré-classificação (None) equivale a uma página vazia"""
+        paginas = enumerate([pagina('111.111.111-11'), None, pagina('111.111.111-11')])
+        holerites = list(consolidar_paginas(paginas, 'folha.pdf'))
+
+        self.assertEqual(len(holerites), 2)
+
+    def test_pagina_com_erro_registrada(self):
+        """Página que não pôde ser extraída não gera holerite, mas fica registrada para o log de erros"""
+        falha = pagina('')
+        falha['erro_processamento'] = 'Tempo limite de 60s excedido na extração do texto'
+        PAGINAS_COM_ERRO.clear()
+        holerites = list(consolidar_paginas(enumerate([pagina('111.111.111-11'), falha]), 'folha.pdf'))
+
+        self.assertEqual(len(holerites), 1)
+        self.assertEqual(PAGINAS_COM_ERRO, [falha])
+        PAGINAS_COM_ERRO.clear()
+
+class TestPreClassificacao(unittest.TestCase):
+    """Testes para o descarte de páginas sem holerite antes da análise completa"""
+
+    def test_paginas_descartaveis(self):
+        """Páginas em branco, de capa ou de encerramento são descartadas e seriam vazias de qualquer forma"""
+        for texto in ('', 'Página em branco\n', 'ASSEMBLEIA LEGISLATIVA\nFolha de Pagamento - Novembro/2025\n'):
+            self.assertTrue(pagina_descartavel(texto))
+            self.assertTrue(pagina_vazia(extrair_dados_ativos(texto.split('\n'), 'folha.pdf', 0)))
+
+    def test_holerite_nao_descartado(self):
+        """Página com a linha de CPF ou com a tabela de eventos passa pela análise completa"""
+        self.assertFalse(pagina_descartavel('JOSE DA SILVA 111.111.111-11 Matrícula: CPF:\n'))
+        self.assertFalse(pagina_descartavel('Composição de Rendimentos Mensal\n 1.465,40 1.465,40 30,00 SUBSIDIO 1\n'))
+
+class TestExtracaoAtivos(unittest.TestCase):
+    """Testes para a varredura única das linhas de um holerite de ATIVOS"""
+
+    LINHAS = [
+        'Competência: Novembro/2025 Folha Mensal',
+        'JOSE DA SILVA 111.111.111-11 Matrícula: CPF:',
+        'Cargo: ASSESSOR PARLAMENTAR 01/02/2019 Admissão:',
+        'Loc.Trabalho : 006791001 - GAB DEP TESTE 0 - 47767',
+        'Sexo M Nasc 15/03/1980 Estado Civil',
+        'Composição de Rendimentos Mensal',
+        'Cód. Descrição Eventos',
+        ' 1.465,40  1.465,40  30,00 SUBSIDIO 1',
+        ' 161,19  1.465,40  11,00 CONTRIBUICAO  PREVIDENCIARIA 501',
+        ' 350,00  0,00  1,00 EMPRESTIMO CONSIGNADO 720',
+        ' 88,20  0,00  0,00 EVENTO  SEM   CLASSIFICACAO 9999',
+        'Proventos: 1.553,60 Descontos: 511,19',
+        '1.042,41 Totalizações',
+    ]
+
+    def setUp(self):
+        self.mapeamento = dict(gerar_relatorio.MAPEAMENTO_EVENTOS)
+        gerar_relatorio.MAPEAMENTO_EVENTOS.update({
+            ('1', 'SUBSIDIO'): 'Provento',
+            ('501', 'CONTRIBUICAO PREVIDENCIARIA'): 'Desconto Compulsório (obrigatório)',
+            ('720', 'EMPRESTIMO CONSIGNADO'): 'Desconto Facultativo (extra)',
+        })
+
+    def tearDown(self):
+        gerar_relatorio.MAPEAMENTO_EVENTOS.clear()
+        gerar_relatorio.MAPEAMENTO_EVENTOS.update(self.mapeamento)
+
+    def test_cabecalho(self):
+        """Campos do cabeçalho lidos das primeiras linhas"""
+        dados = extrair_dados_ativos(self.LINHAS, 'folha.pdf', 0)
+        self.assertEqual(dados['competencia'], 'Novembro/2025')
+        self.assertEqual((dados['nome'], dados['cpf'], dados['matricula']), ('JOSE DA SILVA', '111.111.111-11', '47767'))
+        self.assertEqual((dados['cargo'], dados['data_admissao']), ('ASSESSOR PARLAMENTAR', '01/02/2019'))
+        self.assertEqual(dados['data_nascimento'], '15/03/1980')
+        self.assertEqual(dados['idade'], '')  # preenchida depois, em lote, por enriquecer_datas
+        self.assertEqual(dados['arquivo_origem'], 'folha.pdf (pág. 1)')
+
+    def test_eventos_classificados(self):
+        """Eventos distribuídos conforme a planilha; não mapeado vira provento e é registrado"""
+        dados = extrair_dados_ativos(self.LINHAS, 'folha.pdf', 0)
+        self.assertEqual([e['codigo'] for e in dados['proventos']], ['1', '9999'])
+        self.assertEqual(dados['descontos_obrigatorios'][0]['descricao'], 'CONTRIBUICAO PREVIDENCIARIA')
+        self.assertEqual(dados['descontos_extras'][0]['valor_centavos'], 35000)
+        self.assertEqual(dados['total_proventos_centavos'], 155360)
+        self.assertEqual(dados['total_descontos_centavos'], 51119)
+        self.assertEqual(dados['liquido_centavos'], 104241)
+        nao_mapeados = EventosNaoMapeados()
+        registrar_eventos_nao_mapeados(dados, nao_mapeados)
+        evento, = nao_mapeados.por_impacto()
+        self.assertEqual((evento.codigo, evento.descricao_normalizada, evento.valor_total), ('9999', 'EVENTO SEM CLASSIFICACAO', 8820))
+        self.assertEqual(evento.exemplos, (('JOSE DA SILVA', '111.111.111-11', 'folha.pdf'),))
+
+    def test_liquido_calculado_sem_totalizacao(self):
+        """Sem a linha de totalizações o líquido é proventos - descontos"""
+        dados = extrair_dados_ativos(self.LINHAS[:-1], 'folha.pdf')
+        self.assertEqual(dados['liquido_centavos'], 155360 - 51119)
+        self.assertEqual(dados['arquivo_origem'], 'folha.pdf')
+
+class TestLayouts(unittest.TestCase):
+    """Testes para a identificação do layout da página e o registro de extratores"""
+
+    def linhas(self, rotulo_extra=None):
+        linhas = list(TestExtracaoAtivos.LINHAS)
+        if rotulo_extra:
+            linhas.insert(3, rotulo_extra)
+        return linhas
+
+    def test_layout_padrao_ativos(self):
+        """Sem marcador de outro layout, a página é de ativos"""
+        self.assertEqual(identificar_layout(self.linhas()), 'ativos')
+        self.assertEqual(extrair_dados_pagina(self.linhas(), 'folha.pdf', 0)['situacao'], 'Ativo')
+
+    def test_aposentados_e_pensionistas(self):
+        """Marcadores do cabeçalho selecionam o extrator especializado"""
+        aposentado = self.linhas('Data Aposentadoria: 01/06/2015')
+        pensionista = self.linhas('Instituidor: MARIA DA SILVA 111.111.111-11')
+        self.assertEqual(identificar_layout(aposentado), 'aposentados')
+        self.assertEqual(identificar_layout(pensionista), 'pensionistas')
+        dados = extrair_dados_pagina(pensionista, 'folha.pdf', 0)
+        self.assertEqual(dados['situacao'], 'Pensionista')
+        self.assertEqual(dados['cpf'], '111.111.111-11')
+        self.assertEqual(extrair_dados_pagina(aposentado, 'folha.pdf', 0)['situacao'], 'Aposentado')
+
+    def test_marcador_fora_do_cabecalho(self):
+        """Só as primeiras linhas formam a impressão digital"""
+        linhas = self.linhas() + [''] * 20 + ['Instituidor:']
+        self.assertEqual(identificar_layout(linhas), 'ativos')
+
+    def test_registrar_novo_layout(self):
+        """Um layout novo entra no processamento apenas com registrar_layout"""
+        registrar_layout('teste', lambda linhas, caminho, pagina: {'situacao': 'Teste'}, ('Layout de teste',))
+        try:
+            self.assertEqual(identificar_layout(self.linhas('LAYOUT DE TESTE')), 'teste')
+            self.assertEqual(extrair_dados_pagina(self.linhas('Layout de teste'), 'folha.pdf')['situacao'], 'Teste')
+        finally:
+            gerar_relatorio.EXTRATORES_LAYOUT.pop('teste')
+            gerar_relatorio.MARCADORES_LAYOUT[:] = [m for m in gerar_relatorio.MARCADORES_LAYOUT if m[1] != 'teste']
+
+if __name__ == '__main__':
+    unittest.main()
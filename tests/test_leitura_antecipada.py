@@ -0,0 +1,60 @@
+"""
+Testes da leitura antecipada dos PDFs
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import sys
+import tempfile
+from pathlib import Path
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from leitura_antecipada import LeituraAntecipada
+from cache_paginas import calcular_hash_arquivo
+
+class TestLeituraAntecipada(unittest.TestCase):
+    """Testes para a leitura dos próximos PDFs em segundo plano"""
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.pdfs = []
+        for i in range(4):
+            caminho_pdf = Path(self.pasta.name) / f'folha_{i}.pdf'
+            caminho_pdf.write_bytes(b'%PDF-1.4 ' + bytes([i]) * (i + 1))
+            self.pdfs.append(caminho_pdf)
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def test_conteudo_e_hash(self):
+        """Cada PDF chega inteiro, na ordem pedida, com o mesmo hash de calcular_hash_arquivo"""
+        with LeituraAntecipada(self.pdfs, quantidade=2) as leitura:
+            for indice, caminho_pdf in enumerate(self.pdfs):
+                conteudo, hash_pdf = leitura.obter(indice)
+                self.assertEqual(conteudo, caminho_pdf.read_bytes())
+                self.assertEqual(hash_pdf, calcular_hash_arquivo(caminho_pdf))
+
+    def test_limite_em_memoria(self):
+        """Além do PDF atual, no máximo `quantidade` leituras ficam pendentes"""
+        with LeituraAntecipada(self.pdfs, quantidade=1) as leitura:
+            leitura.obter(0)
+            self.assertEqual(sorted(leitura._leituras), [1])
+
+    def test_desativada(self):
+        """Com quantidade = 0 o PDF é lido do disco pelo próprio extrator"""
+        with LeituraAntecipada(self.pdfs, quantidade=0) as leitura:
+            self.assertEqual(leitura.obter(0), (None, None))
+
+    def test_erro_de_leitura(self):
+        """Arquivo ausente gera erro apenas ao ser obtido"""
+        self.pdfs[1].unlink()
+        with LeituraAntecipada(self.pdfs, quantidade=2) as leitura:
+            leitura.obter(0)
+            with self.assertRaises(OSError):
+                leitura.obter(1)
+            self.assertEqual(leitura.obter(2)[0], self.pdfs[2].read_bytes())
+
+if __name__ == '__main__':
+    unittest.main()
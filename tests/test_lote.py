@@ -0,0 +1,42 @@
+"""
+Testes do modo lote (--all / --range) e da publicação das saídas gerais
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import sys
+import argparse
+import tempfile
+from pathlib import Path
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from gerar_relatorio import intervalo_competencias, copiar_atomico, trava_arquivo
+
+class TestLote(unittest.TestCase):
+    """Testes para a seleção de competências e a gravação segura das saídas compartilhadas"""
+
+    def test_intervalo_competencias(self):
+        """--range aceita AAAA-MM:AAAA-MM em ordem crescente"""
+        self.assertEqual(intervalo_competencias('2025-01:2025-12'), ('2025-01', '2025-12'))
+        for invalido in ('2025-12:2025-01', '2025-1:2025-12', '2025-01'):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                intervalo_competencias(invalido)
+
+    def test_copia_atomica_e_trava(self):
+        """A cópia substitui o destino por inteiro e a trava é liberada ao final"""
+        with tempfile.TemporaryDirectory() as pasta:
+            pasta = Path(pasta)
+            (pasta / 'relatorio.html').write_text('<html>novo</html>', encoding='utf-8')
+            (pasta / 'index.html').write_text('<html>antigo</html>', encoding='utf-8')
+
+            with trava_arquivo(pasta / '.publicacao.lock'):
+                self.assertTrue((pasta / '.publicacao.lock').exists())
+                copiar_atomico(pasta / 'relatorio.html', pasta / 'index.html')
+
+            self.assertEqual((pasta / 'index.html').read_text(encoding='utf-8'), '<html>novo</html>')
+            self.assertEqual(sorted(p.name for p in pasta.iterdir()), ['index.html', 'relatorio.html'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""
+Testes do manifesto de processamento incremental
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import unittest.mock
+import sys
+import json
+import os
+import tempfile
+from pathlib import Path
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from manifesto import Manifesto, id_registro, arquivo_do_registro
+from registros_processados import ler_json_array
+from gerar_relatorio import holerites_incrementais
+from eventos_nao_mapeados import EventosNaoMapeados
+from holerite import Holerite
+
+def registro(nome, cpf, matricula, arquivo_origem, valor=10.0):
+    return {'nome': nome, 'cpf': cpf, 'matricula': matricula, 'arquivo_origem': arquivo_origem,
+            'proventos': [{'descricao': 'AUXILIO TESTE', 'valor': valor, 'base_calculo': 0.0, 'referencia': 0.0,
+                           'codigo': '9216'}]}
+
+class TestManifesto(unittest.TestCase):
+    """Testes para a detecção de PDFs novos, alterados e removidos"""
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.raiz = Path(self.pasta.name)
+        self.caminho = self.raiz / 'manifesto.json'
+        (self.raiz / 'a.pdf').write_bytes(b'%PDF-1.4 a')
+        (self.raiz / 'b.pdf').write_bytes(b'%PDF-1.4 b')
+
+    def tearDown(self):
+        self.pasta.cleanup()
+
+    def gravar(self, hash_parametros='p1'):
+        manifesto = Manifesto(self.caminho, hash_parametros)
+        manifesto.comparar([self.raiz / 'a.pdf', self.raiz / 'b.pdf'])
+        manifesto.registrar({'cpf': '111.111.111-11', 'matricula': '1', 'arquivo_origem': 'a.pdf (pág. 1)'})
+        manifesto.salvar()
+
+    def test_alterados_e_removidos(self):
+        """PDF com conteúdo novo é relido; PDF apenas tocado (mesmo conteúdo) é reaproveitado"""
+        self.gravar()
+        (self.raiz / 'b.pdf').unlink()
+        (self.raiz / 'c.pdf').write_bytes(b'%PDF-1.4 c')
+        os.utime(self.raiz / 'a.pdf', (0, 0))
+
+        manifesto = Manifesto(self.caminho, 'p1')
+        inalterados, alterados, removidos = manifesto.comparar([self.raiz / 'a.pdf', self.raiz / 'c.pdf'])
+
+        self.assertTrue(manifesto.valido)
+        self.assertEqual(inalterados, [self.raiz / 'a.pdf'])
+        self.assertEqual(alterados, [self.raiz / 'c.pdf'])
+        self.assertEqual(removidos, ['b.pdf'])
+
+    def test_desatualizado(self):
+        """Verificação rápida do modo --watch: PDF novo torna a competência desatualizada"""
+        self.gravar()
+        pdfs = [self.raiz / 'a.pdf', self.raiz / 'b.pdf']
+        self.assertFalse(Manifesto(self.caminho, 'p1').desatualizado(pdfs))
+
+        (self.raiz / 'c.pdf').write_bytes(b'%PDF-1.4 c')
+        self.assertTrue(Manifesto(self.caminho, 'p1').desatualizado(pdfs + [self.raiz / 'c.pdf']))
+        self.assertTrue(Manifesto(self.caminho, 'p2').desatualizado(pdfs))
+
+    def test_parametros_alterados(self):
+        """Manifesto gerado com outra planilha de parâmetros não é aproveitado"""
+        self.gravar('p1')
+        self.assertFalse(Manifesto(self.caminho, 'p2').valido)
+
+    def test_reclassificacao(self):
+        """
+        Na reclassificação o manifesto de outras tabelas vale; PDFs alterados não lidos mantêm a entrada e os
+        holerites anteriores e PDFs novos ficam de fora, e ambos são lidos na execução normal seguinte
+        """
+        self.gravar('p1')
+        (self.raiz / 'a.pdf').write_bytes(b'%PDF-1.4 a corrigido')
+        (self.raiz / 'c.pdf').write_bytes(b'%PDF-1.4 c')
+        pdfs = [self.raiz / 'a.pdf', self.raiz / 'b.pdf', self.raiz / 'c.pdf']
+        manifesto = Manifesto(self.caminho, 'p2', exigir_parametros=False)
+        self.assertTrue(manifesto.valido)
+        _, alterados, _ = manifesto.comparar(pdfs)
+        self.assertEqual(alterados, [self.raiz / 'a.pdf', self.raiz / 'c.pdf'])
+        manifesto.marcar_desatualizados(alterados)
+        manifesto.registrar({'cpf': '111.111.111-11', 'matricula': '1', 'arquivo_origem': 'a.pdf (pág. 1)'})
+        manifesto.salvar()
+        with open(self.caminho, encoding='utf-8') as f:
+            conteudo = json.load(f)
+        self.assertEqual(conteudo['hash_parametros'], 'p2')
+        self.assertEqual(list(conteudo['arquivos']), ['a.pdf', 'b.pdf'])
+        self.assertEqual(conteudo['arquivos']['a.pdf']['registros'], ['111.111.111-11|1'])
+
+        inalterados, alterados, removidos = Manifesto(self.caminho, 'p2').comparar(pdfs)
+        self.assertEqual((inalterados, alterados, removidos), ([self.raiz / 'b.pdf'], [self.raiz / 'a.pdf', self.raiz / 'c.pdf'], []))
+
+    def test_registros_por_arquivo(self):
+        """O manifesto lista os holerites gerados por cada PDF"""
+        self.gravar()
+        with open(self.caminho, encoding='utf-8') as f:
+            arquivos = json.load(f)['arquivos']
+        self.assertEqual(arquivos['a.pdf']['registros'], ['111.111.111-11|1'])
+        self.assertEqual(arquivos['b.pdf']['registros'], [])
+
+    def test_identificacao_do_registro(self):
+        """Sem CPF o holerite é identificado pela origem"""
+        dados = {'cpf': '', 'matricula': '', 'arquivo_origem': 'a.pdf (pág. 3-4)'}
+        self.assertEqual(id_registro(dados), 'origem:a.pdf (pág. 3-4)')
+        self.assertEqual(arquivo_do_registro(dados), 'a.pdf')
+
+    def test_pdf_de_correcao(self):
+        """Holerite de um PDF de correção substitui o reaproveitado de mesmo CPF e matrícula"""
+        anteriores = [registro('ANA', '111.111.111-11', '1', 'a.pdf (pág. 1)'),
+                      registro('BETO', '222.222.222-22', '2', 'a.pdf (pág. 2)'),
+                      registro('BETO', '222.222.222-22', '3', 'b.pdf (pág. 1)')]
+        caminho = self.raiz / 'resultado.json'
+        caminho.write_text(json.dumps(anteriores, ensure_ascii=False), encoding='utf-8')
+        correcao = Holerite.from_dict(registro('BETO', '222.222.222-22', '2', 'correcao.pdf (pág. 1)', valor=20.0))
+
+        nao_mapeados = EventosNaoMapeados()
+        nao_mapeados_lidos = EventosNaoMapeados()
+        nao_mapeados_lidos.registrar(correcao, correcao['proventos'])
+        with unittest.mock.patch('builtins.print'):
+            holerites = list(holerites_incrementais(caminho, {'a.pdf', 'b.pdf'}, iter([correcao]), nao_mapeados,
+                                                    nao_mapeados_lidos))
+
+        # Outra matrícula do mesmo CPF continua; o registro corrigido entra uma única vez
+        self.assertEqual([(h['nome'], h['matricula'], h['arquivo_origem']) for h in holerites],
+                         [('ANA', '1', 'a.pdf (pág. 1)'), ('BETO', '3', 'b.pdf (pág. 1)'),
+                          ('BETO', '2', 'correcao.pdf (pág. 1)')])
+        # Os lidos passam por um arquivo temporário (não ficam em memória) e voltam sem perdas
+        self.assertIsNot(holerites[-1], correcao)
+        self.assertEqual(holerites[-1].to_dict(), correcao.to_dict())
+        evento, = nao_mapeados.por_impacto()
+        self.assertEqual((evento.holerites, evento.valor_total), (3, 4000))
+        self.assertEqual([nome for nome, _, _ in evento.exemplos], ['ANA', 'BETO', 'BETO'])
+
+    def test_leitura_resultado_em_blocos(self):
+        """ler_json_array devolve os mesmos objetos de json.load, mesmo com blocos pequenos"""
+        registros = [{'nome': 'JOSÉ', 'proventos': [{'valor': 1.5}]}, {'nome': 'MARIA ], {', 'proventos': []}]
+        caminho = self.raiz / 'resultado.json'
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(registros, f, ensure_ascii=False, indent=2)
+
+        self.assertEqual(list(ler_json_array(caminho, tamanho_bloco=7)), registros)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Testes do cálculo vetorizado da margem consignável e do status de comprometimento
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from margens import calcular_margens, calcular_margens_holerites, enriquecer_margens, STATUS_MARGEM
+from holerite import Holerite
+
+class TestMargens(unittest.TestCase):
+    """Testes para a margem, o percentual do limite de 35% e as faixas de status"""
+
+    def test_faixas(self):
+        """RLM 2.000 (limite 700): limites de 57%, 86% e 100% do limite ideal"""
+        extras = [39800, 40000, 60100, 60200, 70000, 70001, 0]
+        margens = calcular_margens([210000] * len(extras), [10000] * len(extras), extras)
+        self.assertEqual(margens['status'].tolist(),
+                         ['SAUDÁVEL', 'ATENÇÃO', 'ATENÇÃO', 'RISCO', 'RISCO', 'CRÍTICO', 'SEM DESCONTOS'])
+        self.assertEqual(margens['percentual_limite'].iloc[4], 100.0)
+        self.assertEqual(margens['percentual_limite'].iloc[6], 0.0)
+        self.assertTrue((margens['margem_centavos'] == 200000).all())
+        self.assertEqual(margens['limite_ideal'].iloc[0], 700.0)
+
+    def test_sem_margem(self):
+        """Descontos facultativos com RLM negativa ou zero: SEM MARGEM, sem divisão por zero"""
+        margens = calcular_margens([10000, 10000, 0], [10000, 20000, 0], [500, 500, 0])
+        self.assertEqual(margens['status'].tolist(), ['SEM MARGEM', 'SEM MARGEM', 'SEM DESCONTOS'])
+        self.assertEqual(margens['margem_centavos'].tolist(), [0, -10000, 0])
+        self.assertEqual(margens['percentual_limite'].tolist(), [0.0, 0.0, 0.0])
+
+    def test_tipos(self):
+        """Frame tipado, também sem holerites"""
+        for margens in (calcular_margens([100], [0], [1]), calcular_margens([], [], [])):
+            self.assertEqual(str(margens['margem_centavos'].dtype), 'int64')
+            self.assertEqual(str(margens['percentual_limite'].dtype), 'float64')
+            self.assertEqual(tuple(margens['status'].cat.categories), STATUS_MARGEM)
+
+    def test_mesmo_valor_do_calculo_por_holerite(self):
+        """Percentual idêntico (bit a bit) ao cálculo escalar em reais"""
+        holerites = [Holerite.from_dict(dados) for dados in (
+            {'total_proventos': 14906.35, 'total_descontos_obrigatorios': 3964.27, 'total_descontos_extras': 5936.15},
+            {'total_proventos': 900.01, 'total_descontos_obrigatorios': 0.0, 'total_descontos_extras': 315.01})]
+        margens = calcular_margens_holerites(holerites)
+        for holerite, percentual in zip(holerites, margens['percentual_limite']):
+            dados = holerite.to_dict()
+            margem = round(dados['total_proventos'] - dados['total_descontos_obrigatorios'], 2)
+            self.assertEqual(percentual, dados['total_descontos_extras'] / (margem * 0.35) * 100)
+
+    def test_enriquecer(self):
+        """Campos gravados no resultado.json, no Holerite e no dict"""
+        holerites = [Holerite(nome='ANA', total_proventos_centavos=100000, total_descontos_obrigatorios_centavos=10000,
+                              total_descontos_extras_centavos=40000),
+                     {'nome': '', 'erro_processamento': 'falha'}]
+        enriquecer_margens(holerites)
+        dados = holerites[0].to_dict()
+        self.assertEqual((dados['margem_consignavel'], dados['percentual_limite'], dados['status_margem']),
+                         (900.0, 126.98, 'CRÍTICO'))
+        self.assertEqual(holerites[1]['status_margem'], 'SEM DESCONTOS')
+        enriquecer_margens([])
+
+if __name__ == '__main__':
+    unittest.main()
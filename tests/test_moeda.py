@@ -0,0 +1,52 @@
+"""
+Testes dos valores monetários em centavos inteiros
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from moeda import centavos_br, centavos, reais, formatar_centavos_br
+
+class TestCentavos(unittest.TestCase):
+    """Testes para a conversão entre o texto do holerite, centavos e reais"""
+
+    def test_conversao_padrao_brasileiro(self):
+        """Valores do holerite lidos direto para centavos"""
+        self.assertEqual(centavos_br('1.465,40'), 146540)
+        self.assertEqual(centavos_br('12.345.678,99'), 1234567899)
+        self.assertEqual(centavos_br('0,01'), 1)
+        self.assertEqual(centavos_br('30'), 3000)
+        self.assertEqual(centavos_br('1,5'), 150)
+        self.assertEqual(centavos_br('1,555'), 156)
+
+    def test_valor_invalido(self):
+        """Texto sem valor gera ValueError, como float()"""
+        for texto in ('', ',', '.', '1,2,34'):
+            with self.assertRaises(ValueError):
+                centavos_br(texto)
+
+    def test_soma_exata(self):
+        """A soma em centavos não acumula erro de arredondamento"""
+        valores = ['0,10'] * 1000 + ['683,57'] * 3
+        self.assertEqual(reais(sum(centavos_br(v) for v in valores)), 2150.71)
+        self.assertNotEqual(sum(0.1 for _ in range(1000)), 100.0)
+
+    def test_ida_e_volta_reais(self):
+        """Centavos → reais (resultado.json) → centavos preserva o valor"""
+        for valor in (0, 1, 146540, 68357, 1234567899):
+            self.assertEqual(centavos(reais(valor)), valor)
+
+    def test_formatacao(self):
+        """Formatação no padrão brasileiro, com sinal"""
+        self.assertEqual(formatar_centavos_br(145015), '1.450,15')
+        self.assertEqual(formatar_centavos_br(587347986), '5.873.479,86')
+        self.assertEqual(formatar_centavos_br(-5), '-0,05')
+        self.assertEqual(formatar_centavos_br(0), '0,00')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+Testes do repositório de classificação (eventos.db sincronizado com a planilha)
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import parametros
+from parametros import RepositorioClassificacao
+
+def gravar_planilha(caminho, tipo_subsidio='Provento'):
+    """Planilha com as duas sheets lidas pelo sistema"""
+    with pd.ExcelWriter(caminho) as writer:
+        pd.DataFrame({'CÓDIGO': [720, 1], 'DESCRIÇÃO EVENTOS': ['EMPRESTIMO CONSIGNADO', 'Subsidio'],
+                      'TIPO': ['Desconto Facultativo (extra)', tipo_subsidio]}).to_excel(
+            writer, sheet_name='Composição de Rendimentos', index=False)
+        pd.DataFrame({'DESCRIÇÃO EVENTOS': ['EMPRESTIMO CONSIGNADO', 'MENSALIDADE SINDICAL'],
+                      'ORDEM': ['2 - Facultativo Nível 2', 'Sem ordem']}).to_excel(
+            writer, sheet_name='Ordem de Eliminação', index=False)
+
+class TestRepositorioClassificacao(unittest.TestCase):
+    """Testes para a sincronização com a planilha e as consultas ao banco"""
+
+    def setUp(self):
+        self.pasta = tempfile.TemporaryDirectory()
+        self.raiz = Path(self.pasta.name)
+        self.planilha = self.raiz / 'Descricao_Comp_Rend.xlsx'
+        self.db = self.raiz / 'eventos.db'
+        gravar_planilha(self.planilha)
+        self.repositorio = RepositorioClassificacao(self.planilha, self.db)
+
+    def tearDown(self):
+        self.repositorio.fechar()
+        self.pasta.cleanup()
+
+    def sincronizar(self):
+        """Sincroniza contando quantas vezes a planilha foi lida"""
+        with mock.patch.object(parametros, 'ler_mapeamento_eventos', wraps=parametros.ler_mapeamento_eventos) as leitura:
+            recriado = self.repositorio.sincronizar()
+        self.assertEqual(recriado, leitura.call_count == 1)
+        return leitura.call_count
+
+    def tornar_planilha_mais_nova(self):
+        info = self.db.stat()
+        os.utime(self.planilha, ns=(info.st_atime_ns, info.st_mtime_ns + 10 ** 9))
+
+    def test_tabelas_no_mesmo_formato(self):
+        """Classificação e ordem de eliminação iguais às da leitura direta da planilha, na mesma ordem"""
+        self.assertEqual(self.sincronizar(), 1)
+        mapeamento = self.repositorio.mapeamento_eventos()
+        self.assertEqual(mapeamento, parametros.ler_mapeamento_eventos(self.planilha))
+        self.assertEqual(list(mapeamento), [('720', 'EMPRESTIMO CONSIGNADO'), ('1', 'SUBSIDIO')])
+        ordem = self.repositorio.ordem_eliminacao()
+        self.assertEqual(ordem, parametros.ler_ordem_eliminacao(self.planilha))
+        self.assertEqual(ordem['MENSALIDADE SINDICAL'], {'ordem': 5, 'nome_ordem': 'Sem ordem'})
+
+    def test_hash_das_tabelas(self):
+        """O hash registrado com os resultados muda com o conteúdo das tabelas, não com a planilha regravada"""
+        self.assertIsNone(self.repositorio.hash_tabelas())
+        self.sincronizar()
+        original = self.repositorio.hash_tabelas()
+        self.assertEqual(len(original), 64)
+
+        self.repositorio.sincronizar(forcar=True)
+        self.assertEqual(self.repositorio.hash_tabelas(), original)
+
+        gravar_planilha(self.planilha, tipo_subsidio='Omitir do cálculo')
+        self.repositorio.sincronizar(forcar=True)
+        self.assertNotEqual(self.repositorio.hash_tabelas(), original)
+
+    def test_consultas_pontuais(self):
+        """Busca pela chave, com código/descrição normalizados; a conexão é reutilizada e somente leitura"""
+        self.sincronizar()
+        self.assertEqual(self.repositorio.tipo_evento(1, ' Subsidio '), 'Provento')
+        self.assertIsNone(self.repositorio.tipo_evento('9999', 'SUBSIDIO'))
+        self.assertEqual(self.repositorio.ordem('emprestimo consignado'), {'ordem': 2, 'nome_ordem': '2 - Facultativo Nível 2'})
+        self.assertIsNone(self.repositorio.ordem('SUBSIDIO'))
+        self.assertIs(self.repositorio.conexao, self.repositorio.conexao)
+        with self.assertRaises(sqlite3.OperationalError):
+            self.repositorio.conexao.execute('DELETE FROM eventos')
+
+    def test_planilha_inalterada(self):
+        """Banco mais novo que a planilha, ou planilha apenas tocada: a planilha não é relida"""
+        self.sincronizar()
+        self.assertEqual(self.sincronizar(), 0)
+        self.tornar_planilha_mais_nova()
+        self.assertEqual(self.sincronizar(), 0)
+        self.assertGreaterEqual(self.db.stat().st_mtime_ns, self.planilha.stat().st_mtime_ns)
+
+    def test_planilha_alterada(self):
+        """Planilha mais nova com outro conteúdo: o banco é recriado e a conexão aberta vê a mudança"""
+        self.sincronizar()
+        self.assertEqual(self.repositorio.tipo_evento('1', 'SUBSIDIO'), 'Provento')
+        gravar_planilha(self.planilha, tipo_subsidio='Omitir do cálculo')
+        self.tornar_planilha_mais_nova()
+        self.assertEqual(self.sincronizar(), 1)
+        self.assertEqual(self.repositorio.tipo_evento('1', 'SUBSIDIO'), 'Omitir do cálculo')
+
+    def test_esquema_antigo(self):
+        """Banco gerado pela conversão anterior (colunas da planilha) é recriado no esquema atual"""
+        conn = sqlite3.connect(self.db)
+        conn.execute('CREATE TABLE eventos ("CÓDIGO" INTEGER, "DESCRIÇÃO EVENTOS" TEXT, "TIPO" TEXT)')
+        conn.execute('CREATE INDEX idx_codigo ON eventos("CÓDIGO")')
+        conn.commit()
+        conn.close()
+        self.assertEqual(self.repositorio.mapeamento_eventos(), {})
+        self.assertEqual(self.sincronizar(), 1)
+        self.assertEqual(self.repositorio.tipo_evento('1', 'SUBSIDIO'), 'Provento')
+
+    def test_planilha_invalida_mantem_banco(self):
+        """Planilha ilegível: o banco já sincronizado continua valendo; sem banco, tabelas vazias"""
+        self.sincronizar()
+        self.planilha.write_bytes(b'nao e xlsx')
+        self.tornar_planilha_mais_nova()
+        with mock.patch('builtins.print'):
+            self.assertFalse(self.repositorio.sincronizar())
+        self.assertEqual(self.repositorio.tipo_evento('1', 'SUBSIDIO'), 'Provento')
+
+        vazio = RepositorioClassificacao(self.planilha, self.raiz / 'outro.db')
+        with mock.patch('builtins.print'):
+            self.assertFalse(vazio.sincronizar())
+        self.assertEqual(vazio.mapeamento_eventos(), {})
+        self.assertEqual(vazio.ordem_eliminacao(), {})
+        self.assertFalse((self.raiz / 'outro.db').exists())
+
+if __name__ == '__main__':
+    unittest.main()
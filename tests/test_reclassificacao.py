@@ -0,0 +1,104 @@
+"""
+Testes da reclassificação dos eventos já extraídos (--reclassify)
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import unittest.mock
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import gerar_relatorio
+from gerar_relatorio import extrair_dados_ativos, reclassificar_holerite, holerites_reclassificados
+from holerite import Holerite
+from eventos_nao_mapeados import EventosNaoMapeados
+
+MAPEAMENTO_TESTE = {
+    ('1', 'SUBSIDIO'): 'Provento',
+    ('501', 'CONTRIBUICAO PREVIDENCIARIA'): 'Desconto Compulsório (obrigatório)',
+    ('720', 'EMPRESTIMO CONSIGNADO'): 'Desconto Facultativo (extra)',
+}
+
+LINHAS = [
+    'Competência: Novembro/2025 Folha Mensal',
+    'JOSE DA SILVA 111.111.111-11 Matrícula: CPF:',
+    'Composição de Rendimentos Mensal',
+    ' 1.465,40  1.465,40  30,00 SUBSIDIO 1',
+    ' 161,19  1.465,40  11,00 CONTRIBUICAO PREVIDENCIARIA 501',
+    ' 350,00  0,00  1,00 EMPRESTIMO CONSIGNADO 720',
+    ' 88,20  0,00  0,00 AUXILIO TESTE 9216',
+    'Proventos: 1.553,60 Descontos: 511,19',
+    '1.042,41 Totalizações',
+]
+
+class TestReclassificacao(unittest.TestCase):
+    """Testes para a redistribuição dos eventos e o recálculo dos totais"""
+
+    def setUp(self):
+        self.mapeamento = dict(gerar_relatorio.MAPEAMENTO_EVENTOS)
+        gerar_relatorio.MAPEAMENTO_EVENTOS.update(MAPEAMENTO_TESTE)
+
+    def tearDown(self):
+        gerar_relatorio.MAPEAMENTO_EVENTOS.clear()
+        gerar_relatorio.MAPEAMENTO_EVENTOS.update(self.mapeamento)
+
+    def test_mesmas_tabelas(self):
+        """Sem mudança na planilha, o holerite reclassificado é idêntico ao extraído"""
+        extraido = extrair_dados_ativos(LINHAS, 'folha.pdf', 0).to_dict()
+        reclassificado = reclassificar_holerite(Holerite.from_dict(extraido))
+        self.assertEqual(reclassificado.to_dict(), extraido)
+
+    def test_planilha_corrigida(self):
+        """Evento reclassificado muda de lista e os totais são recalculados; o líquido do PDF é mantido"""
+        extraido = extrair_dados_ativos(LINHAS, 'folha.pdf', 0).to_dict()
+        self.assertEqual(extraido['total_proventos'], 1553.6)  # AUXILIO TESTE caiu no fallback de provento
+
+        gerar_relatorio.MAPEAMENTO_EVENTOS[('9216', 'AUXILIO TESTE')] = 'Omitir do cálculo'
+        gerar_relatorio.MAPEAMENTO_EVENTOS[('720', 'EMPRESTIMO CONSIGNADO')] = 'Desconto Compulsório (obrigatório)'
+        dados = reclassificar_holerite(Holerite.from_dict(extraido)).to_dict()
+
+        self.assertEqual([e['codigo'] for e in dados['proventos']], ['1'])
+        self.assertEqual([e['codigo'] for e in dados['descontos_obrigatorios']], ['501', '720'])
+        self.assertEqual(dados['descontos_extras'], [])
+        self.assertEqual([e['codigo'] for e in dados['eventos_informativos']], ['9216'])
+        self.assertEqual((dados['total_proventos'], dados['total_descontos_obrigatorios']), (1465.4, 511.19))
+        self.assertEqual((dados['total_descontos_extras'], dados['total_descontos']), (0, 511.19))
+        self.assertEqual(dados['liquido'], 1042.41)
+
+    def test_liquido_calculado(self):
+        """Líquido calculado na extração (sem linha de totalização) é recalculado"""
+        extraido = extrair_dados_ativos(LINHAS[:-1], 'folha.pdf', 0).to_dict()
+        self.assertTrue(extraido['liquido_calculado'])
+        self.assertAlmostEqual(extraido['liquido'], 1553.60 - 511.19)
+
+        gerar_relatorio.MAPEAMENTO_EVENTOS[('9216', 'AUXILIO TESTE')] = 'Omitir do cálculo'
+        dados = reclassificar_holerite(Holerite.from_dict(extraido))
+        self.assertEqual(dados['liquido_centavos'], 95421)
+
+    def test_registro_de_erro(self):
+        """Registro sem eventos passa inalterado"""
+        erro = gerar_relatorio.dados_com_erro('/tmp/folha.pdf', 0, 'falha')
+        self.assertEqual(reclassificar_holerite(Holerite.from_dict(erro.to_dict())).to_dict(), erro.to_dict())
+
+    def test_somente_pdfs_inalterados(self):
+        """Lê o resultado.json em ordem, filtrando pelos PDFs de origem"""
+        registros = [dict(extrair_dados_ativos(LINHAS, nome, 0).to_dict()) for nome in ('a.pdf', 'b.pdf', 'a.pdf')]
+        with tempfile.TemporaryDirectory() as pasta:
+            caminho = Path(pasta) / 'resultado.json'
+            caminho.write_text(json.dumps(registros, ensure_ascii=False), encoding='utf-8')
+            with unittest.mock.patch('builtins.print'):
+                nao_mapeados = EventosNaoMapeados()
+                todos = list(holerites_reclassificados(caminho, nao_mapeados=nao_mapeados))
+                inalterados = list(holerites_reclassificados(caminho, {'a.pdf'}))
+        self.assertEqual([h.to_dict() for h in todos], registros)
+        evento, = nao_mapeados.por_impacto()
+        self.assertEqual((evento.codigo, evento.ocorrencias, evento.holerites, evento.valor_total), ('9216', 3, 3, 3 * 8820))
+        self.assertEqual([h['arquivo_origem'] for h in inalterados], ['a.pdf (pág. 1)', 'a.pdf (pág. 1)'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"""
+Testes do armazenamento em disco dos holerites processados
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import sys
+import io
+import json
+import os
+from pathlib import Path
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from registros_processados import RegistrosProcessados, escrever_json_indentado
+
+REGISTROS = [
+    {'nome': 'JOSÉ DA SILVA', 'cpf': '111.111.111-11', 'total_proventos': 1465.4, 'proventos': [{'descricao': 'SUBSIDIO', 'valor': 1465.4}]},
+    {'nome': '', 'cpf': '', 'total_proventos': 0, 'proventos': [], 'erro_processamento': 'Página ilegível'},
+]
+
+class TestRegistrosProcessados(unittest.TestCase):
+    """Testes para a gravação em fluxo (formato idêntico ao json.dump da lista completa)"""
+
+    def test_json_indentado_equivalente(self):
+        """Formato igual ao json.dump(lista, indent=2) usado no resultado.json"""
+        for registros in (REGISTROS, REGISTROS[:1], []):
+            destino = io.StringIO()
+            escrever_json_indentado(registros, destino)
+            self.assertEqual(destino.getvalue(), json.dumps(registros, ensure_ascii=False, indent=2))
+
+    def test_json_compacto_equivalente(self):
+        """Formato igual ao json.dumps(lista) embutido no HTML"""
+        with RegistrosProcessados() as registros:
+            for dados in REGISTROS:
+                registros.adicionar(dados)
+            destino = io.StringIO()
+            registros.escrever_json_compacto(destino)
+
+        self.assertEqual(destino.getvalue(), json.dumps(REGISTROS, ensure_ascii=False))
+
+    def test_releitura_e_remocao(self):
+        """Os registros podem ser percorridos mais de uma vez e o arquivo é removido ao fechar"""
+        registros = RegistrosProcessados()
+        for dados in REGISTROS:
+            registros.adicionar(dados)
+
+        self.assertEqual(len(registros), 2)
+        self.assertEqual(list(registros), REGISTROS)
+        self.assertEqual(list(registros), REGISTROS)
+
+        registros.fechar()
+        self.assertFalse(os.path.exists(registros.caminho))
+
+if __name__ == '__main__':
+    unittest.main()
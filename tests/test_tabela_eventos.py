@@ -0,0 +1,105 @@
+"""
+Testes da tabela fato de eventos em colunas
+Resolução Administrativa nº 14/2025 - ALMT
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Adicionar pasta src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from tabela_eventos import TabelaEventos
+from holerite import Holerite, Evento
+from moeda import centavos
+
+def evento(codigo, descricao, valor, base=0.0, referencia=0.0):
+    return Evento(descricao, centavos(valor), centavos(base), referencia, codigo)
+
+HOLERITES = [
+    {'proventos': [evento('1', 'SUBSIDIO', 1000.10, 1000.10, 30.0), evento('28', 'COMPLEMENTO SALARIAL', 21.04)],
+     'descontos_obrigatorios': [evento('501', 'CONTRIBUICAO PREVIDENCIARIA', 110.01)],
+     'descontos_extras': [], 'eventos_informativos': []},
+    {'proventos': [evento('1', 'SUBSIDIO', 3000.30)], 'descontos_obrigatorios': [],
+     'descontos_extras': [evento('720', 'EMPRESTIMO CONSIGNADO', 350.0)],
+     'eventos_informativos': [evento('59', 'REPRESENTACAO CONF LC 04/90 - ART. 59', 800.0)]},
+    {'proventos': [], 'descontos_obrigatorios': [], 'descontos_extras': [], 'eventos_informativos': []},
+    {'proventos': [evento('1', 'SUBSIDIO', 2000.20), evento('613', '13 SALARIO RESCISAO', 500.0)],
+     'descontos_obrigatorios': [], 'descontos_extras': [], 'eventos_informativos': []},
+]
+
+class TestTabelaEventos(unittest.TestCase):
+    """Testes para a montagem das colunas e as consultas vetorizadas"""
+
+    def setUp(self):
+        self.tabela = TabelaEventos.de_holerites(HOLERITES)
+
+    def test_colunas(self):
+        """Uma linha por evento, com valores em centavos e descrições codificadas"""
+        colunas = self.tabela.colunas()
+        self.assertEqual(len(self.tabela), 8)
+        self.assertEqual(self.tabela.quantidade_holerites, 4)
+        self.assertEqual(colunas['holerite_id'].tolist(), [0, 0, 0, 1, 1, 1, 3, 3])
+        self.assertEqual(colunas['tipo'].tolist(), [0, 0, 1, 0, 2, 3, 0, 0])
+        self.assertEqual(colunas['valor_centavos'][:3].tolist(), [100010, 2104, 11001])
+        self.assertEqual(colunas['valor_centavos'].dtype, np.int64)
+        self.assertEqual(colunas['base_centavos'][0], 100010)
+        self.assertEqual(colunas['referencia'][0], 30.0)
+        self.assertEqual(self.tabela.descricoes[colunas['descricao_id'][3]], 'SUBSIDIO')
+        self.assertEqual(colunas['descricao_id'][0], colunas['descricao_id'][6])
+
+    def test_resumo_por_codigo(self):
+        """Totais exatos, contagens e percentis por código"""
+        resumo = self.tabela.resumo_por_codigo(tipos=('proventos',), percentis=(50,))
+        self.assertEqual(resumo['codigo'].tolist(), ['1', '28', '613'])
+        self.assertEqual(resumo['quantidade'].tolist(), [3, 1, 1])
+        self.assertEqual(resumo['total_centavos'].tolist(), [600060, 2104, 50000])
+        self.assertEqual(resumo['p50'].tolist(), [200020.0, 2104.0, 50000.0])
+        self.assertEqual(len(self.tabela.resumo_por_codigo()['codigo']), 6)
+
+    def test_percentis_como_numpy(self):
+        """Percentis por grupo iguais aos de np.percentile"""
+        valores = [10.0, 20.0, 35.5, 70.0, 99.99]
+        tabela = TabelaEventos.de_holerites([{'proventos': [evento('1', 'SUBSIDIO', v) for v in valores]}])
+        resumo = tabela.resumo_por_codigo(percentis=(25, 90))
+        centavos = np.array(valores) * 100
+        self.assertAlmostEqual(resumo['p25'][0], np.percentile(centavos, 25))
+        self.assertAlmostEqual(resumo['p90'][0], np.percentile(centavos, 90))
+
+    def test_holerites_com(self):
+        """Marcação por holerite a partir das descrições, dos tipos e do código"""
+        rescisao = self.tabela.holerites_com(lambda d: '13' in d and 'RESCIS' in d, ('proventos', 'eventos_informativos'))
+        self.assertEqual(rescisao.tolist(), [False, False, False, True])
+        representacao = self.tabela.holerites_com(lambda d: 'ART. 59' in d, ('proventos',))
+        self.assertFalse(representacao.any())
+        subsidio = self.tabela.holerites_com(lambda d: 'SUBSID' in d, ('proventos',), codigo='1')
+        self.assertEqual(subsidio.tolist(), [True, True, False, True])
+
+    def test_codigos_como_texto(self):
+        """Códigos continuam textos (como na planilha): não numéricos são aceitos e a ordem é numérica"""
+        tabela = TabelaEventos.de_holerites([{'proventos': [evento('100', 'GRATIFICACAO', 1.0), evento('28', 'COMPLEMENTO', 2.0),
+                                                            evento('A1', 'AJUSTE', 3.0), evento('028', 'COMPLEMENTO', 4.0)]}])
+        resumo = tabela.resumo_por_codigo()
+        self.assertEqual(resumo['codigo'].tolist(), ['028', '28', '100', 'A1'])
+        self.assertEqual(resumo['total_centavos'].tolist(), [400, 200, 100, 300])
+        self.assertEqual(tabela.holerites_com(lambda d: True, codigo='A1').tolist(), [True])
+        self.assertEqual(tabela.holerites_com(lambda d: True, codigo='1').tolist(), [False])
+
+    def test_registros_compactos_e_crescimento(self):
+        """Aceita Holerite/Evento e continua crescendo depois de consultada"""
+        tabela = TabelaEventos()
+        tabela.adicionar(Holerite(proventos=[Evento('SUBSIDIO', 1000, 1000, 30.0, '1')]))
+        self.assertEqual(tabela.colunas()['valor_centavos'].tolist(), [1000])
+        tabela.adicionar(Holerite(proventos=[Evento('SUBSIDIO', 2000, 2000, 30.0, '1')]))
+        self.assertEqual(tabela.colunas()['valor_centavos'].tolist(), [1000, 2000])
+
+    def test_tabela_vazia(self):
+        tabela = TabelaEventos()
+        self.assertEqual(len(tabela.resumo_por_codigo(percentis=(50,))['codigo']), 0)
+        self.assertEqual(len(tabela.holerites_com(lambda d: True)), 0)
+
+if __name__ == '__main__':
+    unittest.main()